@@ -211,17 +211,20 @@ chat_history_cache = OptimizedChatHistoryCache()
 
 # SimpleMem instances cache
 _simplemem_instances = {}
+_simplemem_base = None
 
 def get_simplemem_instance(user_id: str, session_id: str) -> SimpleMemSystem:
-    """Get or create SimpleMem instance for user/session"""
-    global _simplemem_instances
+    """Get or create SimpleMem instance for user/session (handles sharing one base system)"""
+    global _simplemem_instances, _simplemem_base
     instance_key = f"{session_id}"
     
     if instance_key not in _simplemem_instances:
-        _simplemem_instances[instance_key] = SimpleMemSystem(
-            agent_id=instance_key,
-            clear_db=False
-        )
+        if _simplemem_base is None:
+            _simplemem_base = SimpleMemSystem(
+                agent_id=instance_key,
+                clear_db=False
+            )
+        _simplemem_instances[instance_key] = _simplemem_base.for_agent(instance_key)
     
     return _simplemem_instances[instance_key]
 
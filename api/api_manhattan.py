@@ -60,6 +60,7 @@ production use replace the storage layer with a secure database and rotate keys.
 import json
 import os
 import sys
+import threading
 import time
 import uuid
 from datetime import datetime
@@ -876,6 +877,9 @@ def delete_agent():
         # Try deleting Chroma DB collections for the agent
         chat_agentic_rag.delete_agent_collection(agent_ID=agent_id)
         file_agentic_rag.delete_agent_collection(agent_ID=agent_id)
+        # ...and the agent's lexical index, cached entries and memory system
+        forget_agent(agent_id)
+        _memory_systems_cache.pop(agent_id, None)
         
         if not agent:
             return jsonify({'error': 'agent_not_found'}), 404
@@ -1319,26 +1323,59 @@ def search_chat_history():
 # Import SimpleMem components for memory operations
 from SimpleMem.main import create_system, SimpleMemSystem
 from SimpleMem.models.memory_entry import MemoryEntry, Dialogue
+from SimpleMem.database.vector_store import forget_agent
+# GitMem dashboard caches/counters listen for these write events
+from gitmem.core.event_bus import emit_memory_added, emit_memory_updated, emit_memory_deleted
 
 # Cache for SimpleMem systems per agent (avoids recreating systems on every request)
 _memory_systems_cache = {}
+# One fully initialized system; per-agent systems are cheap handles onto it
+_base_memory_system = None
+_base_memory_system_lock = threading.Lock()
+
+
+def _get_base_memory_system() -> SimpleMemSystem:
+    """The shared base system, built once without provisioning a collection of its own."""
+    global _base_memory_system
+    if _base_memory_system is None:
+        with _base_memory_system_lock:
+            if _base_memory_system is None:
+                _base_memory_system = SimpleMemSystem(ensure_collection=False)
+    return _base_memory_system
+
 
 def _get_or_create_memory_system(agent_id: str, clear_db: bool = False) -> SimpleMemSystem:
     """Get cached SimpleMem system or create new one for the agent.
     
     Uses agent_id as the collection name in ChromaDB for per-agent storage.
+    Every agent's system shares the LLM client, embedding model and ChromaDB
+    client of a single base system (SimpleMemSystem.for_agent).
     """
     if agent_id not in _memory_systems_cache or clear_db:
-        # Use SimpleMemSystem with agent_id for ChromaDB collection name
-        # NOTE: agent_id parameter is what VectorStore uses for the ChromaDB collection,
-        # not table_name (which was being used incorrectly before)
-        _memory_systems_cache[agent_id] = SimpleMemSystem(
-            agent_id=agent_id,
-            clear_db=clear_db
-        )
+        # NOTE: agent_id is what VectorStore uses for the ChromaDB collection
+        memory_system = _get_base_memory_system().for_agent(agent_id)
+        if clear_db:
+            memory_system.vector_store.clear()
+        _memory_systems_cache[agent_id] = memory_system
     return _memory_systems_cache[agent_id]
 
 
+def _list_memory_entries(agent_id: str, limit: int = 50) -> list:
+    """Most recent memory entries of an agent, read-only.
+    
+    Never creates a per-agent system or ChromaDB collection: a cached system is
+    used when the agent has one, otherwise the agent's collection is read only
+    if it already exists (unknown agents list as empty).
+    """
+    memory_system = _memory_systems_cache.get(agent_id)
+    if memory_system is not None:
+        return memory_system.vector_store.get_all_entries(limit=limit)
+    base_store = _get_base_memory_system().vector_store
+    if not base_store.agentic_RAG.wrapper.manager.collection_exists(agent_id):
+        return []
+    return base_store.for_agent(agent_id).get_all_entries(limit=limit)
+
+
 @manhattan_api.route("/create_memory", methods=["POST"])
 def create_memory():
     """Create/initialize a memory system for an agent.
@@ -1480,8 +1517,11 @@ def add_memory():
         if entries:
             print(f"[DEBUG /add_memory] Calling vector_store.add_entries with {len(entries)} entries")
             # Add directly to vector store (bypassing LLM)
-            memory_system.vector_store.add_entries(entries)
+            if not memory_system.vector_store.add_entries(entries):
+                return jsonify({'error': 'add_failed', 'agent_id': agent_id}), 500
             print(f"[DEBUG /add_memory] add_entries call completed")
+            for entry in entries:
+                emit_memory_added(agent_id, entry.entry_id, entry.memory_type, entry.lossless_restatement)
         
         return jsonify({
             'ok': True,
@@ -1502,33 +1542,33 @@ def read_memory():
 
     Expects JSON body with:
     - agent_id: str (required)
-    - query: str (required)
+    - query: str (optional) - empty lists the most recent entries without retrieval
     - top_k: int (optional, default=5)
     - enable_reflection: bool (optional) - enable reflection-based additional retrieval
     """
     data = request.get_json(silent=True) or {}
     agent_id = data.get('agent_id')
-    query = data.get('query')
+    query = data.get('query') or ""
     top_k = data.get('top_k', 5)
     enable_reflection = data.get('enable_reflection')
 
     if not agent_id:
         return jsonify({'error': 'agent_id is required'}), 400
-    if not query:
-        return jsonify({'error': 'query is required'}), 400
 
     user_id, error = extract_and_validate_api_key(data)
     if error:
         return error
 
     try:
-        memory_system = _get_or_create_memory_system(agent_id)
-        
-        # Use HybridRetriever for search
-        if enable_reflection is not None:
-            contexts = memory_system.hybrid_retriever.retrieve(query, enable_reflection=enable_reflection)
+        if query:
+            memory_system = _get_or_create_memory_system(agent_id)
+            # Use HybridRetriever for search (routing = local complexity decision, for tuning)
+            contexts, routing = memory_system.hybrid_retriever.retrieve_with_routing(
+                query, enable_reflection=enable_reflection
+            )
         else:
-            contexts = memory_system.hybrid_retriever.retrieve(query)
+            # Listing is read-only: no system or collection is created for the agent
+            contexts, routing = _list_memory_entries(agent_id, limit=top_k), None
         
         # Convert MemoryEntry objects to serializable dicts
         results = []
@@ -1550,7 +1590,8 @@ def read_memory():
             'agent_id': agent_id,
             'query': query,
             'results_count': len(results),
-            'results': results
+            'results': results,
+            'routing': routing
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1712,37 +1753,10 @@ def update_memory():
     try:
         memory_system = _get_or_create_memory_system(agent_id)
         
-        # Build the document content from lossless_restatement if provided
-        document_content = updates.get('lossless_restatement')
-        
-        # Build metadata from other fields
-        metadata = {}
-        updateable_metadata = ['timestamp', 'location', 'persons', 'entities', 'topic', 'keywords']
-        for field in updateable_metadata:
-            if field in updates:
-                value = updates[field]
-                # Convert lists to strings for ChromaDB metadata
-                if isinstance(value, list):
-                    metadata[field] = json.dumps(value)
-                else:
-                    metadata[field] = value
-        
-        # Use Agentic_RAG to update the document
-        if document_content:
-            # Update both document and metadata
-            memory_system.vector_store.rag.update_docs(
-                agent_ID=agent_id,
-                ids=[entry_id],
-                documents=[document_content],
-                metadatas=[metadata] if metadata else None
-            )
-        elif metadata:
-            # Update metadata only
-            memory_system.vector_store.rag.update_doc_metadata(
-                agent_ID=agent_id,
-                ids=[entry_id],
-                metadatas=[metadata]
-            )
+        # Goes through the vector store so its lexical index and entry cache follow
+        if memory_system.vector_store.patch_entry(entry_id, updates) is None:
+            return jsonify({'error': 'memory_not_found_or_update_failed', 'entry_id': entry_id}), 404
+        emit_memory_updated(agent_id, entry_id, fields=list(updates.keys()))
         
         return jsonify({
             'ok': True,
@@ -1778,11 +1792,10 @@ def delete_memory():
     try:
         memory_system = _get_or_create_memory_system(agent_id)
         
-        # Use Agentic_RAG to delete documents
-        result = memory_system.vector_store.rag.delete_chat_history(
-            agent_ID=agent_id,
-            ids=entry_ids
-        )
+        if not memory_system.vector_store.delete_entries(entry_ids):
+            return jsonify({'error': 'delete_failed', 'entry_ids': entry_ids}), 500
+        for entry_id in entry_ids:
+            emit_memory_deleted(agent_id, entry_id)
         
         return jsonify({
             'ok': True,
@@ -2122,6 +2135,7 @@ def bulk_add_memory():
         
         added_count = 0
         skipped_count = 0
+        entries = []
         entry_ids = []
         errors = []
         
@@ -2132,7 +2146,7 @@ def bulk_add_memory():
                     errors.append({'index': idx, 'error': 'lossless_restatement required'})
                     continue
                 
-                entry = MemoryEntry(
+                entries.append(MemoryEntry(
                     lossless_restatement=lossless,
                     keywords=mem.get('keywords', []),
                     timestamp=mem.get('timestamp'),
@@ -2140,14 +2154,18 @@ def bulk_add_memory():
                     persons=mem.get('persons', []),
                     entities=mem.get('entities', []),
                     topic=mem.get('topic')
-                )
-                
-                entry_id = memory_system.directly_save_memory(entry)
-                entry_ids.append(entry_id)
-                added_count += 1
+                ))
             except Exception as e:
                 errors.append({'index': idx, 'error': str(e)})
         
+        # One batched write keeps the lexical index and entry cache in step
+        if entries and not memory_system.vector_store.add_entries(entries):
+            return jsonify({'error': 'add_failed', 'agent_id': agent_id, 'errors': errors or None}), 500
+        for entry in entries:
+            emit_memory_added(agent_id, entry.entry_id, entry.memory_type, entry.lossless_restatement)
+            entry_ids.append(entry.entry_id)
+        added_count = len(entries)
+        
         return jsonify({
             'ok': True,
             'agent_id': agent_id,
@@ -2268,6 +2286,7 @@ def import_memories():
         memory_system = _get_or_create_memory_system(agent_id, clear_db=clear_db)
         
         imported_count = 0
+        entries = []
         entry_ids = []
         errors = []
         
@@ -2278,7 +2297,7 @@ def import_memories():
                     errors.append({'index': idx, 'error': 'lossless_restatement required'})
                     continue
                 
-                entry = MemoryEntry(
+                entries.append(MemoryEntry(
                     lossless_restatement=lossless,
                     keywords=mem.get('keywords', []),
                     timestamp=mem.get('timestamp'),
@@ -2286,14 +2305,18 @@ def import_memories():
                     persons=mem.get('persons', []),
                     entities=mem.get('entities', []),
                     topic=mem.get('topic')
-                )
-                
-                entry_id = memory_system.directly_save_memory(entry)
-                entry_ids.append(entry_id)
-                imported_count += 1
+                ))
             except Exception as e:
                 errors.append({'index': idx, 'error': str(e)})
         
+        # One batched write keeps the lexical index and entry cache in step
+        if entries and not memory_system.vector_store.add_entries(entries):
+            return jsonify({'error': 'add_failed', 'agent_id': agent_id, 'errors': errors or None}), 500
+        for entry in entries:
+            emit_memory_added(agent_id, entry.entry_id, entry.memory_type, entry.lossless_restatement)
+            entry_ids.append(entry.entry_id)
+        imported_count = len(entries)
+        
         return jsonify({
             'ok': True,
             'agent_id': agent_id,
@@ -258,10 +258,24 @@ _agents_service = McpAgentsService()
 _default_user_id = os.getenv("MCP_USER_ID", "mcp-default-user")
 
 
+# One fully initialized system; per-agent systems are cheap handles onto it
+_base_memory_system = None
+
+
 def _get_or_create_memory_system(agent_id: str, clear_db: bool = False) -> SimpleMemSystem:
-    """Get cached SimpleMem system or create new one for the agent."""
+    """Get cached SimpleMem system or create new one for the agent.
+
+    Every agent's system shares the LLM client, embedding model and ChromaDB
+    client of a single base system (SimpleMemSystem.for_agent).
+    """
+    global _base_memory_system
     if agent_id not in _memory_systems_cache or clear_db:
-        _memory_systems_cache[agent_id] = create_system(agent_id=agent_id, clear_db=clear_db)
+        if _base_memory_system is None:
+            _base_memory_system = create_system(agent_id=agent_id)
+        memory_system = _base_memory_system.for_agent(agent_id)
+        if clear_db:
+            memory_system.vector_store.clear()
+        _memory_systems_cache[agent_id] = memory_system
     return _memory_systems_cache[agent_id]
 
 
@@ -710,7 +724,9 @@ async def search_memory(
     try:
         memory_system = _get_or_create_memory_system(agent_id)
         
-        contexts = memory_system.hybrid_retriever.retrieve(query, enable_reflection=enable_reflection)
+        contexts, routing = memory_system.hybrid_retriever.retrieve_with_routing(
+            query, enable_reflection=enable_reflection
+        )
         
         results = []
         for ctx in contexts[:top_k]:
@@ -730,7 +746,8 @@ async def search_memory(
             'agent_id': agent_id,
             'query': query,
             'results_count': len(results),
-            'results': results
+            'results': results,
+            'routing': routing
         })
     except Exception as e:
         return json.dumps({'ok': False, 'error': str(e)})
@@ -813,31 +830,9 @@ async def update_memory_entry(
         
         memory_system = _get_or_create_memory_system(agent_id)
         
-        document_content = updates.get('lossless_restatement')
-        
-        metadata = {}
-        updateable_metadata = ['timestamp', 'location', 'persons', 'entities', 'topic', 'keywords']
-        for field in updateable_metadata:
-            if field in updates:
-                value = updates[field]
-                if isinstance(value, list):
-                    metadata[field] = json.dumps(value)
-                else:
-                    metadata[field] = value
-        
-        if document_content:
-            memory_system.vector_store.rag.update_docs(
-                agent_ID=agent_id,
-                ids=[entry_id],
-                documents=[document_content],
-                metadatas=[metadata] if metadata else None
-            )
-        elif metadata:
-            memory_system.vector_store.rag.update_doc_metadata(
-                agent_ID=agent_id,
-                ids=[entry_id],
-                metadatas=[metadata]
-            )
+        # Goes through the vector store so its lexical index and entry cache follow
+        if memory_system.vector_store.patch_entry(entry_id, updates) is None:
+            return json.dumps({'ok': False, 'error': 'memory_not_found_or_update_failed', 'entry_id': entry_id})
         
         return json.dumps({
             'ok': True,
@@ -872,10 +867,8 @@ async def delete_memory_entries(
         
         memory_system = _get_or_create_memory_system(agent_id)
         
-        memory_system.vector_store.rag.delete_chat_history(
-            agent_ID=agent_id,
-            ids=entry_ids
-        )
+        if not memory_system.vector_store.delete_entries(entry_ids):
+            return json.dumps({'ok': False, 'error': 'delete_failed', 'entry_ids': entry_ids})
         
         return json.dumps({
             'ok': True,
@@ -527,15 +527,24 @@ def add_memory():
 def agent_fs_list(agent_id, virtual_path=""):
     """
     Virtual Filesystem API: List directory contents.
+    Supports ?limit=, ?sort=newest|oldest and ?cursor= (from next_cursor).
     """
     try:
-        items = store.fs.list_dir(agent_id, virtual_path)
+        page = store.fs.list_dir_page(
+            agent_id, virtual_path,
+            limit=request.args.get('limit', type=int),
+            cursor=request.args.get('cursor'),
+            sort=request.args.get('sort', 'newest')
+        )
         return jsonify({
             'status': 'success',
             'agent_id': agent_id,
             'path': virtual_path,
-            'items': items
+            'items': page['items'],
+            'next_cursor': page['next_cursor']
         })
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
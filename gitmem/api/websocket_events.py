@@ -8,23 +8,49 @@ real-time dashboard. Clients connect here to receive live updates.
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask import request
 from ..core.event_bus import event_bus, EventType
+from ..core.broadcast_coalescer import BroadcastCoalescer
 from datetime import datetime
 
 
+import os
 import time
 from collections import defaultdict
 
 _last_stats_request = defaultdict(float)
 
+# Per-room broadcast batching; set up by init_websocket
+_coalescer = None
+
 def init_websocket(socketio: SocketIO):
     """
     Initialize WebSocket event handlers for GitMem.
     Call this from your main Flask app after creating SocketIO instance.
     """
     
+    global _coalescer
+    
     # Connect event bus to SocketIO for broadcasting
     event_bus.set_socketio(socketio)
     
+    # Coalesce broadcasts per room; frames go out once per flush interval
+    _coalescer = BroadcastCoalescer(
+        socketio.emit,
+        namespace='/gitmem',
+        flush_interval=float(os.getenv("GITMEM_BROADCAST_INTERVAL", "0.25")),
+        spawn=socketio.start_background_task
+    )
+    event_bus.set_broadcaster(
+        lambda event: _coalescer.publish(None, 'gitmem_event', event.to_dict(),
+                                         merge_key=(event.type.value, event.agent_id))
+    )
+    
+    # Deliver events off the write path (worker runs as a SocketIO background task)
+    event_bus.enable_async_dispatch(
+        max_queue=int(os.getenv("GITMEM_EVENT_QUEUE_SIZE", "1000")),
+        overflow=os.getenv("GITMEM_EVENT_OVERFLOW", "coalesce"),
+        spawn=socketio.start_background_task
+    )
+    
     @socketio.on('connect', namespace='/gitmem')
     def handle_connect():
         """Handle new WebSocket connection."""
@@ -40,6 +66,11 @@ def init_websocket(socketio: SocketIO):
         
         # Join the global room for broadcasts
         join_room('gitmem_global')
+        
+        # Room stats are delta-encoded: give the new client the current baseline
+        snapshot = _coalescer.stats_snapshot('gitmem_global') if _coalescer is not None else None
+        if snapshot is not None:
+            emit('stats_update', snapshot)
     
     @socketio.on('disconnect', namespace='/gitmem')
     def handle_disconnect():
@@ -119,14 +150,27 @@ def init_websocket(socketio: SocketIO):
     
     @socketio.on('request_recent_events', namespace='/gitmem')
     def handle_request_recent_events(data=None):
-        """Client requests recent events from the event bus."""
+        """
+        Client requests recent events from the event bus.
+        Reconnecting clients pass 'since_seq' (and optionally 'agent_id') to get
+        only what they missed; 'resync' tells them the gap is gone and a full
+        reload is needed.
+        """
         limit = 20
         if data and 'limit' in data:
             limit = min(data['limit'], 100)
         
-        events = event_bus.get_recent_events(limit=limit)
+        if data and data.get('since_seq') is not None:
+            events, resync = event_bus.get_events_since(
+                int(data['since_seq']), agent_id=data.get('agent_id'), limit=100
+            )
+        else:
+            events, resync = event_bus.get_recent_events(limit=limit), False
+        
         emit('recent_events', {
-            'events': [e.to_dict() for e in events]
+            'events': [e.to_dict() for e in events],
+            'latest_seq': event_bus.latest_seq,
+            'resync': resync
         })
     
     @socketio.on('ping', namespace='/gitmem')
@@ -141,9 +185,12 @@ def init_websocket(socketio: SocketIO):
 def broadcast_to_agent_subscribers(agent_id: str, event_type: str, data: dict):
     """
     Broadcast an event to all clients subscribed to a specific agent.
-    Call this from anywhere in the application.
+    Call this from anywhere in the application. Repeated events are merged
+    into one batched frame per flush interval.
     """
-    if event_bus._socketio:
+    if _coalescer is not None:
+        _coalescer.publish(f"agent:{agent_id}", event_type, data)
+    elif event_bus._socketio:
         room_name = f"agent:{agent_id}"
         event_bus._socketio.emit(
             event_type,
@@ -154,8 +201,10 @@ def broadcast_to_agent_subscribers(agent_id: str, event_type: str, data: dict):
 
 
 def broadcast_stats_update(stats: dict):
-    """Broadcast stats update to all connected clients."""
-    if event_bus._socketio:
+    """Broadcast stats update to all connected clients (delta-encoded, latest per flush)."""
+    if _coalescer is not None:
+        _coalescer.publish_stats('gitmem_global', stats)
+    elif event_bus._socketio:
         event_bus._socketio.emit(
             'stats_update',
             stats,
@@ -0,0 +1,178 @@
+"""
+GitMem Broadcast Coalescer - Rate-independent WebSocket fan-out.
+
+Broadcasts are buffered per room and flushed every `flush_interval`
+seconds, so Socket.IO work scales with the flush rate instead of the write
+rate:
+- Events with the same merge key (e.g. memory:added for one agent) collapse
+  into one entry carrying a count and the latest payload. A room with a
+  single uncoalesced event gets the original frame; anything more goes out
+  as one 'gitmem_batch' frame.
+- stats_update is delta-encoded per room: after the first full snapshot
+  only changed keys are sent, tagged with _delta/_version. Clients joining
+  later get stats_snapshot(room) as their baseline.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+BATCH_EVENT = "gitmem_batch"
+STATS_EVENT = "stats_update"
+
+
+def _spawn_thread(target: Callable[[], None]):
+    thread = threading.Thread(target=target, name="gitmem-broadcast", daemon=True)
+    thread.start()
+    return thread
+
+
+class BroadcastCoalescer:
+    """
+    Buffers room broadcasts and flushes them as batched frames.
+    `emit(event, data, room=..., namespace=...)` matches SocketIO.emit.
+    """
+
+    def __init__(self, emit: Callable[..., Any], namespace: str = "/gitmem", flush_interval: float = 0.25,
+                 spawn: Callable[[Callable[[], None]], Any] = None):
+        self._emit = emit
+        self.namespace = namespace
+        self.flush_interval = flush_interval
+        self._spawn = spawn or _spawn_thread
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Optional[str], "OrderedDict[Hashable, Dict[str, Any]]"] = {}
+        self._pending_stats: Dict[Optional[str], Dict[str, Any]] = {}
+        self._sent_stats: Dict[Optional[str], Dict[str, Any]] = {}
+        self._stats_version: Dict[Optional[str], int] = {}
+        self._flusher_started = False
+        self._stats = {"published": 0, "frames": 0, "flushes": 0}
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def publish(self, room: Optional[str], event: str, data: Dict[str, Any], merge_key: Hashable = None):
+        """Buffer an event for a room (None = whole namespace)."""
+        key = (event, merge_key)
+        now = time.time()
+        with self._lock:
+            entries = self._pending.setdefault(room, OrderedDict())
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = {"event": event, "count": 1, "latest": data, "first_at": now, "last_at": now}
+            else:
+                entry["count"] += 1
+                entry["latest"] = data
+                entry["last_at"] = now
+            self._stats["published"] += 1
+            self._ensure_flusher()
+
+    def publish_stats(self, room: Optional[str], stats: Dict[str, Any]):
+        """Buffer a stats snapshot; only the latest per room is sent, as a delta."""
+        with self._lock:
+            self._pending_stats[room] = stats
+            self._stats["published"] += 1
+            self._ensure_flusher()
+
+    def stats_snapshot(self, room: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Full frame of the stats last sent to a room, for a client that just joined it."""
+        with self._lock:
+            sent = self._sent_stats.get(room)
+            if sent is None:
+                return None
+            return {**sent, "_delta": False, "_version": self._stats_version.get(room, 0)}
+
+    def reset_stats_baseline(self, room: Optional[str] = None):
+        """Force the next stats frame for a room (or all rooms) to be a full snapshot."""
+        with self._lock:
+            if room is None:
+                self._sent_stats.clear()
+            else:
+                self._sent_stats.pop(room, None)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _ensure_flusher(self):
+        # Called with the lock held
+        if not self._flusher_started:
+            self._flusher_started = True
+            self._spawn(self._run)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[BroadcastCoalescer] Flush failed: {e}")
+
+    def flush(self):
+        """Emit everything buffered so far (one frame per room, plus stats)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            pending_stats, self._pending_stats = self._pending_stats, {}
+            stats_frames = [(room, self._encode_stats(room, stats)) for room, stats in pending_stats.items()]
+            self._stats["flushes"] += 1
+
+        frames = 0
+        for room, entries in pending.items():
+            items = list(entries.values())
+            if len(items) == 1 and items[0]["count"] == 1:
+                self._send(items[0]["event"], items[0]["latest"], room)
+            else:
+                self._send(BATCH_EVENT, {
+                    "events": [
+                        {"event": e["event"], "count": e["count"], "latest": e["latest"],
+                         "window_ms": round((e["last_at"] - e["first_at"]) * 1000, 1)}
+                        for e in items
+                    ],
+                    "total": sum(e["count"] for e in items)
+                }, room)
+            frames += 1
+
+        for room, frame in stats_frames:
+            if frame is not None:
+                self._send(STATS_EVENT, frame, room)
+                frames += 1
+
+        with self._lock:
+            self._stats["frames"] += frames
+
+    def _encode_stats(self, room: Optional[str], stats: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Called with the lock held
+        previous = self._sent_stats.get(room)
+        self._sent_stats[room] = dict(stats)
+        version = self._stats_version.get(room, 0) + 1
+
+        if previous is None:
+            self._stats_version[room] = version
+            return {**stats, "_delta": False, "_version": version}
+
+        changes = {k: v for k, v in stats.items() if previous.get(k) != v or k not in previous}
+        removed = [k for k in previous if k not in stats]
+        if not changes and not removed:
+            return None
+        self._stats_version[room] = version
+        frame = {**changes, "_delta": True, "_version": version}
+        if removed:
+            frame["_removed"] = removed
+        return frame
+
+    def _send(self, event: str, data: Dict[str, Any], room: Optional[str]):
+        try:
+            if room is None:
+                self._emit(event, data, namespace=self.namespace)
+            else:
+                self._emit(event, data, room=room, namespace=self.namespace)
+        except Exception as e:
+            print(f"[BroadcastCoalescer] Emit error for {event}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "pending_rooms": len(self._pending) + len(self._pending_stats),
+                    "flush_interval": self.flush_interval}
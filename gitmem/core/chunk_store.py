@@ -0,0 +1,165 @@
+"""
+GitMem Chunk Store - Content-addressed, deduplicated document storage.
+
+Document text is split into content-defined chunks (gear rolling hash, so an
+edit only changes the chunks around it) and each chunk is stored once per
+tenant in gitmem_document_chunks, keyed by its SHA-256. Documents keep an
+ordered manifest of chunk hashes; reads fetch chunks in small batches and
+yield them in manifest order. Chunks are not refcounted: the owner of the
+manifests deletes the ones no document references any more (see
+FolderManager.delete_document).
+"""
+
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Set
+
+
+# Deterministic gear table (must never change: it defines chunk boundaries)
+_rng = random.Random(0x6769746D656D)
+GEAR = [_rng.getrandbits(32) for _ in range(256)]
+del _rng
+
+MIN_CHUNK = 2 * 1024
+AVG_CHUNK = 8 * 1024
+MAX_CHUNK = 64 * 1024
+
+
+def chunk_text(text: str, min_size: int = MIN_CHUNK, avg_size: int = AVG_CHUNK,
+               max_size: int = MAX_CHUNK) -> List[str]:
+    """
+    Split text at content-defined boundaries.
+    A boundary is cut where the rolling hash's low bits are zero (expected
+    every ~avg_size characters), bounded by min_size/max_size.
+    """
+    if len(text) <= min_size:
+        return [text] if text else []
+
+    mask = (1 << max(1, (avg_size - min_size).bit_length() - 1)) - 1
+    chunks = []
+    start = 0
+    n = len(text)
+    while start < n:
+        end = min(start + max_size, n)
+        cut = end
+        h = 0
+        # Characters before min_size can never end a chunk: skip hashing them
+        for i in range(start + min_size, end):
+            h = ((h << 1) + GEAR[ord(text[i]) & 0xFF]) & 0xFFFFFFFF
+            if not h & mask:
+                cut = i + 1
+                break
+        chunks.append(text[start:cut])
+        start = cut
+    return chunks
+
+
+def chunk_hash(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+class ChunkStore:
+    """
+    Tenant-scoped chunk table on Supabase.
+    Rows: (tenant_id, hash, size, data). Only chunks the tenant does not
+    already have are uploaded.
+    """
+
+    TABLE = "gitmem_document_chunks"
+    FETCH_BATCH = 32
+
+    def __init__(self, db, cache_size: int = 256):
+        self.db = db
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"chunks_written": 0, "chunks_deduped": 0, "bytes_written": 0, "bytes_deduped": 0,
+                       "chunks_deleted": 0}
+
+    def put(self, tenant_id: str, text: str) -> List[str]:
+        """Store text as chunks; returns the ordered manifest of chunk hashes."""
+        chunks = chunk_text(text)
+        manifest = [chunk_hash(c) for c in chunks]
+        unique: Dict[str, str] = {}
+        for h, c in zip(manifest, chunks):
+            unique.setdefault(h, c)
+
+        existing = self.existing(tenant_id, list(unique))
+        rows = [{"tenant_id": tenant_id, "hash": h, "size": len(c.encode("utf-8")), "data": c}
+                for h, c in unique.items() if h not in existing]
+        if rows:
+            # upsert tolerates a concurrent writer inserting the same chunk
+            self.db.table(self.TABLE).upsert(rows, on_conflict="tenant_id,hash").execute()
+
+        written = sum(r["size"] for r in rows)
+        with self._lock:
+            self._stats["chunks_written"] += len(rows)
+            self._stats["bytes_written"] += written
+            self._stats["chunks_deduped"] += len(manifest) - len(rows)
+            self._stats["bytes_deduped"] += len(text.encode("utf-8")) - written
+            for h, c in unique.items():
+                self._remember((tenant_id, h), c)
+        return manifest
+
+    def existing(self, tenant_id: str, hashes: List[str]) -> Set[str]:
+        """The subset of hashes the tenant has stored."""
+        found = set()
+        for i in range(0, len(hashes), self.FETCH_BATCH):
+            res = self.db.table(self.TABLE).select("hash").eq("tenant_id", tenant_id) \
+                .in_("hash", hashes[i:i + self.FETCH_BATCH]).execute()
+            found.update(row["hash"] for row in (res.data or []))
+        return found
+
+    def delete(self, tenant_id: str, hashes: List[str]) -> int:
+        """Delete a tenant's chunks (the caller checks that nothing references them)."""
+        hashes = list(dict.fromkeys(hashes))
+        for i in range(0, len(hashes), self.FETCH_BATCH):
+            self.db.table(self.TABLE).delete().eq("tenant_id", tenant_id) \
+                .in_("hash", hashes[i:i + self.FETCH_BATCH]).execute()
+        with self._lock:
+            for h in hashes:
+                self._cache.pop((tenant_id, h), None)
+            self._stats["chunks_deleted"] += len(hashes)
+        return len(hashes)
+
+    def iter_chunks(self, tenant_id: str, manifest: List[str]) -> Iterator[str]:
+        """Yield a document's chunks in order, fetching FETCH_BATCH at a time."""
+        for i in range(0, len(manifest), self.FETCH_BATCH):
+            window = manifest[i:i + self.FETCH_BATCH]
+            found: Dict[str, str] = {}
+            with self._lock:
+                for h in window:
+                    cached = self._cache.get((tenant_id, h))
+                    if cached is not None:
+                        self._cache.move_to_end((tenant_id, h))
+                        found[h] = cached
+
+            missing = [h for h in dict.fromkeys(window) if h not in found]
+            if missing:
+                res = self.db.table(self.TABLE).select("hash,data").eq("tenant_id", tenant_id) \
+                    .in_("hash", missing).execute()
+                with self._lock:
+                    for row in res.data or []:
+                        found[row["hash"]] = row["data"]
+                        self._remember((tenant_id, row["hash"]), row["data"])
+
+            for h in window:
+                if h not in found:
+                    raise KeyError(f"Missing chunk {h} for tenant {tenant_id}")
+                yield found[h]
+
+    def read(self, tenant_id: str, manifest: List[str]) -> str:
+        return "".join(self.iter_chunks(tenant_id, manifest))
+
+    def _remember(self, key: tuple, data: str):
+        # Called with the lock held
+        self._cache[key] = data
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,172 @@
+"""
+GitMem Context Cache - Materialized per-agent views for the dashboard.
+
+Caches the expensive UnifiedContextService views (agent context, folder
+structure) per agent:
+- EventBus write events (memory added/updated/deleted, commit created)
+  mark the agent's entries stale.
+- Entries older than max_age are also treated as stale, which bounds how
+  long writes the bus never sees (other worker processes) stay hidden.
+- A stale entry is still returned immediately while a background refresh
+  rebuilds it (stale-while-revalidate).
+- The cache is bounded (LRU over agents x views).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .event_bus import Event, EventType
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    generation: int
+    loaded_at: float
+    stale: bool = False
+    refreshing: bool = False
+
+
+class AgentContextCache:
+    """
+    Bounded, event-invalidated cache of per-agent views.
+    Thread-safe; loaders always run outside the lock.
+    """
+
+    INVALIDATING_EVENTS = (EventType.MEMORY_ADDED, EventType.MEMORY_UPDATED,
+                           EventType.MEMORY_DELETED, EventType.COMMIT_CREATED)
+
+    def __init__(self, max_entries: int = 512, refresh_workers: int = 2, max_age: Optional[float] = 300.0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0  # Bumped by invalidate_all
+        self._lock = threading.Lock()
+        self._refresh_workers = refresh_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "invalidations": 0, "evictions": 0}
+
+    # ------------------------------------------------------------------
+    # Event wiring
+    # ------------------------------------------------------------------
+
+    def attach(self, bus):
+        """Subscribe to the write events that invalidate cached views."""
+        for event_type in self.INVALIDATING_EVENTS:
+            bus.subscribe(event_type, self._on_event)
+
+    def _on_event(self, event: Event):
+        # Runs on the emitting thread: only flips flags
+        if event.agent_id:
+            self.invalidate(event.agent_id)
+        else:
+            self.invalidate_all()
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    def get(self, agent_id: str, view: str, loader: Callable[[], Any],
+            is_complete: Callable[[Any], bool] = None) -> Any:
+        """
+        Return the cached view, loading it on a miss.
+        Stale entries are returned as-is and refreshed in the background.
+        `is_complete` lets callers keep partial results marked stale.
+        """
+        key = (agent_id, view)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if not entry.stale and self.max_age is not None \
+                        and time.monotonic() - entry.loaded_at > self.max_age:
+                    entry.stale = True
+                if not entry.stale:
+                    self._stats["hits"] += 1
+                    return entry.value
+
+                self._stats["stale_hits"] += 1
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    self._get_executor().submit(self._refresh, key, loader, is_complete)
+                return entry.value
+
+            self._stats["misses"] += 1
+            generation = self._generation(agent_id)
+
+        value = loader()
+        self._store(key, value, generation, is_complete)
+        return value
+
+    def _refresh(self, key: Tuple[str, str], loader: Callable[[], Any], is_complete):
+        with self._lock:
+            generation = self._generation(key[0])
+        try:
+            value = loader()
+        except Exception as e:
+            print(f"[ContextCache] Background refresh failed for {key}: {e}")
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+
+        self._store(key, value, generation, is_complete)
+        with self._lock:
+            self._stats["refreshes"] += 1
+
+    def _store(self, key: Tuple[str, str], value: Any, generation: int, is_complete):
+        with self._lock:
+            # An invalidation that raced with the load keeps the entry stale
+            stale = self._generation(key[0]) != generation or (is_complete is not None and not is_complete(value))
+            self._entries[key] = _CacheEntry(value=value, generation=generation,
+                                             loaded_at=time.monotonic(), stale=stale)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _generation(self, agent_id: str) -> int:
+        # Called with the lock held; grows whenever the agent or everything is invalidated
+        return self._epoch + self._generations.get(agent_id, 0)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Called with the lock held
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._refresh_workers, thread_name_prefix="gitmem-cache")
+        return self._executor
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, agent_id: str):
+        """Mark an agent's views stale."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            self._generations[agent_id] = self._generations.get(agent_id, 0) + 1
+            for (aid, _), entry in self._entries.items():
+                if aid == agent_id:
+                    entry.stale = True
+
+    def invalidate_all(self):
+        """Mark every cached view stale."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            self._epoch += 1
+            for entry in self._entries.values():
+                entry.stale = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self.max_entries}
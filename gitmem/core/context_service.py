@@ -14,30 +14,75 @@ All sources are queried and merged to provide a complete context view per agent.
 import os
 import json
 import uuid
-from typing import List, Dict, Any, Optional
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from .manhattan_client import get_manhattan_client
+from .context_cache import AgentContextCache
+from .stats_counters import StatsCounters
+from .local_index import LocalAgentIndex
+from .event_bus import event_bus as default_event_bus
+
 
 class UnifiedContextService:
     """
     Service that aggregates context from multiple sources for an agent.
     """
     
-    def __init__(self, memory_store, vector_engine, supabase_connector=None):
+    # Merge order for get_agent_context (first source wins on duplicate IDs)
+    SOURCE_PRIORITY = ["supabase", "chromadb", "mcp", "local"]
+    
+    # Per-source budgets in seconds, plus the overall fan-out deadline
+    SOURCE_TIMEOUTS = {"supabase": 3.0, "chromadb": 2.0, "mcp": 5.0, "local": 2.0}
+    CONTEXT_DEADLINE = 6.0
+    
+    # Telemetry kind -> folder it counts in the folder structure
+    TELEMETRY_FOLDERS = {
+        "api": ("sources", "api"), "mcp": ("sources", "mcp"), "webhook": ("sources", "webhooks"),
+        "access": ("logs", "access"), "mutation": ("logs", "mutations"), "error": ("logs", "errors"),
+    }
+    
+    def __init__(self, memory_store, vector_engine, supabase_connector=None,
+                 source_timeouts: Dict[str, float] = None, context_deadline: float = None,
+                 manhattan_client=None, event_bus=None, cache_size: int = 512,
+                 stats_reconcile_interval: float = 300.0, folder_manager=None):
         self.store = memory_store
         self.vector = vector_engine
         self.db = supabase_connector
         
+        # Concurrent fan-out settings
+        self.source_timeouts = {**self.SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        self.context_deadline = context_deadline or self.CONTEXT_DEADLINE
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
         # MCP client (lazy loaded)
         self._mcp_client = None
         
-        # Manhattan API client (lazy loaded)  
-        self._manhattan_client = None
+        # Manhattan memory client (resolved per call unless injected)
+        self._manhattan_client = manhattan_client
+        
+        # Source/log counts come from its telemetry rollups (singleton unless injected)
+        self._folder_manager = folder_manager
+        
+        # Index of local refs/commits (counts + last activity per agent)
+        self.local_index = LocalAgentIndex(self.store.root_path)
         
         # Cache for source availability
         self._sources_cache = {}
         self._sources_cache_time = None
+        
+        # Materialized per-agent views, invalidated by write events
+        self.cache = AgentContextCache(max_entries=cache_size)
+        self.cache.attach(event_bus or default_event_bus)
+        
+        # Global counters, bumped on write and reconciled periodically
+        self.counters = StatsCounters(self._reconcile_stats, reconcile_interval=stats_reconcile_interval)
+        self.counters.attach(event_bus or default_event_bus)
     
     def get_available_sources(self) -> Dict[str, bool]:
         """Check which data sources are available."""
@@ -150,45 +195,30 @@ class UnifiedContextService:
         return agents
     
     def _get_local_agents(self) -> List[Dict]:
-        """Get agents from local refs."""
+        """Get agents from local refs (one read of the local agent index)."""
         agents = []
-        refs_path = os.path.join(self.store.root_path, "refs", "agents")
         
-        if os.path.exists(refs_path):
-            for agent_id in os.listdir(refs_path):
-                # Count memories for this agent
-                memory_count = 0
-                commit_count = 0
-                
-                for mtype in ["episodic", "semantic", "procedural"]:
-                    mpath = os.path.join(self.store.root_path, "memory", mtype)
-                    if os.path.exists(mpath):
-                        memory_count += len([f for f in os.listdir(mpath) if f.startswith(agent_id + "_")])
-                
-                # Count commits
-                commits_path = os.path.join(self.store.root_path, "commits")
-                if os.path.exists(commits_path):
-                    for fname in os.listdir(commits_path):
-                        try:
-                            with open(os.path.join(commits_path, fname)) as f:
-                                c = json.load(f)
-                                if c.get("agent_id") == agent_id:
-                                    commit_count += 1
-                        except:
-                            pass
-                
-                agents.append({
-                    "id": agent_id,
-                    "name": agent_id,
-                    "description": f"Local agent repository",
-                    "status": "offline",
-                    "source": "local",
-                    "memory_count": memory_count,
-                    "commit_count": commit_count,
-                    "last_active": "Unknown",
-                    "last_active_ts": 0,
-                    "color": self._generate_color(agent_id)
-                })
+        for agent_id, entry in self.local_index.get_agents().items():
+            last_active = entry.get("last_active")
+            last_active_ts = 0
+            if last_active:
+                try:
+                    last_active_ts = datetime.fromisoformat(last_active).timestamp()
+                except ValueError:
+                    pass
+            
+            agents.append({
+                "id": agent_id,
+                "name": agent_id,
+                "description": f"Local agent repository",
+                "status": "offline",
+                "source": "local",
+                "memory_count": entry.get("memory_count", 0),
+                "commit_count": entry.get("commit_count", 0),
+                "last_active": last_active or "Unknown",
+                "last_active_ts": last_active_ts,
+                "color": self._generate_color(agent_id)
+            })
         
         return agents
     
@@ -309,10 +339,30 @@ class UnifiedContextService:
         
         return agents
     
-    def get_agent_context(self, agent_id: str) -> Dict[str, Any]:
+    def get_agent_context(self, agent_id: str, deadline: float = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get complete context for an agent from all sources.
+        Served from the per-agent cache; see _load_agent_context.
+        """
+        if not use_cache:
+            return self._load_agent_context(agent_id, deadline)
+        
+        # Partial fan-outs (late/failed sources) stay stale so the next view revalidates
+        return self.cache.get(
+            agent_id, "context",
+            lambda: self._load_agent_context(agent_id, deadline),
+            is_complete=lambda ctx: not (ctx["_fetch_report"]["late"] or ctx["_fetch_report"]["failed"])
+        )
+    
+    def _load_agent_context(self, agent_id: str, deadline: float = None) -> Dict[str, Any]:
+        """
+        Build complete context for an agent from all sources.
         Fetches REAL data from Supabase, ChromaDB, MCP, and local storage.
+
+        Sources are queried concurrently. Each source has its own timeout
+        (SOURCE_TIMEOUTS) and the whole fan-out is bounded by `deadline`
+        seconds; whatever arrives in time is merged in priority order and
+        the rest is reported under "_fetch_report".
         """
         context = {
             "episodic": [],
@@ -324,163 +374,192 @@ class UnifiedContextService:
             "vectors": []
         }
         
-        # Track IDs to avoid duplicates
-        seen_ids = set()
+        deadline = self.context_deadline if deadline is None else deadline
+        fetchers = {
+            "supabase": self._fetch_supabase_context,
+            "chromadb": self._fetch_chroma_context,
+            "mcp": self._fetch_mcp_context,
+            "local": self._fetch_local_context
+        }
+        report = {"ok": [], "late": [], "failed": [], "skipped": [], "elapsed_ms": 0}
+        
+        # Skip sources that are known to be unavailable instead of paying for a thread
+        if not (self.db and self.db.client and not getattr(self.db, '_disabled', False)):
+            report["skipped"].append("supabase")
+            del fetchers["supabase"]
+        if not (self.vector and self.vector.collection):
+            report["skipped"].append("chromadb")
+            del fetchers["chromadb"]
+        
+        started = time.monotonic()
+        executor = self._get_executor()
+        futures = {executor.submit(fn, agent_id): name for name, fn in fetchers.items()}
+        cutoffs = {
+            f: started + min(self.source_timeouts.get(name, deadline), deadline)
+            for f, name in futures.items()
+        }
+        results = {}
+        pending = set(futures)
+        
+        while pending:
+            now = time.monotonic()
+            # Abandon sources whose budget ran out; they finish in the background
+            for f in [f for f in pending if cutoffs[f] <= now]:
+                pending.discard(f)
+                f.cancel()
+                report["late"].append(futures[f])
+            if not pending:
+                break
+            
+            done, _ = wait(pending, timeout=min(cutoffs[f] for f in pending) - now, return_when=FIRST_COMPLETED)
+            for f in done:
+                pending.discard(f)
+                name = futures[f]
+                try:
+                    results[name] = f.result()
+                    report["ok"].append(name)
+                except Exception as e:
+                    print(f"[UnifiedContext] {name} query failed: {e}")
+                    report["failed"].append(name)
         
-        # 1. Fetch from Supabase FIRST (primary source of truth)
-        if self.db and self.db.client and not getattr(self.db, '_disabled', False):
-            try:
-                # Query gitmem_memories table for this agent
-                res = self.db.client.table("gitmem_memories")\
-                    .select("*")\
-                    .eq("agent_id", agent_id)\
-                    .order("created_at", desc=True)\
-                    .limit(100)\
-                    .execute()
-                
-                for m in res.data:
-                    mem_id = m.get("id", str(uuid.uuid4()))
-                    if mem_id in seen_ids:
-                        continue
-                    seen_ids.add(mem_id)
-                    
-                    mem_type = m.get("type", "episodic").lower()
-                    memory_obj = {
-                        "id": mem_id,
-                        "content": m.get("content", m.get("lossless_restatement", "")),
-                        "type": mem_type,
-                        "importance": m.get("importance", 0.5),
-                        "created_at": m.get("created_at", datetime.now().isoformat()),
-                        "metadata": m.get("metadata", {}),
-                        "keywords": m.get("keywords", []),
-                        "source": "supabase"
-                    }
-                    
-                    # Add to appropriate category
-                    if mem_type in ["episodic", "semantic", "procedural", "working"]:
-                        context[mem_type].append(memory_obj)
-                    else:
-                        # Default to episodic if type is unknown
-                        context["episodic"].append(memory_obj)
-                        
-            except Exception as e:
-                print(f"[UnifiedContext] Supabase gitmem_memories query failed: {e}")
+        # Merge in priority order so the source of truth wins on duplicate IDs
+        seen_ids = set()
+        for name in self.SOURCE_PRIORITY:
+            for mem_id, placements in results.get(name, []):
+                if mem_id in seen_ids:
+                    continue
+                seen_ids.add(mem_id)
+                for bin_name, item in placements:
+                    if bin_name in context:
+                        context[bin_name].append(item)
+        
+        report["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+        if report["late"] or report["failed"]:
+            print(f"[UnifiedContext] Partial context for {agent_id}: late={report['late']} failed={report['failed']}")
+        context["_fetch_report"] = report
         
-        # 2. Fetch from ChromaDB (vector store)
-        if self.vector and self.vector.collection:
-            try:
-                # Use updated get_agent_vectors to fetch data efficiently
-                vectors = self.vector.get_agent_vectors(agent_id, limit=100)
-                
-                # Categorize vectors into bins based on metadata
-                categorized = self.vector.categorize_vectors(vectors)
-                
-                # Merge into main context, respecting seen_ids check
-                for bin_name, items in categorized.items():
-                    # Handle the bins: episodic, semantic, procedural, working, vectors
-                    target_list = context.get(bin_name)
-                    if target_list is None: continue # Should not happen based on init
-                    
-                    for item in items:
-                        # Skip if already added (e.g. from Supabase)
-                        if item["id"] in seen_ids:
-                            continue
-                        
-                        seen_ids.add(item["id"])
-                        target_list.append(item)
-                        
-            except Exception as e:
-                print(f"[UnifiedContext] ChromaDB query failed: {e}")
+        return context
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Shared worker pool for source fan-out (lazy)."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gitmem-context")
+        return self._executor
+    
+    def _fetch_supabase_context(self, agent_id: str) -> List[Tuple[str, List[Tuple[str, Dict]]]]:
+        """Fetch memories from Supabase (primary source of truth)."""
+        groups = []
+        res = self.db.client.table("gitmem_memories")\
+            .select("*")\
+            .eq("agent_id", agent_id)\
+            .order("created_at", desc=True)\
+            .limit(100)\
+            .execute()
+        
+        for m in res.data:
+            mem_id = m.get("id", str(uuid.uuid4()))
+            mem_type = m.get("type", "episodic").lower()
+            memory_obj = {
+                "id": mem_id,
+                "content": m.get("content", m.get("lossless_restatement", "")),
+                "type": mem_type,
+                "importance": m.get("importance", 0.5),
+                "created_at": m.get("created_at", datetime.now().isoformat()),
+                "metadata": m.get("metadata", {}),
+                "keywords": m.get("keywords", []),
+                "source": "supabase"
+            }
+            
+            # Default to episodic if type is unknown
+            bin_name = mem_type if mem_type in ["episodic", "semantic", "procedural", "working"] else "episodic"
+            groups.append((mem_id, [(bin_name, memory_obj)]))
         
-        # 3. Fetch from MCP memory system
-        try:
-            # Try to import and use MCP memory system
-            import sys
-            import os
-            sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'api'))
+        return groups
+    
+    def _fetch_chroma_context(self, agent_id: str) -> List[Tuple[str, List[Tuple[str, Dict]]]]:
+        """Fetch vectors from ChromaDB, categorized into memory bins."""
+        groups = []
+        local_seen = set()
+        vectors = self.vector.get_agent_vectors(agent_id, limit=100)
+        categorized = self.vector.categorize_vectors(vectors)
+        
+        # Bins are ordered episodic..working, vectors; an item keeps its first bin
+        for bin_name, items in categorized.items():
+            for item in items:
+                if item["id"] in local_seen:
+                    continue
+                local_seen.add(item["id"])
+                groups.append((item["id"], [(bin_name, item)]))
+        
+        return groups
+    
+    def _fetch_mcp_context(self, agent_id: str) -> List[Tuple[str, List[Tuple[str, Dict]]]]:
+        """Fetch memories from the Manhattan/MCP memory system."""
+        # In-process adapter when api_manhattan runs here, pooled HTTP otherwise
+        client = self._manhattan_client or get_manhattan_client()
+        memories = client.read_memory(agent_id, query="", top_k=50, timeout=self.source_timeouts.get("mcp", 5))
+        
+        groups = []
+        for m in memories:
+            mem_id = m.get("id") or m.get("entry_id") or str(uuid.uuid4())
+            mem_obj = {
+                "id": mem_id,
+                "content": m.get("content", m.get("lossless_restatement", "")),
+                "type": m.get("memory_type", "episodic"),
+                "importance": m.get("importance", 0.5),
+                "created_at": m.get("timestamp", m.get("created_at", "")),
+                "metadata": m.get("metadata", {}),
+                "source": "mcp"
+            }
             
-            from api_manhattan import service as manhattan_service
+            # Add to MCP source list
+            placements = [("mcp", mem_obj)]
             
-            # Query Manhattan API for memories
-            import requests
-            API_URL = os.getenv("MANHATTAN_API_URL", "http://127.0.0.1:1078")
-            API_KEY = os.getenv("MANHATTAN_API_KEY", "sk-tg5T-vIyYnuprwVPcgoHGfX37HBsfPwAvHkV3WFyhkE")
+            # ALso add to specific category bin for folder visibility
+            mtype = str(mem_obj["type"]).lower()
+            target_bin = None
+            if "episodic" in mtype or "persistent" in mtype: target_bin = "episodic"
+            elif "semantic" in mtype: target_bin = "semantic"
+            elif "procedural" in mtype: target_bin = "procedural"
+            elif "working" in mtype: target_bin = "working"
             
-            response = requests.post(
-                f"{API_URL}/read_memory",
-                json={"agent_id": agent_id, "query": "", "top_k": 50},
-                headers={"Authorization": f"Bearer {API_KEY}"},
-                timeout=5
-            )
+            if target_bin:
+                # We create a copy for the bin to avoid reference issues if lists are mutated differently
+                placements.append((target_bin, mem_obj.copy()))
             
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("ok") and data.get("memories"):
-                    for m in data["memories"]:
-                        mem_id = m.get("id", str(uuid.uuid4()))
-                        if mem_id in seen_ids:
-                            continue
-                        seen_ids.add(mem_id)
-                        
-                        mem_obj = {
-                            "id": mem_id,
-                            "content": m.get("content", m.get("lossless_restatement", "")),
-                            "type": m.get("memory_type", "episodic"),
-                            "importance": m.get("importance", 0.5),
-                            "created_at": m.get("timestamp", m.get("created_at", "")),
-                            "metadata": m.get("metadata", {}),
-                            "source": "mcp"
-                        }
-                        
-                        # Add to MCP source list
-                        context["mcp"].append(mem_obj)
-                        
-                        # ALso add to specific category bin for folder visibility
-                        mtype = str(mem_obj["type"]).lower()
-                        target_bin = None
-                        if "episodic" in mtype or "persistent" in mtype: target_bin = "episodic"
-                        elif "semantic" in mtype: target_bin = "semantic"
-                        elif "procedural" in mtype: target_bin = "procedural"
-                        elif "working" in mtype: target_bin = "working"
-                        
-                        if target_bin:
-                            # We create a copy for the bin to avoid reference issues if lists are mutated differently
-                            bin_obj = mem_obj.copy()
-                            context[target_bin].append(bin_obj)
-        except Exception as e:
-            print(f"[UnifiedContext] MCP query failed: {e}")
-        
-        # 4. Local filesystem memories (fallback)
-        try:
-            for mtype in ["episodic", "semantic", "procedural", "working"]:
-                memories = self.store.list_memories(agent_id, mtype, limit=50)
-                for m in memories:
-                    mem_id = m.id if hasattr(m, 'id') else str(uuid.uuid4())
-                    if mem_id in seen_ids:
-                        continue
-                    seen_ids.add(mem_id)
-                    
-                    context[mtype].append({
-                        "id": mem_id,
-                        "content": m.content if hasattr(m, 'content') else str(m),
-                        "type": mtype,
-                        "importance": m.importance if hasattr(m, 'importance') else 0.5,
-                        "created_at": m.created_at.isoformat() if hasattr(m, 'created_at') and hasattr(m.created_at, 'isoformat') else str(m.created_at) if hasattr(m, 'created_at') else datetime.now().isoformat(),
-                        "source": "local"
-                    })
-        except Exception as e:
-            print(f"[UnifiedContext] Local filesystem query failed: {e}")
+            groups.append((mem_id, placements))
         
-        return context
+        return groups
+    
+    def _fetch_local_context(self, agent_id: str) -> List[Tuple[str, List[Tuple[str, Dict]]]]:
+        """Fetch memories from the memory store (fallback)."""
+        groups = []
+        for mtype in ["episodic", "semantic", "procedural", "working"]:
+            memories = self.store.list_memories(agent_id, mtype, limit=50)
+            for m in memories:
+                mem_id = m.id if hasattr(m, 'id') else str(uuid.uuid4())
+                groups.append((mem_id, [(mtype, {
+                    "id": mem_id,
+                    "content": m.content if hasattr(m, 'content') else str(m),
+                    "type": mtype,
+                    "importance": m.importance if hasattr(m, 'importance') else 0.5,
+                    "created_at": m.created_at.isoformat() if hasattr(m, 'created_at') and hasattr(m.created_at, 'isoformat') else str(m.created_at) if hasattr(m, 'created_at') else datetime.now().isoformat(),
+                    "source": "local"
+                })]))
+        
+        return groups
     
     def get_recent_context(self, agent_id: str, limit: int = 20) -> List[Dict]:
         """Get recent context items from all sources, sorted by time."""
         context = self.get_agent_context(agent_id)
         
-        # Flatten all context
+        # Flatten all context (skip the fetch report)
         all_items = []
         for source, items in context.items():
-            all_items.extend(items)
+            if isinstance(items, list):
+                all_items.extend(items)
         
         # Sort by created_at (newest first)
         all_items.sort(key=lambda x: x.get("created_at", ""), reverse=True)
@@ -519,8 +598,9 @@ class UnifiedContextService:
             except Exception as e:
                 print(f"Sync error (cloud->local): {e}")
         
-        # Refresh cache
+        # Refresh caches
         self._sources_cache_time = None
+        self.cache.invalidate(agent_id)
         
         return synced
     
@@ -561,7 +641,14 @@ class UnifiedContextService:
         }
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get aggregated stats across all sources."""
+        """
+        Get aggregated stats across all sources.
+        O(1) read of the incrementally maintained counters; cheap enough to broadcast often.
+        """
+        return self.counters.snapshot()
+    
+    def _reconcile_stats(self) -> Dict[str, Any]:
+        """Recompute aggregated stats from every source (source of truth for the counters)."""
         sources = self.get_available_sources()
         agents = self.get_all_agents()
         
@@ -573,12 +660,26 @@ class UnifiedContextService:
             "total_agents": len(agents),
             "total_memories": sum(a.get("memory_count", 0) for a in agents),
             "total_commits": sum(a.get("commit_count", 0) for a in agents),
-            "sources": sources
+            "sources": sources,
+            "agent_ids": [a["id"] for a in agents]
         }
     
     def get_folder_structure(self, agent_id: str) -> Dict[str, Any]:
         """
         Get complete folder structure with item counts for an agent.
+        Served from the per-agent cache; see _load_folder_structure.
+        """
+        return self.cache.get(agent_id, "folders", lambda: self._load_folder_structure(agent_id))
+    
+    def _telemetry_counts(self, agent_id: str) -> Dict[str, int]:
+        if self._folder_manager is None:
+            from .folder_manager import get_folder_manager
+            self._folder_manager = get_folder_manager()
+        return self._folder_manager.telemetry_counts(agent_id, list(self.TELEMETRY_FOLDERS))
+    
+    def _load_folder_structure(self, agent_id: str) -> Dict[str, Any]:
+        """
+        Build complete folder structure with item counts for an agent.
         Aggregates data from Supabase and ChromaDB using parallel queries.
         """
         structure = {
@@ -644,14 +745,8 @@ class UnifiedContextService:
                 for cp_type in ["snapshot", "session", "recovery"]:
                     futures[executor.submit(fetch_count, "gitmem_checkpoints", agent_id=agent_id, checkpoint_type=cp_type)] = ("checkpoints", cp_type + ("s" if cp_type != "recovery" else ""))
                 
-                # Misc logs (clubbed separately in map)
-                futures[executor.submit(fetch_count, "gitmem_api_logs", agent_id=agent_id)] = ("sources", "api")
-                futures[executor.submit(fetch_count, "gitmem_mcp_inputs", agent_id=agent_id)] = ("sources", "mcp")
-                futures[executor.submit(fetch_count, "gitmem_webhooks", agent_id=agent_id)] = ("sources", "webhooks")
-                
-                # Activity logs
-                for log_type in ["access", "mutation", "error"]:
-                    futures[executor.submit(fetch_count, "gitmem_activity_logs", agent_id=agent_id, log_type=log_type)] = ("logs", log_type + ("s" if log_type != "access" else ""))
+                # Sources and activity logs: telemetry rollups, same reader as FolderManager.get_folder_stats
+                telemetry_future = executor.submit(self._telemetry_counts, agent_id)
 
                 # Collect results
                 for future in as_completed(futures):
@@ -661,24 +756,28 @@ class UnifiedContextService:
                         structure[category][key]["count"] = count
                     except Exception as e:
                         print(f"Error fetching count for {category}.{key}: {e}")
+                
+                try:
+                    telemetry = telemetry_future.result()
+                except Exception as e:
+                    print(f"[UnifiedContext] Error fetching telemetry counts: {e}")
+                    telemetry = {}
+                for kind, (category, key) in self.TELEMETRY_FOLDERS.items():
+                    structure[category][key]["count"] = telemetry.get(kind, 0)
 
         # Fetch ChromaDB counts (keep synchronous as it might be local http or fast)
         if self.vector and self.vector.client:
             try:
-                # Try agent-specific collection first
-                try:
-                    agent_col = self.vector.client.get_collection(name=agent_id)
+                # Try agent-specific collection first (handle cached by the engine)
+                agent_col = self.vector.get_agent_collection(agent_id)
+                if agent_col is not None:
                     structure["external"]["chromadb"]["count"] = agent_col.count()
                     structure["external"]["chromadb"]["connected"] = True
-                except:
+                else:
                     # Fall back to global collection with filter
                     if self.vector.collection:
                         try:
-                            results = self.vector.collection.get(
-                                where={"agent_id": agent_id},
-                                include=["metadatas"]
-                            )
-                            structure["external"]["chromadb"]["count"] = len(results.get("ids", []))
+                            structure["external"]["chromadb"]["count"] = self.vector.count_agent_vectors(agent_id)
                             structure["external"]["chromadb"]["connected"] = True
                         except:
                             pass
@@ -698,7 +797,8 @@ class UnifiedContextService:
         total_context_count = sum(structure["context"][k]["count"] for k in structure["context"])
         if total_context_count == 0:
             try:
-                context = self.get_agent_context(agent_id)
+                # Not the cached context: a stale entry would be stored here as fresh counts
+                context = self._load_agent_context(agent_id)
                 for mem_type in ["episodic", "semantic", "procedural", "working"]:
                     if mem_type in context:
                         structure["context"][mem_type]["count"] = len(context[mem_type])
@@ -5,10 +5,12 @@ pushed to connected clients via WebSocket.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Callable, Optional
+from typing import Any, Deque, Dict, List, Callable, Optional, Tuple
 from enum import Enum
+from collections import deque
 from dataclasses import dataclass, field
 import threading
+import time
 import json
 
 
@@ -54,13 +56,15 @@ class Event:
     data: Dict[str, Any]
     timestamp: datetime = field(default_factory=datetime.now)
     agent_id: Optional[str] = None
+    seq: Optional[int] = None  # Assigned by the bus on emit; monotonically increasing
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "type": self.type.value,
             "data": self.data,
             "timestamp": self.timestamp.isoformat(),
-            "agent_id": self.agent_id
+            "agent_id": self.agent_id,
+            "seq": self.seq
         }
     
     def to_json(self) -> str:
@@ -91,15 +95,56 @@ class EventBus:
         
         self._listeners: Dict[str, List[Callable[[Event], None]]] = {}
         self._global_listeners: List[Callable[[Event], None]] = []
-        self._event_history: List[Event] = []
+        # Ring buffers: one global, one per agent. *_evicted holds the highest
+        # seq pushed out of each buffer so readers can tell a gap was lost.
         self._max_history = 100
+        self._max_agent_history = 200
+        self._seq = 0
+        self._history_lock = threading.Lock()
+        self._event_history: Deque[Event] = deque(maxlen=self._max_history)
+        self._history_evicted = 0
+        self._agent_history: Dict[str, Deque[Event]] = {}
+        self._agent_evicted: Dict[str, int] = {}
         self._socketio = None  # Will be set when Flask-SocketIO is initialized
+        self._dispatcher = None  # EventDispatcher when async dispatch is enabled
+        self._broadcaster = None  # Replaces the direct WebSocket emit (e.g. BroadcastCoalescer)
+        self._listener_stats: Dict[str, Dict[str, float]] = {}
         self._initialized = True
     
     def set_socketio(self, socketio):
         """Inject Flask-SocketIO instance for WebSocket support."""
         self._socketio = socketio
     
+    def set_broadcaster(self, broadcaster: Optional[Callable[[Event], None]]):
+        """Route the WebSocket broadcast of each event through `broadcaster`."""
+        self._broadcaster = broadcaster
+    
+    def enable_async_dispatch(self, max_queue: int = 1000, overflow: str = "drop_oldest",
+                              tick: float = 0.05, spawn: Callable = None):
+        """
+        Deliver events from a background worker instead of the emitting thread.
+        overflow: "drop_oldest", "coalesce" or "block" when max_queue is reached.
+        spawn: starts the worker (e.g. socketio.start_background_task); defaults to a thread.
+        """
+        from .event_dispatcher import EventDispatcher
+        previous = self._dispatcher
+        self._dispatcher = EventDispatcher(self._deliver, max_queue=max_queue, overflow=overflow,
+                                           tick=tick, spawn=spawn)
+        if previous is not None:
+            previous.close(timeout=1.0)
+    
+    def disable_async_dispatch(self, timeout: float = 5.0):
+        """Return to synchronous delivery after draining queued events and stopping the worker."""
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            dispatcher.close(timeout=timeout)
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until queued events have been delivered (no-op when synchronous)."""
+        if self._dispatcher is None:
+            return True
+        return self._dispatcher.flush(timeout=timeout)
+    
     def subscribe(self, event_type: EventType, callback: Callable[[Event], None]):
         """Subscribe to specific event type."""
         key = event_type.value
@@ -121,50 +166,145 @@ class EventBus:
         """
         Emit an event to all listeners.
         Also broadcasts via WebSocket if available.
+        With async dispatch enabled this only queues the event.
         """
-        # Add to history
-        self._event_history.append(event)
-        if len(self._event_history) > self._max_history:
-            self._event_history.pop(0)
+        self._record(event)
         
+        if self._dispatcher is not None:
+            self._dispatcher.submit(event)
+        else:
+            self._deliver(event)
+    
+    def _deliver(self, event: Event):
+        """Run listeners and the WebSocket broadcast for one event."""
         # Notify type-specific listeners
         key = event.type.value
         if key in self._listeners:
-            for callback in self._listeners[key]:
-                try:
-                    callback(event)
-                except Exception as e:
-                    print(f"[EventBus] Error in listener: {e}")
+            for callback in list(self._listeners[key]):
+                self._call_listener(callback, event, "listener")
         
         # Notify global listeners
-        for callback in self._global_listeners:
-            try:
-                callback(event)
-            except Exception as e:
-                print(f"[EventBus] Error in global listener: {e}")
+        for callback in list(self._global_listeners):
+            self._call_listener(callback, event, "global listener")
         
         # Broadcast via WebSocket
         if self._socketio:
+            started = time.perf_counter()
+            failed = False
             try:
-                self._socketio.emit('gitmem_event', event.to_dict(), namespace='/gitmem')
+                if self._broadcaster is not None:
+                    self._broadcaster(event)
+                else:
+                    self._socketio.emit('gitmem_event', event.to_dict(), namespace='/gitmem')
             except Exception as e:
+                failed = True
                 print(f"[EventBus] WebSocket emit error: {e}")
+            self._record_timing("socketio", started, failed)
+    
+    def _call_listener(self, callback: Callable[[Event], None], event: Event, kind: str):
+        started = time.perf_counter()
+        failed = False
+        try:
+            callback(event)
+        except Exception as e:
+            failed = True
+            print(f"[EventBus] Error in {kind}: {e}")
+        self._record_timing(getattr(callback, "__qualname__", repr(callback)), started, failed)
+    
+    def _record_timing(self, name: str, started: float, failed: bool):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self._listener_stats.get(name)
+        if stats is None:
+            stats = self._listener_stats[name] = {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        stats["calls"] += 1
+        stats["errors"] += failed
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """Dispatch mode, queue metrics and per-listener timings."""
+        listeners = {
+            name: {**s, "avg_ms": round(s["total_ms"] / s["calls"], 3) if s["calls"] else 0.0}
+            for name, s in list(self._listener_stats.items())
+        }
+        return {
+            "mode": "async" if self._dispatcher is not None else "sync",
+            "queue": self._dispatcher.get_stats() if self._dispatcher is not None else None,
+            "listeners": listeners
+        }
     
     def emit_simple(self, event_type: EventType, data: Dict[str, Any], agent_id: Optional[str] = None):
         """Convenience method to emit events without creating Event object."""
         event = Event(type=event_type, data=data, agent_id=agent_id)
         self.emit(event)
     
+    def _record(self, event: Event):
+        """Assign the next sequence number and append to the ring buffers (O(1))."""
+        with self._history_lock:
+            self._seq += 1
+            event.seq = self._seq
+            
+            if len(self._event_history) == self._event_history.maxlen:
+                self._history_evicted = self._event_history[0].seq
+            self._event_history.append(event)
+            
+            if event.agent_id:
+                buf = self._agent_history.get(event.agent_id)
+                if buf is None:
+                    buf = self._agent_history[event.agent_id] = deque(maxlen=self._max_agent_history)
+                if len(buf) == buf.maxlen:
+                    self._agent_evicted[event.agent_id] = buf[0].seq
+                buf.append(event)
+    
+    @property
+    def latest_seq(self) -> int:
+        return self._seq
+    
     def get_recent_events(self, limit: int = 10, event_type: Optional[EventType] = None) -> List[Event]:
         """Get recent events from history."""
-        events = self._event_history
+        with self._history_lock:
+            events = list(self._event_history)
         if event_type:
             events = [e for e in events if e.type == event_type]
         return events[-limit:]
     
+    def get_events_since(self, since_seq: int, agent_id: Optional[str] = None,
+                         limit: int = 100) -> Tuple[List[Event], bool]:
+        """
+        Events with seq > since_seq, from the agent's buffer or the global one.
+        Returns (events, resync): resync is True when part of the gap was
+        evicted (or the sequence restarted), so the caller must reload fully.
+        """
+        with self._history_lock:
+            if agent_id:
+                buf = self._agent_history.get(agent_id, ())
+                evicted = self._agent_evicted.get(agent_id, 0)
+            else:
+                buf = self._event_history
+                evicted = self._history_evicted
+            
+            if since_seq > self._seq or since_seq < evicted:
+                return [], True
+            
+            # Buffers are seq-ordered: walk back from the newest to the gap
+            events = []
+            for e in reversed(buf):
+                if e.seq <= since_seq:
+                    break
+                events.append(e)
+        
+        events.reverse()
+        if len(events) > limit:
+            return events[-limit:], True
+        return events, False
+    
     def clear_history(self):
-        """Clear event history."""
-        self._event_history = []
+        """Clear event history (sequence numbers keep increasing)."""
+        with self._history_lock:
+            self._history_evicted = self._seq
+            self._event_history.clear()
+            self._agent_evicted = {aid: self._seq for aid in self._agent_history}
+            self._agent_history = {}
 
 
 # Global singleton instance
@@ -187,6 +327,29 @@ def emit_memory_added(agent_id: str, memory_id: str, memory_type: str, content:
     )
 
 
+def emit_memory_updated(agent_id: str, memory_id: str, fields: Optional[List[str]] = None):
+    """Emit memory updated event."""
+    event_bus.emit_simple(
+        EventType.MEMORY_UPDATED,
+        {
+            "memory_id": memory_id,
+            "fields": fields or []
+        },
+        agent_id=agent_id
+    )
+
+
+def emit_memory_deleted(agent_id: str, memory_id: str):
+    """Emit memory deleted event."""
+    event_bus.emit_simple(
+        EventType.MEMORY_DELETED,
+        {
+            "memory_id": memory_id
+        },
+        agent_id=agent_id
+    )
+
+
 def emit_commit_created(agent_id: str, commit_hash: str, message: str, parent_hash: Optional[str] = None):
     """Emit commit created event."""
     event_bus.emit_simple(
@@ -0,0 +1,204 @@
+"""
+GitMem Event Dispatcher - Non-blocking delivery for the EventBus.
+
+emit() only appends to a bounded queue (O(1) for the producer); a single
+worker drains the queue once per tick and delivers the batch to listeners
+and the WebSocket broadcast. When the queue is full the overflow policy
+decides what happens:
+- drop_oldest: discard the oldest queued event
+- coalesce:    replace the queued event with the same (type, agent_id),
+               falling back to drop_oldest when there is none
+- block:       wait for room (never from the worker itself)
+
+The worker is started through `spawn`, so it can run as a plain thread or
+as a Flask-SocketIO background task (greenlet under gevent). close() lets it
+drain the queue and exit; events submitted afterwards are delivered inline.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .event_bus import Event
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "block")
+
+
+class _Slot:
+    """Queue cell; coalescing swaps the event in place."""
+    __slots__ = ("event", "key", "live")
+
+    def __init__(self, event: Event, key: Tuple[str, Optional[str]]):
+        self.event = event
+        self.key = key
+        self.live = True
+
+
+def _spawn_thread(target: Callable[[], None]):
+    thread = threading.Thread(target=target, name="gitmem-events", daemon=True)
+    thread.start()
+    return thread
+
+
+class EventDispatcher:
+    """Bounded event queue with a single batching worker."""
+
+    def __init__(self, deliver: Callable[[Event], None], max_queue: int = 1000,
+                 overflow: str = "drop_oldest", tick: float = 0.05,
+                 spawn: Callable[[Callable[[], None]], Any] = None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow} (expected one of {OVERFLOW_POLICIES})")
+        self._deliver = deliver
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.tick = tick
+        self._spawn = spawn or _spawn_thread
+
+        self._cond = threading.Condition()
+        self._queue: Deque[_Slot] = deque()
+        self._by_key: Dict[Tuple[str, Optional[str]], _Slot] = {}
+        self._worker_started = False
+        self._worker_stopped = False
+        self._closed = False
+        self._worker_ident: Optional[int] = None
+        self._delivering = False
+        self._stats = {"enqueued": 0, "delivered": 0, "dropped": 0, "coalesced": 0,
+                       "blocked": 0, "batches": 0, "max_depth": 0}
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, event: Event):
+        """Queue an event for delivery."""
+        key = (event.type.value, event.agent_id)
+        with self._cond:
+            if not self._closed and self._enqueue(event, key):
+                return
+        # Closed before this producer got in: no worker will pick the event up
+        self._deliver(event)
+
+    def _enqueue(self, event: Event, key: Tuple[str, Optional[str]]) -> bool:
+        # Called with the condition held; False if the dispatcher closed while blocked
+        if len(self._queue) >= self.max_queue:
+            if self.overflow == "coalesce":
+                slot = self._by_key.get(key)
+                if slot is not None and slot.live:
+                    slot.event = event
+                    self._stats["coalesced"] += 1
+                    return True
+                self._drop_oldest()
+            elif self.overflow == "block" and threading.get_ident() != self._worker_ident:
+                self._stats["blocked"] += 1
+                while len(self._queue) >= self.max_queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return False
+            else:
+                self._drop_oldest()
+
+        slot = _Slot(event, key)
+        self._queue.append(slot)
+        self._by_key[key] = slot
+        self._stats["enqueued"] += 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], len(self._queue))
+
+        if not self._worker_started:
+            self._worker_started = True
+            self._spawn(self._run)
+        self._cond.notify_all()
+        return True
+
+    def _drop_oldest(self):
+        # Called with the condition held
+        slot = self._queue.popleft()
+        slot.live = False
+        if self._by_key.get(slot.key) is slot:
+            del self._by_key[slot.key]
+        self._stats["dropped"] += 1
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every queued event has been delivered."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._delivering:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Stop the worker once it has delivered everything queued.
+        Returns False if it did not exit within timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            while self._worker_started and not self._worker_stopped:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self._stats, "depth": len(self._queue), "max_queue": self.max_queue,
+                    "overflow": self.overflow}
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def _take_batch(self) -> Optional[List[Event]]:
+        """Next batch, or None once closed and drained."""
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            batch = []
+            while self._queue:
+                slot = self._queue.popleft()
+                slot.live = False
+                if self._by_key.get(slot.key) is slot:
+                    del self._by_key[slot.key]
+                batch.append(slot.event)
+            self._delivering = True
+            self._stats["batches"] += 1
+            self._cond.notify_all()  # Wake producers blocked on a full queue
+            return batch
+
+    def _run(self):
+        self._worker_ident = threading.get_ident()
+        try:
+            self._work()
+        finally:
+            with self._cond:
+                self._worker_stopped = True
+                self._cond.notify_all()
+
+    def _work(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            started = time.monotonic()
+            for event in batch:
+                try:
+                    self._deliver(event)
+                except Exception as e:
+                    print(f"[EventDispatcher] Delivery failed: {e}")
+            with self._cond:
+                self._delivering = False
+                self._stats["delivered"] += len(batch)
+                self._cond.notify_all()
+            # One batch per tick: let the next burst accumulate
+            remaining = self.tick - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
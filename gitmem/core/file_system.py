@@ -1,14 +1,90 @@
 import os
 import json
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+import time
+import base64
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 
+from .event_bus import Event, EventType, event_bus as default_event_bus
+
 if TYPE_CHECKING:
     from .memory_store import MemoryStore
 
+
+# Canonical top-level directory for each accepted alias
+CATEGORY_ALIASES = {
+    "context": "context", "context_store": "context",
+    "documents": "docs", "docs": "docs",
+    "checkpoints": "checkpoints", "ckpt": "checkpoints",
+    "activity_logs": "logs", "logs": "logs",
+    "vectors": "vectors", "vec": "vectors",
+}
+
+
+class ListingCache:
+    """
+    Small LRU of directory pages keyed by (agent, directory, cursor, limit, sort).
+    Each directory has a version counter; bumping it (or the agent's) makes
+    its cached pages unreachable. A short TTL covers writes from other processes.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple[int, int], float, Dict]]" = OrderedDict()
+        self._versions: Dict[Tuple[str, Optional[str]], int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, agent_id: str, directory: str) -> Tuple[int, int]:
+        with self._lock:
+            return self._versions.get((agent_id, None), 0), self._versions.get((agent_id, directory), 0)
+
+    def bump(self, agent_id: str, directory: str = None):
+        """Invalidate one directory, or every directory of the agent when None."""
+        with self._lock:
+            key = (agent_id, directory)
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get(self, key: Tuple, version: Tuple[int, int]) -> Optional[Dict]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            cached_version, expires_at, value = hit
+            if cached_version != version or time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple, version: Tuple[int, int], value: Dict):
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
 class FileSystem:
-    def __init__(self, store: 'MemoryStore'):
+    PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+
+    def __init__(self, store: 'MemoryStore', event_bus=None):
         self.store = store
+        self.cache = ListingCache()
+        (event_bus or default_event_bus).subscribe(EventType.MEMORY_ADDED, self._on_event)
+        (event_bus or default_event_bus).subscribe(EventType.MEMORY_UPDATED, self._on_event)
+        (event_bus or default_event_bus).subscribe(EventType.MEMORY_DELETED, self._on_event)
+
+    def _on_event(self, event: Event):
+        if event.agent_id:
+            self.cache.bump(event.agent_id)
+
+    def invalidate(self, agent_id: str, path: str = None):
+        """Drop cached listings for a directory (or all of an agent's directories)."""
+        self.cache.bump(agent_id, self._canonical(path) if path else None)
         
     def _create_node(self, name: str, is_dir: bool, path: str, size: int = 0, date: str = None, type: str = "file", id: str = None):
         return {
@@ -21,143 +97,205 @@ class FileSystem:
             "id": id
         }
 
-    def list_dir(self, agent_id: str, path: str) -> List[Dict]:
+    @staticmethod
+    def _canonical(path: str) -> str:
+        parts = path.strip("/").split("/")
+        parts[0] = CATEGORY_ALIASES.get(parts[0].lower(), parts[0].lower())
+        return "/".join(parts[:2])
+
+    # ------------------------------------------------------------------
+    # Cursors (opaque to clients)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode_cursor(directory: str, sort: str, position: Dict[str, Any]) -> str:
+        raw = json.dumps({"d": directory, "s": sort, "p": position}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, directory: str, sort: str) -> Dict[str, Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if data.get("d") != directory or data.get("s") != sort:
+            raise ValueError("Cursor does not belong to this listing")
+        return data["p"]
+
+    # ------------------------------------------------------------------
+    # Listing
+    # ------------------------------------------------------------------
+
+    def list_dir(self, agent_id: str, path: str, limit: int = None, cursor: str = None,
+                 sort: str = "newest") -> List[Dict]:
         """
-        List contents of a virtual path.
+        List contents of a virtual path (first page, or the page at `cursor`).
+        """
+        return self.list_dir_page(agent_id, path, limit=limit, cursor=cursor, sort=sort)["items"]
+
+    def list_dir_page(self, agent_id: str, path: str, limit: int = None, cursor: str = None,
+                      sort: str = "newest") -> Dict[str, Any]:
+        """
+        List one page of a virtual path.
+        Returns {"items": [...], "next_cursor": str or None}; pass next_cursor
+        back to continue. sort is "newest" or "oldest". Raises ValueError on a
+        bad cursor or sort.
         """
         path = path.strip("/")
         parts = path.split("/") if path else []
         
         # Root
         if not path:
-            return [
+            return {"items": [
                 self._create_node("Context Store", True, "context"),
                 self._create_node("Documents", True, "docs"),
                 self._create_node("Checkpoints", True, "checkpoints"),
                 self._create_node("Activity Logs", True, "logs")
-            ]
+            ], "next_cursor": None}
             
-        category = parts[0].lower()
+        category = CATEGORY_ALIASES.get(parts[0].lower())
         
-        if category in ["context", "context_store"]:
-            if len(parts) == 1:
-                return [
-                    self._create_node("episodic", True, "context/episodic"),
-                    self._create_node("semantic", True, "context/semantic"),
-                    self._create_node("procedural", True, "context/procedural"),
-                    self._create_node("short_term", True, "context/short_term")
-                ]
-            else:
-                mtype = parts[1]
-                items = self.store.db.get_memories(agent_id, mtype, limit=100) or []
-                nodes = []
-                for item in items:
-                    try:
-                        ts = str(item.get('created_at', ''))[:19].replace(':', '-') or "unknown"
-                        item_id = str(item.get('id', 'unknown'))
-                        nodes.append(self._create_node(
-                            name=f"{ts}_{item_id}.json",
-                            is_dir=False,
-                            path=f"context/{mtype}/{ts}_{item_id}.json",
-                            size=len(str(item.get('content', ''))),
-                            date=item.get('created_at'),
-                            type="json",
-                            id=item_id
-                        ))
-                    except: continue
-                return nodes
-                
-        elif category in ["documents", "docs"]:
-            if len(parts) == 1:
-                return [self._create_node("knowledge", True, "docs/knowledge")]
-            else:
-                items = self.store.db.get_memories(agent_id, "knowledge", limit=100) or []
-                nodes = []
-                for item in items:
-                    try:
-                        item_id = str(item.get('id', 'unknown'))
-                        nodes.append(self._create_node(
-                            name=f"Doc_{item_id}.md",
-                            is_dir=False,
-                            path=f"docs/knowledge/Doc_{item_id}.md",
-                            size=len(str(item.get('content', ''))),
-                            date=item.get('created_at'),
-                            type="markdown",
-                            id=item_id
-                        ))
-                    except: continue
-                return nodes
+        if len(parts) == 1:
+            subdirs = {
+                "context": ["episodic", "semantic", "procedural", "short_term"],
+                "docs": ["knowledge"],
+                "checkpoints": ["stable"],
+                "logs": ["system"],
+                "vectors": ["index"],
+            }.get(category, [])
+            return {"items": [self._create_node(name, True, f"{category}/{name}") for name in subdirs],
+                    "next_cursor": None}
+        
+        if category is None:
+            return {"items": [], "next_cursor": None}
+        
+        if sort not in ("newest", "oldest"):
+            raise ValueError(f"Unknown sort: {sort}")
+        limit = max(1, min(int(limit or self.PAGE_SIZE), self.MAX_PAGE_SIZE))
+        directory = self._canonical(path)
+        position = self._decode_cursor(cursor, directory, sort) if cursor else None
+        
+        key = (agent_id, directory, cursor, limit, sort)
+        version = self.cache.version(agent_id, directory)
+        page = self.cache.get(key, version)
+        if page is None:
+            page = self._load_page(agent_id, category, parts[1], directory, limit, position, sort)
+            self.cache.put(key, version, page)
+        return page
 
-        elif category in ["checkpoints", "ckpt"]:
-            if len(parts) == 1:
-                 return [self._create_node("stable", True, "checkpoints/stable")]
-            else:
-                c_type = parts[1]
-                items = self.store.db.get_checkpoints(agent_id, c_type, limit=50) or []
-                nodes = []
-                for item in items:
-                    try:
-                        ts = str(item.get('created_at', ''))[:19].replace(':', '-') or "unknown"
-                        item_id = str(item.get('id', 'unknown'))
-                        nodes.append(self._create_node(
-                            name=f"Checkpoint_{ts}_{item_id}.json",
-                            is_dir=False,
-                            path=f"checkpoints/{c_type}/Checkpoint_{ts}_{item_id}.json",
-                            size=len(str(item.get('state_dump', ''))),
-                            date=item.get('created_at'),
-                            type="json",
-                            id=item_id
-                        ))
-                    except: continue
-                return nodes
-                
-        elif category in ["activity_logs", "logs"]:
-            if len(parts) == 1:
-                return [self._create_node("system", True, "logs/system")]
-            else:
-                l_type = parts[1]
-                items = self.store.db.get_logs(agent_id, l_type, limit=100) or []
-                nodes = []
-                for item in items:
-                    try:
-                        ts = str(item.get('created_at', ''))[:19].replace(':', '-') or "unknown"
-                        item_id = str(item.get('id', 'unknown'))
-                        nodes.append(self._create_node(
-                            name=f"Log_{ts}_{item_id}.txt",
-                            is_dir=False,
-                            path=f"logs/system/Log_{ts}_{item_id}.txt",
-                            size=len(str(item.get('event', ''))),
-                            date=item.get('created_at'),
-                            type="text",
-                            id=item_id
-                        ))
-                    except: continue
-                return nodes
-                
-        elif category in ["vectors", "vec"]:
-            if len(parts) == 1:
-                 return [self._create_node("index", True, "vectors/index")]
-            else:
-                 # vectors/index
-                 if getattr(self.store, 'vector_engine', None):
-                     # Fetch vectors
-                     vectors = self.store.vector_engine.get_agent_vectors(agent_id, limit=100)
-                     nodes = []
-                     for v in vectors:
-                         vid = v.get('id')
-                         nodes.append(self._create_node(
-                             name=f"Vector_{vid}.json",
-                             is_dir=False,
-                             path=f"vectors/index/Vector_{vid}.json",
-                             size=len(str(v.get('content', ''))),
-                             date=str(v.get('metadata', {}).get('timestamp', datetime.now().isoformat())),
-                             type="vector",
-                             id=vid
-                         ))
-                     return nodes
-                 return []
-                
-        return []
+    def _load_page(self, agent_id: str, category: str, subtype: str, directory: str,
+                   limit: int, position: Optional[Dict[str, Any]], sort: str) -> Dict[str, Any]:
+        """Fetch limit+1 rows from the backend to learn whether another page exists."""
+        ascending = sort == "oldest"
+        
+        if category == "vectors":
+            offset = (position or {}).get("offset", 0)
+            rows = []
+            if getattr(self.store, 'vector_engine', None):
+                rows = self.store.vector_engine.get_agent_vectors(agent_id, limit=limit + 1, offset=offset) or []
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(directory, sort, {"offset": offset + limit}) if has_more else None
+            return {"items": [self._vector_node(v) for v in rows], "next_cursor": next_cursor}
+        
+        if category == "context":
+            rows = self.store.db.get_memories(agent_id, subtype, limit=limit + 1, after=position, ascending=ascending)
+            node_fn = lambda item: self._memory_node(item, subtype)
+        elif category == "docs":
+            rows = self.store.db.get_memories(agent_id, "knowledge", limit=limit + 1, after=position, ascending=ascending)
+            node_fn = self._doc_node
+        elif category == "checkpoints":
+            rows = self.store.db.get_checkpoints(agent_id, subtype, limit=limit + 1, after=position, ascending=ascending)
+            node_fn = lambda item: self._checkpoint_node(item, subtype)
+        else:
+            rows = self.store.db.get_logs(agent_id, subtype, limit=limit + 1, after=position, ascending=ascending)
+            node_fn = self._log_node
+        
+        rows = rows or []
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        nodes = []
+        for item in rows:
+            try:
+                nodes.append(node_fn(item))
+            except: continue
+        
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = self._encode_cursor(directory, sort, {
+                "created_at": str(last.get('created_at', '')), "id": str(last.get('id', ''))
+            })
+        return {"items": nodes, "next_cursor": next_cursor}
+
+    # ------------------------------------------------------------------
+    # Node builders
+    # ------------------------------------------------------------------
+
+    def _memory_node(self, item: Dict, mtype: str) -> Dict:
+        ts = str(item.get('created_at', ''))[:19].replace(':', '-') or "unknown"
+        item_id = str(item.get('id', 'unknown'))
+        return self._create_node(
+            name=f"{ts}_{item_id}.json",
+            is_dir=False,
+            path=f"context/{mtype}/{ts}_{item_id}.json",
+            size=len(str(item.get('content', ''))),
+            date=item.get('created_at'),
+            type="json",
+            id=item_id
+        )
+
+    def _doc_node(self, item: Dict) -> Dict:
+        item_id = str(item.get('id', 'unknown'))
+        return self._create_node(
+            name=f"Doc_{item_id}.md",
+            is_dir=False,
+            path=f"docs/knowledge/Doc_{item_id}.md",
+            size=len(str(item.get('content', ''))),
+            date=item.get('created_at'),
+            type="markdown",
+            id=item_id
+        )
+
+    def _checkpoint_node(self, item: Dict, c_type: str) -> Dict:
+        ts = str(item.get('created_at', ''))[:19].replace(':', '-') or "unknown"
+        item_id = str(item.get('id', 'unknown'))
+        return self._create_node(
+            name=f"Checkpoint_{ts}_{item_id}.json",
+            is_dir=False,
+            path=f"checkpoints/{c_type}/Checkpoint_{ts}_{item_id}.json",
+            size=len(str(item.get('state_dump', ''))),
+            date=item.get('created_at'),
+            type="json",
+            id=item_id
+        )
+
+    def _log_node(self, item: Dict) -> Dict:
+        ts = str(item.get('created_at', ''))[:19].replace(':', '-') or "unknown"
+        item_id = str(item.get('id', 'unknown'))
+        return self._create_node(
+            name=f"Log_{ts}_{item_id}.txt",
+            is_dir=False,
+            path=f"logs/system/Log_{ts}_{item_id}.txt",
+            size=len(str(item.get('event', ''))),
+            date=item.get('created_at'),
+            type="text",
+            id=item_id
+        )
+
+    def _vector_node(self, v: Dict) -> Dict:
+        vid = v.get('id')
+        return self._create_node(
+            name=f"Vector_{vid}.json",
+            is_dir=False,
+            path=f"vectors/index/Vector_{vid}.json",
+            size=len(str(v.get('content', ''))),
+            date=str(v.get('metadata', {}).get('timestamp', datetime.now().isoformat())),
+            type="vector",
+            id=vid
+        )
 
     def read_file(self, agent_id: str, virtual_path: str) -> Optional[Dict]:
         """
@@ -9,13 +9,18 @@ Provides unified access to:
 - Activity Logs
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
+import os
 import uuid
 import json
+import hashlib
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from .chunk_store import ChunkStore
+from .telemetry import TelemetryBuffer
+
 
 class FolderType(Enum):
     """Types of folders in the GitMem structure."""
@@ -99,6 +104,18 @@ FOLDER_PERMISSIONS = {
 }
 
 
+# Telemetry kind -> (raw table, filters) whose rows the kind's rollups count;
+# used to seed the rollups with rows written before they existed
+TELEMETRY_SOURCES = {
+    "api": ("gitmem_api_logs", {}),
+    "mcp": ("gitmem_mcp_inputs", {}),
+    "webhook": ("gitmem_webhooks", {}),
+    "access": ("gitmem_activity_logs", {"log_type": "access"}),
+    "mutation": ("gitmem_activity_logs", {"log_type": "mutation"}),
+    "error": ("gitmem_activity_logs", {"log_type": "error"}),
+}
+
+
 @dataclass
 class Document:
     """Represents a document in the documents/ folder."""
@@ -109,7 +126,10 @@ class Document:
     content_type: str = ""
     size_bytes: int = 0
     storage_path: str = ""
-    content: str = ""
+    content: str = ""  # Empty once stored as chunks; see chunk_manifest
+    tenant_id: str = ""
+    content_hash: str = ""  # SHA-256 of the full content
+    chunk_manifest: List[str] = field(default_factory=list)  # Ordered chunk hashes
     description: str = ""
     tags: List[str] = field(default_factory=list)
     uploaded_by: str = ""
@@ -211,10 +231,21 @@ class FolderManager:
     access control and Supabase integration.
     """
     
-    def __init__(self, supabase_client=None):
-        """Initialize the folder manager."""
+    def __init__(self, supabase_client=None, tenant_id: str = None, chunked_documents: bool = True,
+                 telemetry_sample_rates: Dict[str, float] = None):
+        """
+        Initialize the folder manager.
+        Document content is stored as deduplicated chunks shared by all
+        agents of `tenant_id` unless chunked_documents is False.
+        API/MCP/webhook/activity rows go through a buffered, sampled
+        telemetry layer (see telemetry.py).
+        """
         self.db = supabase_client
+        self.tenant_id = tenant_id or os.getenv("GITMEM_TENANT_ID", "default")
+        self.chunked_documents = chunked_documents
         self._init_db()
+        self.chunks = ChunkStore(self.db) if self.db else None
+        self.telemetry = TelemetryBuffer(self.db, sample_rates=telemetry_sample_rates) if self.db else None
     
     def _init_db(self):
         """Initialize database connection if not provided."""
@@ -260,12 +291,28 @@ class FolderManager:
             return doc.id
         
         try:
+            # The stored row is a copy: the caller's doc keeps its content if anything fails
             data = asdict(doc)
+            content = doc.content
+            chunked = bool(self.chunked_documents and content)
+            if chunked:
+                data["tenant_id"] = doc.tenant_id or self.tenant_id
+                data["content_hash"] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+                data["size_bytes"] = doc.size_bytes or len(content.encode("utf-8"))
+                data["chunk_manifest"] = self.chunks.put(data["tenant_id"], content)
+                data["content"] = ""
+            
             # Convert lists to proper format
             data['tags'] = doc.tags if doc.tags else []
             
             self.db.table("gitmem_documents").insert(data).execute()
             
+            if chunked:
+                # A delete racing with this insert may have collected a chunk put() deduplicated against
+                hashes = list(set(data["chunk_manifest"]))
+                if len(self.chunks.existing(data["tenant_id"], hashes)) < len(hashes):
+                    self.chunks.put(data["tenant_id"], content)
+            
             # Log activity
             self._log_activity(doc.agent_id, "mutation", "create", "document", doc.id, "user", doc.uploaded_by)
             
@@ -274,8 +321,13 @@ class FolderManager:
             print(f"[FolderManager] Error adding document: {e}")
             return doc.id
     
-    def get_documents(self, agent_id: str, folder: str = None, limit: int = 50) -> List[Dict]:
-        """Get documents for an agent."""
+    def get_documents(self, agent_id: str, folder: str = None, limit: int = 50,
+                      include_content: bool = True) -> List[Dict]:
+        """
+        Get documents for an agent.
+        Chunked documents are reassembled unless include_content is False
+        (use stream_document to read them lazily).
+        """
         if not self.db:
             return []
         
@@ -286,23 +338,70 @@ class FolderManager:
                 query = query.eq("folder", folder)
             
             result = query.order("created_at", desc=True).limit(limit).execute()
-            return result.data or []
+            docs = result.data or []
+            if include_content:
+                for doc in docs:
+                    if doc.get("chunk_manifest") and not doc.get("content"):
+                        doc["content"] = "".join(self._iter_content(doc))
+            return docs
         except Exception as e:
             print(f"[FolderManager] Error getting documents: {e}")
             return []
     
+    def stream_document(self, agent_id: str, doc_id: str) -> Iterator[str]:
+        """Yield a document's content piece by piece (chunk by chunk when chunked)."""
+        if not self.db:
+            return
+        
+        result = self.db.table("gitmem_documents").select("*").eq("id", doc_id).eq("agent_id", agent_id).limit(1).execute()
+        if not result.data:
+            return
+        self.log_access(agent_id, "document", doc_id, "user", "")
+        yield from self._iter_content(result.data[0])
+    
+    def _iter_content(self, doc: Dict) -> Iterator[str]:
+        if doc.get("chunk_manifest") and not doc.get("content"):
+            yield from self.chunks.iter_chunks(doc.get("tenant_id") or self.tenant_id, doc["chunk_manifest"])
+        elif doc.get("content"):
+            yield doc["content"]
+    
     def delete_document(self, agent_id: str, doc_id: str) -> bool:
         """Delete a document."""
         if not self.db:
             return False
         
         try:
-            self.db.table("gitmem_documents").delete().eq("id", doc_id).eq("agent_id", agent_id).execute()
+            result = self.db.table("gitmem_documents").delete().eq("id", doc_id).eq("agent_id", agent_id).execute()
             self._log_activity(agent_id, "mutation", "delete", "document", doc_id, "user", "")
-            return True
         except Exception as e:
             print(f"[FolderManager] Error deleting document: {e}")
             return False
+        
+        for row in result.data or []:
+            if row.get("chunk_manifest"):
+                self._release_chunks(row.get("tenant_id") or self.tenant_id, row["chunk_manifest"])
+        return True
+    
+    def _release_chunks(self, tenant_id: str, manifest: List[str]) -> int:
+        """
+        Delete the chunks of a removed document that no other document of the
+        tenant still lists in its manifest. Returns the number deleted.
+        """
+        hashes = list(dict.fromkeys(manifest))
+        try:
+            referenced = set()
+            for i in range(0, len(hashes), ChunkStore.FETCH_BATCH):
+                batch = hashes[i:i + ChunkStore.FETCH_BATCH]
+                res = self.db.table("gitmem_documents").select("chunk_manifest").eq("tenant_id", tenant_id) \
+                    .overlaps("chunk_manifest", batch).execute()
+                for row in res.data or []:
+                    referenced.update(row.get("chunk_manifest") or [])
+            orphans = [h for h in hashes if h not in referenced]
+            return self.chunks.delete(tenant_id, orphans) if orphans else 0
+        except Exception as e:
+            # Leaves orphaned chunks behind; they are only storage, never read
+            print(f"[FolderManager] Error releasing chunks: {e}")
+            return 0
     
     # =========================================================================
     # Checkpoint Operations
@@ -348,7 +447,11 @@ class FolderManager:
         
         try:
             result = self.db.table("gitmem_checkpoints").select("*").eq("id", checkpoint_id).limit(1).execute()
-            return result.data[0] if result.data else None
+            if not result.data:
+                return None
+            checkpoint = result.data[0]
+            self.log_access(checkpoint.get("agent_id", ""), "checkpoint", checkpoint_id, "user", "")
+            return checkpoint
         except Exception as e:
             print(f"[FolderManager] Error getting checkpoint: {e}")
             return None
@@ -363,8 +466,8 @@ class FolderManager:
             return log.id
         
         try:
-            data = asdict(log)
-            self.db.table("gitmem_api_logs").insert(data).execute()
+            is_error = log.response_status >= 400 or bool(log.error_message)
+            self.telemetry.record("gitmem_api_logs", asdict(log), "api", log.agent_id, is_error)
             return log.id
         except Exception as e:
             print(f"[FolderManager] Error logging API call: {e}")
@@ -392,8 +495,8 @@ class FolderManager:
             return mcp_input.id
         
         try:
-            data = asdict(mcp_input)
-            self.db.table("gitmem_mcp_inputs").insert(data).execute()
+            is_error = not mcp_input.success or bool(mcp_input.error_message)
+            self.telemetry.record("gitmem_mcp_inputs", asdict(mcp_input), "mcp", mcp_input.agent_id, is_error)
             return mcp_input.id
         except Exception as e:
             print(f"[FolderManager] Error logging MCP input: {e}")
@@ -426,8 +529,8 @@ class FolderManager:
             return webhook.id
         
         try:
-            data = asdict(webhook)
-            self.db.table("gitmem_webhooks").insert(data).execute()
+            self.telemetry.record("gitmem_webhooks", asdict(webhook), "webhook", webhook.agent_id,
+                                  bool(webhook.error_message))
             return webhook.id
         except Exception as e:
             print(f"[FolderManager] Error logging webhook: {e}")
@@ -458,6 +561,8 @@ class FolderManager:
             return False
         
         try:
+            # The webhook row may still be buffered
+            self.telemetry.flush()
             self.db.table("gitmem_webhooks").update({
                 "processed": True,
                 "processed_at": datetime.now().isoformat()
@@ -489,10 +594,36 @@ class FolderManager:
                 actor_id=actor_id,
                 details=details or {}
             )
-            self.db.table("gitmem_activity_logs").insert(asdict(log)).execute()
+            self.telemetry.record("gitmem_activity_logs", asdict(log), log_type, agent_id, log_type == "error")
         except Exception as e:
             print(f"[FolderManager] Error logging activity: {e}")
     
+    def log_access(self, agent_id: str, resource_type: str, resource_id: str,
+                   actor_type: str, actor_id: str, details: Dict = None):
+        """Log a read. Access logs are sampled (see TelemetryBuffer.sample_rates)."""
+        self._log_activity(agent_id, "access", "read", resource_type, resource_id, actor_type, actor_id, details)
+    
+    def telemetry_counts(self, agent_id: str, kinds: List[str]) -> Dict[str, int]:
+        """
+        All-time telemetry counts per kind from the rollups. The first read
+        of a kind seeds its rollup from a raw count of the source table.
+        """
+        if not self.telemetry:
+            return {}
+        return self.telemetry.counts(agent_id, kinds, seed=lambda kind: self._count_raw(agent_id, kind))
+    
+    def _count_raw(self, agent_id: str, kind: str) -> int:
+        table, filters = TELEMETRY_SOURCES[kind]
+        query = self.db.table(table).select("id", count="exact").eq("agent_id", agent_id)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        return query.limit(1).execute().count or 0
+    
+    def flush_telemetry(self):
+        """Write buffered telemetry rows and rollups immediately."""
+        if self.telemetry:
+            self.telemetry.flush()
+    
     def get_activity_logs(self, agent_id: str, log_type: str = None, limit: int = 100) -> List[Dict]:
         """Get activity logs for an agent."""
         if not self.db:
@@ -555,10 +686,11 @@ class FolderManager:
                 res = self.db.table("gitmem_documents").select("*", count="exact").eq("agent_id", agent_id).eq("folder", folder).limit(1).execute()
                 stats["documents"][folder] = res.count or 0
             
-            # Get source counts
-            stats["sources"]["api"] = len(self.get_api_logs(agent_id, limit=1000))
-            stats["sources"]["mcp"] = len(self.get_mcp_inputs(agent_id, limit=1000))
-            stats["sources"]["webhooks"] = len(self.get_webhooks(agent_id, limit=1000))
+            # Get source counts from the telemetry rollups (no raw row scans)
+            counts = self.telemetry_counts(agent_id, ["api", "mcp", "webhook"])
+            stats["sources"]["api"] = counts.get("api", 0)
+            stats["sources"]["mcp"] = counts.get("mcp", 0)
+            stats["sources"]["webhooks"] = counts.get("webhook", 0)
             
             # Get checkpoint counts
             for cp_type in ["snapshot", "session", "recovery"]:
@@ -0,0 +1,213 @@
+"""
+GitMem Indexing Queue - Asynchronous batched writes to the vector index.
+
+Memory writes enqueue their documents and return immediately. A single
+worker thread groups pending adds per collection and flushes a batch when
+it reaches `max_batch` items or its oldest item has waited `max_latency`
+seconds. Failed batches are retried with exponential backoff; a batch that
+fails on its data (duplicate IDs, invalid metadata) is bisected instead, so
+only the offending items are dropped.
+
+flush() is a read-your-writes barrier: it returns once everything enqueued
+before the call has been indexed (or has permanently failed). Every queue
+is flushed once more at interpreter exit, so queued writes survive a
+normal shutdown of the daemon worker.
+"""
+
+import atexit
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Errors caused by the items themselves: retrying the same batch cannot succeed
+PERMANENT_ERRORS: Tuple[type, ...] = (ValueError, TypeError, KeyError)
+
+_live_queues: "weakref.WeakSet[IndexingQueue]" = weakref.WeakSet()
+
+
+@dataclass
+class _PendingBatch:
+    texts: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+    seqs: List[int] = field(default_factory=list)
+    first_enqueued: float = 0.0
+
+
+class IndexingQueue:
+    """
+    Batches pending vector adds per collection.
+
+    `write_batch(collection_name, texts, metadatas, ids)` performs the real
+    write and must raise on failure. Exceptions in `permanent_errors` are
+    blamed on the items and bisected; anything else is retried.
+    """
+
+    def __init__(self, write_batch: Callable[[str, List[str], List[Dict[str, Any]], List[str]], None],
+                 max_batch: int = 64, max_latency: float = 0.25,
+                 max_retries: int = 3, retry_backoff: float = 0.5,
+                 permanent_errors: Tuple[type, ...] = PERMANENT_ERRORS, shutdown_timeout: float = 10.0):
+        self._write_batch = write_batch
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.permanent_errors = permanent_errors
+        self.shutdown_timeout = shutdown_timeout
+
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[str, _PendingBatch]" = OrderedDict()
+        self._outstanding = set()  # seqs enqueued but not yet indexed/failed
+        self._seq = 0
+        self._force_flush = False
+        self._worker: Optional[threading.Thread] = None
+        self._stats = {"enqueued": 0, "indexed": 0, "failed": 0, "batches": 0, "retries": 0, "splits": 0}
+        _live_queues.add(self)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, collection_name: str, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]) -> int:
+        """Queue documents for indexing; returns the sequence number of the last one."""
+        with self._cond:
+            batch = self._pending.get(collection_name)
+            if batch is None:
+                batch = _PendingBatch(first_enqueued=time.monotonic())
+                self._pending[collection_name] = batch
+
+            for text, meta, doc_id in zip(texts, metadatas, ids):
+                self._seq += 1
+                batch.texts.append(text)
+                batch.metadatas.append(meta)
+                batch.ids.append(doc_id)
+                batch.seqs.append(self._seq)
+                self._outstanding.add(self._seq)
+                self._stats["enqueued"] += 1
+
+            self._ensure_worker()
+            self._cond.notify_all()
+            return self._seq
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until everything enqueued so far is indexed.
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._seq
+            self._force_flush = True
+            self._cond.notify_all()
+
+            while self._outstanding and min(self._outstanding) <= target:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self, timeout: float = None) -> bool:
+        """Flush before shutdown; logs what is lost if the timeout expires."""
+        with self._cond:
+            if not self._outstanding:
+                return True
+        if self.flush(timeout=timeout):
+            return True
+        with self._cond:
+            print(f"[IndexingQueue] Shutdown flush timed out; {len(self._outstanding)} items not indexed")
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue metrics, including the indexing lag of the oldest pending item."""
+        with self._cond:
+            now = time.monotonic()
+            oldest = min((b.first_enqueued for b in self._pending.values()), default=None)
+            return {
+                **self._stats,
+                "pending": sum(len(b.ids) for b in self._pending.values()),
+                "outstanding": len(self._outstanding),
+                "lag_ms": round((now - oldest) * 1000, 1) if oldest is not None else 0.0
+            }
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self):
+        # Called with the condition held
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="gitmem-indexer", daemon=True)
+            self._worker.start()
+
+    def _next_ready(self) -> Optional[tuple]:
+        """Pop a batch that hit its size/latency trigger (condition held)."""
+        now = time.monotonic()
+        for name, batch in self._pending.items():
+            if self._force_flush or len(batch.ids) >= self.max_batch or now - batch.first_enqueued >= self.max_latency:
+                del self._pending[name]
+                return name, batch
+        if not self._pending:
+            self._force_flush = False
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                ready = self._next_ready()
+                while ready is None:
+                    if self._pending:
+                        oldest = min(b.first_enqueued for b in self._pending.values())
+                        self._cond.wait(max(0.0, oldest + self.max_latency - time.monotonic()))
+                    else:
+                        self._cond.wait()
+                    ready = self._next_ready()
+
+            name, batch = ready
+            # Oversized batches are split so one flush never exceeds max_batch
+            for start in range(0, len(batch.ids), self.max_batch):
+                end = start + self.max_batch
+                seqs = batch.seqs[start:end]
+                indexed = self._write_with_retry(name, batch.texts[start:end], batch.metadatas[start:end], batch.ids[start:end])
+                with self._cond:
+                    self._stats["batches"] += 1
+                    self._stats["indexed"] += indexed
+                    self._stats["failed"] += len(seqs) - indexed
+                    self._outstanding.difference_update(seqs)
+                    self._cond.notify_all()
+
+    def _write_with_retry(self, name: str, texts, metadatas, ids) -> int:
+        """Write one batch; returns how many of its items were indexed."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._write_batch(name, texts, metadatas, ids)
+                return len(ids)
+            except self.permanent_errors as e:
+                if len(ids) == 1:
+                    print(f"[IndexingQueue] Dropping item {ids[0]} for {name}: {e}")
+                    return 0
+                # Bisect so the bad item(s) cannot take the rest of the batch down
+                with self._cond:
+                    self._stats["splits"] += 1
+                mid = len(ids) // 2
+                return (self._write_with_retry(name, texts[:mid], metadatas[:mid], ids[:mid])
+                        + self._write_with_retry(name, texts[mid:], metadatas[mid:], ids[mid:]))
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"[IndexingQueue] Dropping batch of {len(ids)} for {name} after {attempt + 1} attempts: {e}")
+                    return 0
+                with self._cond:
+                    self._stats["retries"] += 1
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        return 0
+
+
+@atexit.register
+def _flush_on_exit():
+    """Index what is still queued before the interpreter exits (the workers are daemons)."""
+    for queue in list(_live_queues):
+        queue.close(timeout=queue.shutdown_timeout)
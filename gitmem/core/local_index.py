@@ -0,0 +1,128 @@
+"""
+GitMem Local Agent Index - Per-agent counts for the local gitmem_data/ layout.
+
+Keeps memory counts, commit counts and last activity for every agent under
+refs/agents in a single JSON file (indexes/local_agents.json), so listing
+local agents is one file read instead of parsing every commit per agent.
+
+GitMem itself never writes this layout (MemoryStore is cloud-backed), so the
+index is rebuilt on demand whenever the refs/, memory/ or commits/
+directories change.
+"""
+
+import os
+import json
+import threading
+from typing import Dict, Any, List
+
+
+MEMORY_TYPES = ["episodic", "semantic", "procedural"]
+
+
+class LocalAgentIndex:
+    """Small on-disk index of local agent repositories."""
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self.index_path = os.path.join(root_path, "indexes", "local_agents.json")
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = None
+
+    # ------------------------------------------------------------------
+    # Paths and change detection
+    # ------------------------------------------------------------------
+
+    def _watched_dirs(self) -> List[str]:
+        dirs = [os.path.join(self.root_path, "refs", "agents"), os.path.join(self.root_path, "commits")]
+        dirs.extend(os.path.join(self.root_path, "memory", mtype) for mtype in MEMORY_TYPES)
+        return dirs
+
+    def _signature(self) -> Dict[str, float]:
+        """Directory mtimes; any file added/removed in a watched dir changes it."""
+        sig = {}
+        for path in self._watched_dirs():
+            try:
+                sig[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                sig[path] = None
+        return sig
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    def get_agents(self) -> Dict[str, Dict[str, Any]]:
+        """Return {agent_id: {memory_count, commit_count, last_active}}."""
+        with self._lock:
+            if self._data is None:
+                self._data = self._load()
+
+            if self._data is None or self._data.get("signature") != self._signature():
+                self._data = self._rebuild()
+                self._save(self._data)
+
+            return dict(self._data["agents"])
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, data: Dict[str, Any]):
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"[LocalAgentIndex] Failed to write index: {e}")
+
+    # ------------------------------------------------------------------
+    # Rebuild (single pass over memory/ and commits/)
+    # ------------------------------------------------------------------
+
+    def rebuild(self):
+        """Force a full rebuild of the index."""
+        with self._lock:
+            self._data = self._rebuild()
+            self._save(self._data)
+
+    def _rebuild(self) -> Dict[str, Any]:
+        signature = self._signature()
+        agents: Dict[str, Dict[str, Any]] = {}
+
+        refs_path = os.path.join(self.root_path, "refs", "agents")
+        if os.path.exists(refs_path):
+            for agent_id in os.listdir(refs_path):
+                agents[agent_id] = {"memory_count": 0, "commit_count": 0, "last_active": None}
+
+        # Memory files are named "<agent_id>_<...>"; agent IDs may contain underscores
+        for mtype in MEMORY_TYPES:
+            mpath = os.path.join(self.root_path, "memory", mtype)
+            if not os.path.exists(mpath):
+                continue
+            for fname in os.listdir(mpath):
+                for i, ch in enumerate(fname):
+                    if ch == "_" and fname[:i] in agents:
+                        agents[fname[:i]]["memory_count"] += 1
+
+        commits_path = os.path.join(self.root_path, "commits")
+        if os.path.exists(commits_path):
+            for fname in os.listdir(commits_path):
+                try:
+                    with open(os.path.join(commits_path, fname)) as f:
+                        c = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                entry = agents.get(c.get("agent_id"))
+                if entry is None:
+                    continue
+                entry["commit_count"] += 1
+                ts = c.get("timestamp")
+                if ts and (entry["last_active"] is None or str(ts) > entry["last_active"]):
+                    entry["last_active"] = str(ts)
+
+        return {"signature": signature, "agents": agents}
@@ -0,0 +1,432 @@
+"""
+GitMem Local Vector Index - Embedded NumPy backend for VectorEngine.
+
+Used instead of chromadb.EphemeralClient() when no Chroma credentials are
+configured, so single-node deployments and tests get durable vector search
+without a server.
+
+Each collection lives in its own directory:
+- vectors.f32  float32 matrix (capacity x dim), memory-mapped and grown by doubling
+- rows.jsonl   append-only side table (id, document, metadata) replayed on open
+- rows.lock    exclusive file lock held by writers
+
+Row numbers follow the order of rows.jsonl. A writer takes the file lock and
+replays the log tail before assigning rows, and readers replay the tail on
+each call, so several worker processes agree on the id -> row mapping.
+
+Rows are partitioned by metadata agent_id, metadata is kept column-wise for
+filtering, and top-k uses a single matrix-vector product plus argpartition.
+
+The client/collection objects mirror the subset of the Chroma API that
+VectorEngine uses (get_or_create_collection, add, query, get, count), so the
+engine code paths are unchanged.
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+
+DEFAULT_DIM = 384
+
+EmbeddingFunction = Callable[[List[str]], List[List[float]]]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbedding:
+    """
+    Dependency-free text embedding (signed feature hashing of word unigrams
+    and bigrams). Deterministic across processes; pass a real model's
+    embedding function to LocalVectorClient for semantic quality.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall((text or "").lower())
+            features = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                h = int.from_bytes(digest, "little")
+                out[row, h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        return out
+
+
+class LocalVectorCollection:
+    """One persistent collection: mmap'd vectors plus a columnar side table."""
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, name: str, path: str, embedding_function: EmbeddingFunction, dim: int = DEFAULT_DIM):
+        self.name = name
+        self.path = path
+        self._embed = embedding_function
+        self.dim = dim
+        self._lock = threading.RLock()
+
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._rows_path = os.path.join(path, "rows.jsonl")
+        self._lock_path = os.path.join(path, "rows.lock")
+        self._rows_offset = 0  # Bytes of rows.jsonl already applied
+
+        self._ids: List[str] = []
+        self._documents: List[Optional[str]] = []
+        self._columns: Dict[str, List[Any]] = {}      # metadata key -> value per row (None if absent)
+        self._row_of: Dict[str, int] = {}
+        self._partitions: Dict[Any, List[int]] = {}   # agent_id -> rows
+        self._partition_arrays: Dict[Any, np.ndarray] = {}
+        self._matrix: Optional[np.memmap] = None
+        self._capacity = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._open()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _open(self):
+        with self._file_lock():
+            self._replay_rows()
+            self._remap()
+        # Rows whose vectors never reached the file are dropped
+        if len(self._ids) > self._capacity:
+            self._truncate(self._capacity)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _replay_rows(self):
+        """Apply rows appended to rows.jsonl since the last call (by any process)."""
+        try:
+            with open(self._rows_path, "rb") as f:
+                f.seek(self._rows_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partially written line: pick it up next time
+                    self._rows_offset += len(line)
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # Torn line from a crash
+                    self._set_row(rec["id"], rec.get("document"), rec.get("metadata") or {})
+        except FileNotFoundError:
+            pass
+
+    def _remap(self):
+        """Map the whole vectors file; another process may have grown it."""
+        try:
+            capacity = os.path.getsize(self._vectors_path) // (4 * self.dim)
+        except FileNotFoundError:
+            capacity = 0
+        if capacity <= self._capacity:
+            return
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def refresh(self):
+        """Pick up rows written by other processes since the last call."""
+        with self._lock:
+            try:
+                size = os.path.getsize(self._rows_path)
+            except FileNotFoundError:
+                return
+            if size > self._rows_offset:
+                self._replay_rows()
+                self._remap()
+
+    def _truncate(self, n: int):
+        for doc_id in self._ids[n:]:
+            del self._row_of[doc_id]
+        del self._ids[n:]
+        del self._documents[n:]
+        for values in self._columns.values():
+            del values[n:]
+        self._rebuild_partitions()
+
+    def _ensure_capacity(self, needed: int):
+        if needed <= self._capacity:
+            return
+        capacity = max(self.INITIAL_CAPACITY, self._capacity * 2, needed)
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    # ------------------------------------------------------------------
+    # Side table
+    # ------------------------------------------------------------------
+
+    def _set_row(self, doc_id: str, document: Optional[str], metadata: Dict[str, Any]) -> int:
+        row = self._row_of.get(doc_id)
+        if row is None:
+            row = len(self._ids)
+            self._row_of[doc_id] = row
+            self._ids.append(doc_id)
+            self._documents.append(document)
+            for values in self._columns.values():
+                values.append(None)
+        else:
+            self._documents[row] = document
+            # Overwrite: move the row out of its old partition and clear its columns
+            agents = self._columns.get("agent_id")
+            old_agent = agents[row] if agents is not None else None
+            old_rows = self._partitions.get(old_agent)
+            if old_rows and row in old_rows:
+                old_rows.remove(row)
+            self._partition_arrays.pop(old_agent, None)
+            for values in self._columns.values():
+                values[row] = None
+
+        for key, value in metadata.items():
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = [None] * len(self._ids)
+            column[row] = value
+
+        agent_id = metadata.get("agent_id")
+        self._partitions.setdefault(agent_id, []).append(row)
+        self._partition_arrays.pop(agent_id, None)
+        return row
+
+    def _rebuild_partitions(self):
+        self._partitions = {}
+        self._partition_arrays = {}
+        agents = self._columns.get("agent_id", [None] * len(self._ids))
+        for row, agent_id in enumerate(agents):
+            self._partitions.setdefault(agent_id, []).append(row)
+
+    def _metadata(self, row: int) -> Dict[str, Any]:
+        return {k: v[row] for k, v in self._columns.items() if v[row] is not None}
+
+    # ------------------------------------------------------------------
+    # Filtering
+    # ------------------------------------------------------------------
+
+    def _candidates(self, where: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Rows matching a Chroma-style where clause (uses the agent partition when possible)."""
+        n = len(self._ids)
+        if not where:
+            return np.arange(n)
+
+        agent = where.get("agent_id")
+        if agent is not None and not isinstance(agent, dict):
+            rows = self._partition_arrays.get(agent)
+            if rows is None:
+                rows = self._partition_arrays[agent] = np.array(self._partitions.get(agent, []), dtype=np.int64)
+            rest = {k: v for k, v in where.items() if k != "agent_id"}
+            if not rest or not len(rows):
+                return rows
+            return rows[self._mask(rest, rows)]
+
+        rows = np.arange(n)
+        return rows[self._mask(where, rows)]
+
+    def _mask(self, where: Dict[str, Any], rows: np.ndarray) -> np.ndarray:
+        mask = np.ones(len(rows), dtype=bool)
+        for key, cond in where.items():
+            if key == "$and":
+                for sub in cond:
+                    mask &= self._mask(sub, rows)
+            elif key == "$or":
+                any_mask = np.zeros(len(rows), dtype=bool)
+                for sub in cond:
+                    any_mask |= self._mask(sub, rows)
+                mask &= any_mask
+            else:
+                column = self._columns.get(key)
+                values = np.array(column, dtype=object)[rows] if column is not None else np.full(len(rows), None, dtype=object)
+                mask &= self._compare(values, cond)
+        return mask
+
+    @staticmethod
+    def _compare(values: np.ndarray, cond: Any) -> np.ndarray:
+        if not isinstance(cond, dict):
+            cond = {"$eq": cond}
+        mask = np.ones(len(values), dtype=bool)
+        for op, target in cond.items():
+            if op == "$eq":
+                mask &= values == target
+            elif op == "$ne":
+                mask &= values != target
+            elif op in ("$in", "$nin"):
+                hit = np.array([v in target for v in values], dtype=bool)
+                mask &= hit if op == "$in" else ~hit
+            elif op in ("$gt", "$gte", "$lt", "$lte"):
+                cmp = {"$gt": lambda v: v > target, "$gte": lambda v: v >= target,
+                       "$lt": lambda v: v < target, "$lte": lambda v: v <= target}[op]
+                mask &= np.array([v is not None and isinstance(v, (int, float)) and cmp(v) for v in values], dtype=bool)
+            else:
+                raise ValueError(f"Unsupported where operator: {op}")
+        return mask
+
+    # ------------------------------------------------------------------
+    # Chroma-compatible surface
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._ids)
+
+    def add(self, documents: List[str], metadatas: List[Dict[str, Any]] = None, ids: List[str] = None,
+            embeddings: List[List[float]] = None):
+        """Add (or overwrite) documents; vectors are L2-normalised on write."""
+        metadatas = metadatas or [{} for _ in documents]
+        vectors = np.asarray(embeddings if embeddings is not None else self._embed(documents), dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected embeddings of dimension {self.dim}, got {vectors.shape}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+
+        with self._lock, self._file_lock():
+            # Catch up first so new rows are numbered after every other writer's
+            self._replay_rows()
+            self._remap()
+            if os.path.exists(self._rows_path) and os.path.getsize(self._rows_path) > self._rows_offset:
+                # Unterminated tail left by a writer that crashed mid-append
+                os.truncate(self._rows_path, self._rows_offset)
+
+            self._ensure_capacity(len(self._ids) + len(ids))
+            lines = []
+            for doc, meta, doc_id, vec in zip(documents, metadatas, ids, vectors):
+                row = self._set_row(doc_id, doc, meta or {})
+                self._matrix[row] = vec
+                lines.append(json.dumps({"id": doc_id, "document": doc, "metadata": meta or {}}))
+            # Vectors first: a row is only replayed if its vector is on disk
+            self._matrix.flush()
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            with open(self._rows_path, "ab") as f:
+                f.write(data)
+            self._rows_offset += len(data)
+
+    def query(self, query_texts: List[str], n_results: int = 10, where: Dict[str, Any] = None,
+              query_embeddings: List[List[float]] = None, **_) -> Dict[str, List[List[Any]]]:
+        """Cosine top-k per query; distances are 1 - cosine similarity."""
+        queries = np.asarray(query_embeddings if query_embeddings is not None else self._embed(query_texts),
+                             dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1.0, norms)
+
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        with self._lock:
+            self.refresh()
+            rows = self._candidates(where)
+            block = self._matrix[rows] if len(rows) else np.zeros((0, self.dim), dtype=np.float32)
+            for q in queries:
+                scores = block @ q
+                k = min(n_results, len(rows))
+                if k < len(rows):
+                    top = np.argpartition(-scores, k - 1)[:k]
+                else:
+                    top = np.arange(len(rows))
+                top = top[np.argsort(-scores[top], kind="stable")]
+                picked = rows[top]
+                result["ids"].append([self._ids[r] for r in picked])
+                result["documents"].append([self._documents[r] for r in picked])
+                result["metadatas"].append([self._metadata(r) for r in picked])
+                result["distances"].append([float(1.0 - scores[i]) for i in top])
+        return result
+
+    def get(self, ids: List[str] = None, where: Dict[str, Any] = None, limit: int = None, offset: int = None,
+            include: List[str] = None, **_) -> Dict[str, Any]:
+        include = ["documents", "metadatas"] if include is None else include
+        with self._lock:
+            self.refresh()
+            if ids is not None:
+                rows = [self._row_of[i] for i in ids if i in self._row_of]
+                if where:
+                    allowed = set(self._candidates(where).tolist())
+                    rows = [r for r in rows if r in allowed]
+            else:
+                rows = self._candidates(where).tolist()
+            start = offset or 0
+            rows = rows[start:start + limit] if limit is not None else rows[start:]
+
+            return {
+                "ids": [self._ids[r] for r in rows],
+                "documents": [self._documents[r] for r in rows] if "documents" in include else None,
+                "metadatas": [self._metadata(r) for r in rows] if "metadatas" in include else None,
+                "embeddings": np.array(self._matrix[rows]) if "embeddings" in include and rows else None,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+                self._capacity = 0
+
+
+class LocalVectorClient:
+    """Chroma-like client managing LocalVectorCollections under one directory."""
+
+    def __init__(self, path: str, embedding_function: EmbeddingFunction = None, dim: int = DEFAULT_DIM):
+        self.path = path
+        self.dim = dim
+        self._embed = embedding_function or HashingEmbedding(dim)
+        self._collections: Dict[str, LocalVectorCollection] = {}
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _dir(self, name: str) -> str:
+        # Collection names are agent IDs; keep them filesystem-safe
+        return os.path.join(self.path, re.sub(r"[^A-Za-z0-9_.-]", "_", name))
+
+    def get_collection(self, name: str) -> LocalVectorCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                if not os.path.isdir(self._dir(name)):
+                    raise ValueError(f"Collection {name} does not exist.")
+                collection = self._collections[name] = LocalVectorCollection(name, self._dir(name), self._embed, self.dim)
+            return collection
+
+    def get_or_create_collection(self, name: str) -> LocalVectorCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = LocalVectorCollection(name, self._dir(name), self._embed, self.dim)
+            return collection
+
+    def delete_collection(self, name: str):
+        with self._lock:
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection.close()
+            elif not os.path.isdir(self._dir(name)):
+                raise ValueError(f"Collection {name} does not exist.")
+            shutil.rmtree(self._dir(name), ignore_errors=True)
+
+    def list_collections(self) -> List[str]:
+        return sorted(d for d in os.listdir(self.path) if os.path.isdir(os.path.join(self.path, d)))
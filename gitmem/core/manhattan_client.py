@@ -0,0 +1,127 @@
+"""
+Manhattan Memory Client - Access to the Manhattan memory service from GitMem.
+
+Two transports with the same surface:
+- InProcessManhattanClient: calls the SimpleMem systems of an already loaded
+  `api_manhattan` module directly (no loopback HTTP, no JSON round-trip,
+  no second worker held by the same request).
+- HttpManhattanClient: pooled keep-alive HTTP client for deployments where
+  GitMem and the Manhattan API run in different processes.
+
+Use get_manhattan_client() to pick the right one.
+"""
+
+import os
+import sys
+import threading
+from typing import List, Dict, Any, Optional
+
+
+# Module names api_manhattan is imported under (package import or sys.path import)
+_MANHATTAN_MODULES = ("api.api_manhattan", "api_manhattan")
+
+
+def _entry_to_dict(entry) -> Dict[str, Any]:
+    """Serialize a SimpleMem MemoryEntry the same way /read_memory does."""
+    return {
+        "entry_id": entry.entry_id,
+        "lossless_restatement": entry.lossless_restatement,
+        "keywords": entry.keywords,
+        "timestamp": entry.timestamp,
+        "location": entry.location,
+        "persons": entry.persons,
+        "entities": entry.entities,
+        "topic": entry.topic,
+        "memory_type": entry.memory_type
+    }
+
+
+class InProcessManhattanClient:
+    """Direct adapter to the Manhattan memory service living in this process."""
+
+    transport = "in_process"
+
+    def __init__(self, module):
+        self._module = module
+
+    @classmethod
+    def from_loaded_module(cls) -> Optional['InProcessManhattanClient']:
+        """Build an adapter if api_manhattan is already imported (never imports it)."""
+        for name in _MANHATTAN_MODULES:
+            module = sys.modules.get(name)
+            if module is not None and hasattr(module, "_list_memory_entries"):
+                return cls(module)
+        return None
+
+    def read_memory(self, agent_id: str, query: str = "", top_k: int = 50, timeout: float = None) -> List[Dict[str, Any]]:
+        """
+        Read memories for an agent.
+        An empty query lists the most recent entries instead of running retrieval,
+        like /read_memory, and creates no memory system for the agent.
+        """
+        if query:
+            memory_system = self._module._get_or_create_memory_system(agent_id)
+            entries = memory_system.hybrid_retriever.retrieve(query)
+        else:
+            entries = self._module._list_memory_entries(agent_id, limit=top_k)
+
+        return [_entry_to_dict(e) for e in entries[:top_k]]
+
+
+class HttpManhattanClient:
+    """Keep-alive HTTP client for a remote Manhattan API."""
+
+    transport = "http"
+
+    def __init__(self, base_url: str = None, api_key: str = None, pool_size: int = 10):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = (base_url or os.getenv("MANHATTAN_API_URL", "http://127.0.0.1:1078")).rstrip("/")
+        self.api_key = api_key or os.getenv("MANHATTAN_API_KEY", "sk-tg5T-vIyYnuprwVPcgoHGfX37HBsfPwAvHkV3WFyhkE")
+
+        # One pooled session shared by all callers (requests.Session is thread-safe for this use)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+
+    def read_memory(self, agent_id: str, query: str = "", top_k: int = 50, timeout: float = 5) -> List[Dict[str, Any]]:
+        """Read memories for an agent via POST /read_memory (an empty query lists recent entries)."""
+        response = self._session.post(
+            f"{self.base_url}/read_memory",
+            json={"agent_id": agent_id, "query": query, "top_k": top_k},
+            timeout=timeout
+        )
+
+        if response.status_code != 200:
+            return []
+
+        data = response.json()
+        if not data.get("ok"):
+            return []
+        return data.get("results") or data.get("memories") or []
+
+
+_http_client: Optional[HttpManhattanClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_manhattan_client():
+    """
+    Get a Manhattan memory client.
+    Prefers the in-process adapter when api_manhattan is loaded in this process,
+    otherwise returns the shared pooled HTTP client.
+    """
+    global _http_client
+
+    in_process = InProcessManhattanClient.from_loaded_module()
+    if in_process is not None:
+        return in_process
+
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpManhattanClient()
+    return _http_client
@@ -6,6 +6,7 @@ from datetime import datetime
 from .models import MemoryItem, Commit, DiffStats, RepositoryMetadata as RepoMetadata
 from .supabase_connector import SupabaseConnector
 from .file_system import FileSystem
+from .event_bus import emit_memory_added, emit_memory_deleted, emit_commit_created
 
 class MemoryStore:
     def __init__(self, root_path: str = "./gitmem_data"):
@@ -72,9 +73,22 @@ class MemoryStore:
     def add_memory(self, memory: MemoryItem) -> str:
         # 1. Sync to Supabase (Cloud Persistence) ONLY
         self.db.add_memory(memory.model_dump(mode='json', exclude={'embedding'}))
+        self.fs.invalidate(memory.agent_id)
+        
+        # 2. Notify caches/counters (context views, dashboard stats)
+        emit_memory_added(memory.agent_id, memory.id, memory.type.value, memory.content,
+                          importance=memory.importance, scope=memory.scope.value)
         
         return memory.id
 
+    def delete_memory(self, agent_id: str, memory_id: str) -> bool:
+        """Delete one memory (Cloud Only)."""
+        deleted = self.db.delete_memory(agent_id, memory_id)
+        if deleted:
+            self.fs.invalidate(agent_id)
+            emit_memory_deleted(agent_id, memory_id)
+        return deleted
+
     def list_active_memory_ids(self, agent_id: str) -> List[str]:
         """
         Get all accessible memory IDs for an agent from Supabase (Cloud Only).
@@ -119,6 +133,8 @@ class MemoryStore:
         # 5. Update HEAD
         self._set_head(agent_id, commit_hash)
         
+        emit_commit_created(agent_id, commit_hash, message, parent_hash)
+        
         return commit
 
     def get_commit(self, commit_hash: str) -> Optional[Commit]:
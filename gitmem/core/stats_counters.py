@@ -0,0 +1,121 @@
+"""
+GitMem Stats Counters - Incrementally maintained global dashboard stats.
+
+Counters are bumped from EventBus write events so reading them is O(1),
+and periodically reconciled against the source of truth in the background
+to correct any drift (missed events, writes from other processes).
+Events that arrive while a reconcile is running are re-applied on top of
+its result, so the reconcile never swallows them.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+from .event_bus import Event, EventType
+
+
+class StatsCounters:
+    """
+    Global memory/commit/agent counters kept up to date on write.
+
+    `reconcile` must return a dict with total_memories, total_commits,
+    total_agents, active_agents and optionally sources and agent_ids.
+    """
+
+    def __init__(self, reconcile: Callable[[], Dict[str, Any]], reconcile_interval: float = 300.0):
+        self._reconcile_fn = reconcile
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._counters = {"total_memories": 0, "total_commits": 0, "total_agents": 0, "active_agents": 0}
+        self._sources: Dict[str, Any] = {}
+        self._agent_ids: Set[str] = set()
+        self._last_reconciled: Optional[float] = None
+        self._reconciling = False
+        self._initial_lock = threading.Lock()
+        # Deltas applied since the current reconcile generation started
+        self._generation = 0
+        self._deltas = {"total_memories": 0, "total_commits": 0}
+        self._new_agents: Set[str] = set()
+
+    def attach(self, bus):
+        """Subscribe to the write events that move the counters."""
+        bus.subscribe(EventType.MEMORY_ADDED, self._on_event)
+        bus.subscribe(EventType.MEMORY_DELETED, self._on_event)
+        bus.subscribe(EventType.COMMIT_CREATED, self._on_event)
+
+    def _on_event(self, event: Event):
+        with self._lock:
+            if event.type == EventType.MEMORY_ADDED:
+                self._apply("total_memories", 1)
+            elif event.type == EventType.MEMORY_DELETED:
+                self._apply("total_memories", -1)
+            elif event.type == EventType.COMMIT_CREATED:
+                self._apply("total_commits", 1)
+
+            if event.agent_id and event.agent_id not in self._agent_ids:
+                self._agent_ids.add(event.agent_id)
+                self._new_agents.add(event.agent_id)
+                self._counters["total_agents"] += 1
+
+    def _apply(self, key: str, delta: int):
+        # Called with the lock held
+        self._counters[key] = max(0, self._counters[key] + delta)
+        self._deltas[key] += delta
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current counters (O(1)).
+        The first call reconciles synchronously (concurrent first callers
+        wait for that one reconcile); later calls trigger a background
+        reconcile once the interval has elapsed.
+        """
+        if self._last_reconciled is None:
+            with self._initial_lock:
+                if self._last_reconciled is None:
+                    self.reconcile()
+        elif time.monotonic() - self._last_reconciled > self.reconcile_interval:
+            self._reconcile_async()
+
+        with self._lock:
+            return {**self._counters, "sources": dict(self._sources)}
+
+    def reconcile(self):
+        """
+        Replace the counters with fresh values from the source of truth,
+        plus any deltas applied while the source was being queried.
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._deltas = {key: 0 for key in self._deltas}
+            self._new_agents = set()
+
+        try:
+            truth = self._reconcile_fn()
+        except Exception as e:
+            print(f"[StatsCounters] Reconcile failed: {e}")
+            truth = None
+
+        with self._lock:
+            self._last_reconciled = time.monotonic()
+            self._reconciling = False
+            if truth is None or generation != self._generation:
+                # Failed, or a newer reconcile started and will land its own result
+                return
+            for key in self._counters:
+                value = truth.get(key, self._counters[key])
+                self._counters[key] = max(0, value + self._deltas.get(key, 0))
+            self._sources = truth.get("sources", self._sources)
+            if "agent_ids" in truth:
+                known = set(truth["agent_ids"])
+                unseen = self._new_agents - known
+                self._agent_ids = known | unseen
+                self._counters["total_agents"] = truth.get("total_agents", len(known)) + len(unseen)
+
+    def _reconcile_async(self):
+        with self._lock:
+            if self._reconciling:
+                return
+            self._reconciling = True
+        threading.Thread(target=self.reconcile, name="gitmem-stats-reconcile", daemon=True).start()
@@ -59,7 +59,30 @@ class SupabaseConnector:
         except Exception as e:
             self._handle_error(e)
 
-    def get_memories(self, agent_id: str = None, mtype: str = None, limit: int = 50) -> List[Dict]:
+    def delete_memory(self, agent_id: str, memory_id: str) -> bool:
+        if self._disabled or not self.client: return False
+        try:
+            res = self.client.table("gitmem_memories").delete().eq("agent_id", agent_id).eq("id", memory_id).execute()
+            self._error_count = 0
+            return bool(res.data)
+        except Exception as e:
+            self._handle_error(e)
+            return False
+
+    def _keyset(self, query, after: Optional[Dict[str, str]] = None, ascending: bool = False):
+        """
+        Order by (created_at, id) and, when `after` is given, keep only rows past
+        that key. Used for cursor pagination instead of OFFSET scans.
+        """
+        if after:
+            op = "gt" if ascending else "lt"
+            ts = str(after["created_at"]).replace('"', '')
+            row_id = str(after["id"]).replace('"', '')
+            query = query.or_(f'created_at.{op}."{ts}",and(created_at.eq."{ts}",id.{op}."{row_id}")')
+        return query.order("created_at", desc=not ascending).order("id", desc=not ascending)
+
+    def get_memories(self, agent_id: str = None, mtype: str = None, limit: int = 50,
+                     after: Optional[Dict[str, str]] = None, ascending: bool = False) -> List[Dict]:
         if self._disabled or not self.client: return []
         try:
             query = self.client.table("gitmem_memories").select("*")
@@ -68,7 +91,7 @@ class SupabaseConnector:
             if mtype:
                 query = query.eq("type", mtype)
             
-            res = query.order("created_at", desc=True).limit(limit).execute()
+            res = self._keyset(query, after, ascending).limit(limit).execute()
             self._error_count = 0
             return res.data
         except Exception as e:
@@ -162,12 +185,13 @@ class SupabaseConnector:
         except Exception as e:
             self._handle_error(e)
 
-    def get_checkpoints(self, agent_id: str, type: str = None, limit: int = 50) -> List[Dict]:
+    def get_checkpoints(self, agent_id: str, type: str = None, limit: int = 50,
+                        after: Optional[Dict[str, str]] = None, ascending: bool = False) -> List[Dict]:
         if self._disabled or not self.client: return []
         try:
             query = self.client.table("gitmem_checkpoints").select("*").eq("agent_id", agent_id)
             if type: query = query.eq("checkpoint_type", type)
-            return query.order("created_at", desc=True).limit(limit).execute().data
+            return self._keyset(query, after, ascending).limit(limit).execute().data
         except Exception as e:
             self._handle_error(e)
             return []
@@ -197,12 +221,13 @@ class SupabaseConnector:
         except Exception as e:
             self._handle_error(e)
 
-    def get_logs(self, agent_id: str, type: str = None, limit: int = 50) -> List[Dict]:
+    def get_logs(self, agent_id: str, type: str = None, limit: int = 50,
+                 after: Optional[Dict[str, str]] = None, ascending: bool = False) -> List[Dict]:
         if self._disabled or not self.client: return []
         try:
             query = self.client.table("gitmem_logs").select("*").eq("agent_id", agent_id)
             if type: query = query.eq("type", type)
-            return query.order("created_at", desc=True).limit(limit).execute().data
+            return self._keyset(query, after, ascending).limit(limit).execute().data
         except Exception as e:
             self._handle_error(e)
             return []
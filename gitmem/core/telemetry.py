@@ -0,0 +1,267 @@
+"""
+GitMem Telemetry - Buffered, sampled ingestion for log-style rows.
+
+API logs, MCP inputs, webhooks and activity logs used to cost one Supabase
+insert each. Rows now go into an in-memory ring buffer and a background
+flusher writes them as multi-row inserts per table.
+
+- Sampling is configurable per log kind; errors are always kept.
+- Every record (sampled out or not) bumps minute-level rollup counters,
+  which are upserted to gitmem_telemetry_rollups and back folder counts.
+  Each process writes its own rows (writer_id), so counts from several
+  workers add up instead of overwriting each other.
+- Rows written before the rollups existed are seeded once per agent and
+  kind into a "backfill" writer row, from a raw count of the source table.
+- When the buffer is full the oldest rows are dropped (and counted).
+- Every buffer is flushed once more at interpreter exit, since the flusher
+  is a daemon thread.
+"""
+
+import atexit
+import os
+import uuid
+import random
+import threading
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Keep-probability per kind; kinds not listed are always kept
+DEFAULT_SAMPLE_RATES = {
+    "access": 0.1,
+}
+
+TOTAL_BUCKET = "total"
+
+# writer_id of the one-off rows seeded from the raw tables
+BACKFILL_WRITER = "backfill"
+
+_live_buffers: "weakref.WeakSet[TelemetryBuffer]" = weakref.WeakSet()
+
+
+class TelemetryBuffer:
+    """Ring buffer + batch flusher + rollup counters for telemetry rows."""
+
+    ROLLUP_TABLE = "gitmem_telemetry_rollups"
+
+    def __init__(self, db, capacity: int = 10000, max_batch: int = 500, flush_interval: float = 2.0,
+                 sample_rates: Dict[str, float] = None, max_attempts: int = 3):
+        self.db = db
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.sample_rates = dict(DEFAULT_SAMPLE_RATES if sample_rates is None else sample_rates)
+        self.max_attempts = max_attempts
+        self.writer_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._buffer: deque = deque()  # (table, row, attempts)
+        # (agent_id, kind, bucket) -> [count, error_count]; bucket is a minute or TOTAL_BUCKET
+        self._rollups: Dict[Tuple[str, str, str], List[int]] = {}
+        self._dirty_rollups = set()
+        self._flusher: Optional[threading.Thread] = None
+        self._stats = {"recorded": 0, "sampled_out": 0, "buffered": 0, "written": 0,
+                       "dropped": 0, "failed": 0, "flushes": 0}
+        _live_buffers.add(self)
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def record(self, table: str, row: Dict[str, Any], kind: str, agent_id: str = "", is_error: bool = False) -> bool:
+        """
+        Account for one telemetry row and buffer it unless sampled out.
+        Returns True if the row will be written.
+        """
+        rate = 1.0 if is_error else self.sample_rates.get(kind, 1.0)
+        keep = rate >= 1.0 or random.random() < rate
+        minute = datetime.now().strftime("%Y-%m-%dT%H:%M")
+
+        with self._lock:
+            self._stats["recorded"] += 1
+            for bucket in (minute, TOTAL_BUCKET):
+                key = (agent_id or "", kind, bucket)
+                counts = self._rollups.setdefault(key, [0, 0])
+                counts[0] += 1
+                counts[1] += int(is_error)
+                self._dirty_rollups.add(key)
+
+            if not keep:
+                self._stats["sampled_out"] += 1
+            else:
+                if rate < 1.0:
+                    # Readers can scale sampled rows back up
+                    target = "details" if "details" in row and "metadata" not in row else "metadata"
+                    row = {**row, target: {**(row.get(target) or {}), "sample_rate": rate}}
+                if len(self._buffer) >= self.capacity:
+                    self._buffer.popleft()
+                    self._stats["dropped"] += 1
+                self._buffer.append((table, row, 0))
+                self._stats["buffered"] += 1
+
+            self._ensure_flusher()
+            if len(self._buffer) >= self.max_batch:
+                self._wake.set()
+        return keep
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _ensure_flusher(self):
+        # Called with the lock held
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._run, name="gitmem-telemetry", daemon=True)
+            self._flusher.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[Telemetry] Flush failed: {e}")
+
+    def flush(self):
+        """Write buffered rows (one insert per table) and dirty rollups now."""
+        with self._flush_lock:
+            with self._lock:
+                pending = list(self._buffer)
+                self._buffer.clear()
+                rollups = [
+                    {"writer_id": self.writer_id, "agent_id": key[0], "kind": key[1], "bucket": key[2],
+                     "count": self._rollups[key][0], "error_count": self._rollups[key][1],
+                     "updated_at": datetime.now().isoformat()}
+                    for key in self._dirty_rollups
+                ]
+                self._dirty_rollups = set()
+                self._stats["flushes"] += 1
+
+            by_table: Dict[str, List[Tuple[Dict[str, Any], int]]] = {}
+            for table, row, attempts in pending:
+                by_table.setdefault(table, []).append((row, attempts))
+
+            for table, items in by_table.items():
+                for start in range(0, len(items), self.max_batch):
+                    batch = items[start:start + self.max_batch]
+                    try:
+                        self.db.table(table).insert([row for row, _ in batch]).execute()
+                        with self._lock:
+                            self._stats["written"] += len(batch)
+                    except Exception as e:
+                        print(f"[Telemetry] Insert into {table} failed ({len(batch)} rows): {e}")
+                        self._requeue(table, batch)
+
+            if rollups:
+                try:
+                    self.db.table(self.ROLLUP_TABLE).upsert(
+                        rollups, on_conflict="writer_id,agent_id,kind,bucket"
+                    ).execute()
+                except Exception as e:
+                    print(f"[Telemetry] Rollup upsert failed: {e}")
+                    with self._lock:
+                        self._dirty_rollups.update((r["agent_id"], r["kind"], r["bucket"]) for r in rollups)
+
+            self._prune_rollups()
+
+    def _requeue(self, table: str, batch: List[Tuple[Dict[str, Any], int]]):
+        with self._lock:
+            for row, attempts in reversed(batch):
+                if attempts + 1 >= self.max_attempts or len(self._buffer) >= self.capacity:
+                    self._stats["failed"] += 1
+                    continue
+                self._buffer.appendleft((table, row, attempts + 1))
+
+    def _prune_rollups(self):
+        """Forget flushed minute buckets older than the current minute."""
+        current = datetime.now().strftime("%Y-%m-%dT%H:%M")
+        with self._lock:
+            for key in [k for k in self._rollups if k[2] not in (TOTAL_BUCKET, current)]:
+                if key not in self._dirty_rollups:
+                    del self._rollups[key]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def counts(self, agent_id: str, kinds: List[str] = None,
+               seed: Callable[[str], int] = None) -> Dict[str, int]:
+        """
+        All-time record counts per kind for an agent, from the rollups
+        (other writers' flushed totals plus this process's live totals).
+        `seed(kind)` returns the raw row count of a kind; it is used to
+        backfill kinds that have never been seeded.
+        """
+        totals: Dict[str, int] = {}
+        flushed: Dict[str, int] = {}
+        backfilled = set()
+        read_ok = False
+        try:
+            query = self.db.table(self.ROLLUP_TABLE).select("writer_id,kind,count") \
+                .eq("agent_id", agent_id).eq("bucket", TOTAL_BUCKET)
+            if kinds:
+                query = query.in_("kind", kinds)
+            for row in query.execute().data or []:
+                kind, count = row["kind"], row.get("count") or 0
+                if row["writer_id"] == BACKFILL_WRITER:
+                    backfilled.add(kind)
+                else:
+                    flushed[kind] = flushed.get(kind, 0) + count
+                if row["writer_id"] != self.writer_id:
+                    totals[kind] = totals.get(kind, 0) + count
+            read_ok = True
+        except Exception as e:
+            print(f"[Telemetry] Rollup read failed: {e}")
+
+        if seed is not None and read_ok:
+            for kind in kinds or []:
+                if kind in backfilled:
+                    continue
+                try:
+                    raw_count = seed(kind)
+                except Exception as e:
+                    print(f"[Telemetry] Raw count for {agent_id}/{kind} failed: {e}")
+                    continue
+                totals[kind] = totals.get(kind, 0) + self._backfill(agent_id, kind, raw_count, flushed.get(kind, 0))
+
+        with self._lock:
+            for (aid, kind, bucket), (count, _) in self._rollups.items():
+                if aid == agent_id and bucket == TOTAL_BUCKET and (not kinds or kind in kinds):
+                    totals[kind] = totals.get(kind, 0) + count
+        return totals
+
+    def _backfill(self, agent_id: str, kind: str, raw_count: int, flushed: int) -> int:
+        """
+        Seed the rollups with rows written before they existed. Raw rows
+        already covered by flushed rollups (scaled by the kind's sample
+        rate) are not counted twice.
+        """
+        count = max(0, raw_count - round(flushed * self.sample_rates.get(kind, 1.0)))
+        try:
+            self.db.table(self.ROLLUP_TABLE).upsert([{
+                "writer_id": BACKFILL_WRITER, "agent_id": agent_id, "kind": kind, "bucket": TOTAL_BUCKET,
+                "count": count, "error_count": 0, "updated_at": datetime.now().isoformat()
+            }], on_conflict="writer_id,agent_id,kind,bucket").execute()
+        except Exception as e:
+            print(f"[Telemetry] Rollup backfill failed for {agent_id}/{kind}: {e}")
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "pending": len(self._buffer), "capacity": self.capacity,
+                    "sample_rates": dict(self.sample_rates)}
+
+
+@atexit.register
+def _flush_on_exit():
+    """Write buffered rows and dirty rollups before the interpreter exits (the flushers are daemons)."""
+    for buffer in list(_live_buffers):
+        try:
+            buffer.flush()
+        except Exception as e:
+            print(f"[Telemetry] Flush at exit failed: {e}")
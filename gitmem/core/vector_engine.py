@@ -1,19 +1,49 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import threading
+import time
+from .index_queue import IndexingQueue
 # import chromadb # Commented out to avoid immediate import error if not installed
 # from chromadb.config import Settings
 
 class VectorEngine:
-    def __init__(self, path: str = "./gitmem_data/indexes"):
+    GLOBAL_COLLECTION = "gitmem_global"
+
+    # How long a missing per-agent collection is remembered before re-checking
+    COLLECTION_MISS_TTL = 60.0
+    # How long a found handle is trusted; agents are deleted by other workers/services
+    COLLECTION_HIT_TTL = 300.0
+
+    # ID-only count paging, and how long a memoized per-agent count is trusted
+    COUNT_PAGE_SIZE = 1000
+    AGENT_COUNT_TTL = 300.0
+
+    def __init__(self, path: str = "./gitmem_data/indexes", collection_miss_ttl: float = None,
+                 collection_hit_ttl: float = None, async_indexing: bool = True, index_batch_size: int = 64, index_max_latency: float = 0.25):
         self.path = path
         self.client = None
         self.collection = None
+        
+        # Collection handle cache: name -> (collection or None, expires_at)
+        self.collection_miss_ttl = collection_miss_ttl if collection_miss_ttl is not None else self.COLLECTION_MISS_TTL
+        self.collection_hit_ttl = collection_hit_ttl if collection_hit_ttl is not None else self.COLLECTION_HIT_TTL
+        self._collections: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._collections_lock = threading.Lock()
+        
+        # Per-agent vector counts on the global collection: agent_id -> (count, expires_at)
+        self._agent_counts: Dict[str, Tuple[int, float]] = {}
+        self._agent_counts_lock = threading.Lock()
+        self._last_latency_ms: Optional[float] = None
+        
+        # Asynchronous batched indexing for writes (None = synchronous adds)
+        self.indexer = IndexingQueue(
+            self._write_batch, max_batch=index_batch_size, max_latency=index_max_latency
+        ) if async_indexing else None
         self._initialize()
 
     def _initialize(self):
         try:
-            import chromadb
             import os
-            from chromadb.config import Settings
             
             # Load environment variables just in case
             from dotenv import load_dotenv
@@ -24,8 +54,10 @@ class VectorEngine:
             host = os.getenv("CHROMA_SERVER_HOST")
             
             self.is_cloud = False
+            self.is_local = False
             
             if api_key and tenant:
+                import chromadb
                 print(f"Initializing ChromaDB Cloud Client (Tenant: {tenant})")
                 self.client = chromadb.CloudClient(
                     api_key=api_key,
@@ -34,6 +66,8 @@ class VectorEngine:
                 )
                 self.is_cloud = True
             elif host:
+                 import chromadb
+                 from chromadb.config import Settings
                  port = os.getenv("CHROMA_SERVER_HTTP_PORT", "8000")
                  print(f"Initializing ChromaDB HttpClient to {host}:{port}")
                  self.client = chromadb.HttpClient(
@@ -43,14 +77,29 @@ class VectorEngine:
                  )
                  self.is_cloud = True
             else:
-                # Use EphemeralClient (in-memory) only as last resort
-                print("Warning: No ChromaDB credentials found. Using volatile in-memory client.")
-                self.client = chromadb.EphemeralClient()
+                # No server configured: persistent embedded NumPy index (no chromadb import)
+                from .local_vector_index import LocalVectorClient
+                local_path = os.path.join(self.path, "vectors")
+                remote = self._remote_embedding()
+                if remote is not None:
+                    embed, dim, namespace = remote
+                    # Vectors from different embedders must never share an index
+                    local_path = f"{local_path}-{hashlib.blake2b(namespace.encode('utf-8'), digest_size=6).hexdigest()}"
+                    self.client = LocalVectorClient(local_path, embedding_function=embed, dim=dim)
+                else:
+                    self.client = LocalVectorClient(local_path)
+                print(f"No ChromaDB credentials found. Using local vector index at {local_path}")
+                self.is_local = True
+            
+            if self.is_cloud and self.indexer is not None:
+                # Per-item Chroma rejections: bisect the batch instead of retrying it
+                from chromadb.errors import DuplicateIDError, IDAlreadyExistsError, InvalidArgumentError
+                self.indexer.permanent_errors += (DuplicateIDError, IDAlreadyExistsError, InvalidArgumentError)
             
             # Try to get the GLOBAL collection first, as that's what UnifiedContext uses
             # But be ready to switch to per-agent collections
             try:
-                self.collection = self.client.get_or_create_collection(name="gitmem_global")
+                self.collection = self.client.get_or_create_collection(name=self.GLOBAL_COLLECTION)
             except Exception as e:
                 print(f"Failed to get global collection: {e}")
                 
@@ -61,6 +110,88 @@ class VectorEngine:
             print(f"ChromaDB initialization failed: {e}")
             self.client = None
 
+    def _remote_embedding(self) -> Optional[Tuple[Any, int, str]]:
+        """
+        (embed, dim, model namespace) from the shared SimpleMem embedding client when
+        REMOTE_EMBEDDING_URL is set, or None to fall back to hashing embeddings.
+        """
+        import os
+        url = os.getenv("REMOTE_EMBEDDING_URL")
+        if not url:
+            return None
+        try:
+            from SimpleMem.utils.embedding_client import get_embedding_client
+            client = get_embedding_client(url)
+            dim = len(client.embed(["dimension probe"])[0])
+        except Exception as e:
+            print(f"Remote embeddings unavailable ({e}); local vector index uses hashing embeddings")
+            return None
+        return client.embed, dim, client.model
+
+    def _freshness(self) -> str:
+        if getattr(self, 'is_cloud', False):
+            return "Connected"
+        return "Local" if getattr(self, 'is_local', False) else "Volatile"
+
+    def get_agent_collection(self, agent_id: str):
+        """
+        Get the per-agent collection handle, or None if it does not exist.
+        Hits are cached for collection_hit_ttl seconds (or until a read on the
+        handle fails); misses are remembered for collection_miss_ttl seconds
+        so fallback routing is decided once.
+        """
+        if not self.client or not agent_id:
+            return None
+        
+        now = time.monotonic()
+        with self._collections_lock:
+            cached = self._collections.get(agent_id)
+            if cached is not None:
+                collection, expires_at = cached
+                if now < expires_at:
+                    return collection
+        
+        try:
+            collection = self.client.get_collection(name=agent_id)
+            expires_at = now + self.collection_hit_ttl
+        except Exception:
+            collection = None
+            expires_at = now + self.collection_miss_ttl
+        
+        with self._collections_lock:
+            self._collections[agent_id] = (collection, expires_at)
+        return collection
+
+    def invalidate_collection(self, name: str = None):
+        """Drop cached handle(s) after a collection is created or deleted elsewhere."""
+        with self._collections_lock:
+            if name is None:
+                self._collections.clear()
+            else:
+                self._collections.pop(name, None)
+
+    def create_agent_collection(self, agent_id: str):
+        """Create (or open) a per-agent collection and cache its handle."""
+        if not self.client:
+            return None
+        collection = self.client.get_or_create_collection(name=agent_id)
+        with self._collections_lock:
+            self._collections[agent_id] = (collection, time.monotonic() + self.collection_hit_ttl)
+        return collection
+
+    def delete_agent_collection(self, agent_id: str) -> bool:
+        """Delete a per-agent collection and forget its handle."""
+        if not self.client:
+            return False
+        try:
+            self.client.delete_collection(name=agent_id)
+            return True
+        except Exception as e:
+            print(f"[VectorEngine] Error deleting collection {agent_id}: {e}")
+            return False
+        finally:
+            self.invalidate_collection(agent_id)
+
     def add_texts(self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]):
         if not self.collection:
             return
@@ -83,10 +214,38 @@ class VectorEngine:
                 # or ensure it's passed in.
                 processed_metadatas.append(processed_meta)
         
-        try:
-            self.collection.add(documents=texts, metadatas=processed_metadatas, ids=ids)
-        except:
-            pass
+        if self.indexer is not None:
+            # Batched + retried on the indexing worker; see flush() for read-your-writes
+            self.indexer.enqueue(self.GLOBAL_COLLECTION, texts, processed_metadatas, ids)
+        else:
+            try:
+                self._write_batch(self.GLOBAL_COLLECTION, texts, processed_metadatas, ids)
+            except Exception as e:
+                print(f"[VectorEngine] Error adding texts: {e}")
+
+    def _write_batch(self, collection_name: str, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]):
+        """Write one batch to a collection (raises on failure so the indexer can retry)."""
+        if collection_name == self.GLOBAL_COLLECTION:
+            target = self.collection
+        else:
+            target = self.get_agent_collection(collection_name)
+        if target is None:
+            raise RuntimeError(f"Collection {collection_name} unavailable")
+        target.add(documents=texts, metadatas=metadatas, ids=ids)
+        if collection_name == self.GLOBAL_COLLECTION:
+            self._bump_agent_counts(metadatas)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Read-your-writes barrier: wait until queued adds are indexed."""
+        if self.indexer is None:
+            return True
+        return self.indexer.flush(timeout=timeout)
+
+    def get_indexing_stats(self) -> Dict[str, Any]:
+        """Indexing queue metrics (pending items, lag, retries, failures)."""
+        if self.indexer is None:
+            return {"pending": 0, "lag_ms": 0.0}
+        return self.indexer.get_stats()
 
     def add_memory(self, memory: Any):
         """Helper to add a memory object directly."""
@@ -117,10 +276,13 @@ class VectorEngine:
         except Exception as e:
             print(f"[VectorEngine] Error adding memory: {e}")
 
-    def query(self, query_text: str, n_results: int = 5, where: Dict = None) -> List[Dict]:
+    def query(self, query_text: str, n_results: int = 5, where: Dict = None, read_your_writes: bool = False) -> List[Dict]:
         if not self.client:
             return []
         
+        if read_your_writes:
+            self.flush()
+        
         # Determine if we should query global or agent-specific collection
         target_collection = self.collection
         
@@ -129,10 +291,10 @@ class VectorEngine:
         
         # If we are in cloud mode, verify if per-agent collection exists
         if agent_id and self.is_cloud:
-            try:
-                # Try to get agent-specific collection
-                # Note: Manhattan project uses agent_id as collection name often
-                agent_col = self.client.get_collection(name=agent_id)
+            # Try to get agent-specific collection (cached, including misses)
+            # Note: Manhattan project uses agent_id as collection name often
+            agent_col = self.get_agent_collection(agent_id)
+            if agent_col is not None:
                 target_collection = agent_col
                 
                 # If we switched to agent collection, remove agent_id from where clause
@@ -144,9 +306,7 @@ class VectorEngine:
                     where = None # If empty, pass None
                 else:
                     where = local_where
-            except:
-                # Fallback to global collection
-                pass
+            # Otherwise fall back to global collection
                 
         if not target_collection:
             return []
@@ -170,36 +330,84 @@ class VectorEngine:
                     })
             return normalized
         except Exception:
+            if target_collection is not self.collection:
+                # Cached per-agent handle may be stale; re-check next time
+                self.invalidate_collection(agent_id)
             return []
 
+    def count_agent_vectors(self, agent_id: str) -> int:
+        """
+        Count an agent's vectors without transferring records.
+        Uses the per-agent collection's count() when it exists; otherwise an
+        ID-only paged count on the global collection, memoized per agent and
+        bumped as the indexer writes new vectors.
+        """
+        # 1. Try agent-specific collection first (Cloud/Manhattan style)
+        col = self.get_agent_collection(agent_id)
+        if col is not None:
+            try:
+                return col.count()
+            except Exception:
+                # Handle went stale (collection deleted elsewhere)
+                self.invalidate_collection(agent_id)
+        
+        if not self.collection:
+            return 0
+        
+        # 2. Maintained counter for the global collection
+        now = time.monotonic()
+        with self._agent_counts_lock:
+            cached = self._agent_counts.get(agent_id)
+            if cached is not None and now < cached[1]:
+                return cached[0]
+        
+        # 3. ID-only paged count (include=[] skips documents/metadatas/embeddings)
+        total = 0
+        offset = 0
+        while True:
+            page = self.collection.get(
+                where={"agent_id": agent_id},
+                include=[],
+                limit=self.COUNT_PAGE_SIZE,
+                offset=offset
+            )
+            n = len(page.get("ids", [])) if page else 0
+            total += n
+            if n < self.COUNT_PAGE_SIZE:
+                break
+            offset += n
+        
+        with self._agent_counts_lock:
+            self._agent_counts[agent_id] = (total, now + self.AGENT_COUNT_TTL)
+        return total
+
+    def _bump_agent_counts(self, metadatas: List[Dict[str, Any]]):
+        """Keep memoized per-agent counts in step with successful global writes."""
+        with self._agent_counts_lock:
+            for meta in metadatas:
+                agent_id = meta.get("agent_id") if meta else None
+                cached = self._agent_counts.get(agent_id)
+                if cached is not None:
+                    self._agent_counts[agent_id] = (cached[0] + 1, cached[1])
+
     def get_agent_stats(self, agent_id: str) -> Dict[str, Any]:
         """Get statistics for a specific agent."""
         if not self.client:
             return {"embeddings": 0, "freshness": "Disconnected", "latency": "0ms"}
         
+        started = time.perf_counter()
         total_count = 0
-        
-        # 1. Try agent-specific collection first (Cloud/Manhattan style)
         try:
-            col = self.client.get_collection(name=agent_id)
-            total_count = col.count()
-        except:
-            # 2. Fallback to global collection with filter
-            try:
-                if self.collection:
-                    results = self.collection.get(
-                        where={"agent_id": agent_id},
-                        include=["metadatas"] # Minimal fetch
-                    )
-                    if results and results.get("ids"):
-                        total_count = len(results["ids"])
-            except:
-                pass
+            total_count = self.count_agent_vectors(agent_id)
+        except Exception as e:
+            print(f"[VectorEngine] Error counting vectors for {agent_id}: {e}")
+        latency_ms = (time.perf_counter() - started) * 1000
+        self._last_latency_ms = latency_ms
             
         return {
             "embeddings": total_count,
-            "freshness": "Connected" if self.is_cloud else "Volatile",
-            "latency": "12ms"
+            "freshness": self._freshness(),
+            "latency": f"{latency_ms:.0f}ms"
         }
 
     def get_stats(self) -> Dict[str, Any]:
@@ -208,11 +416,12 @@ class VectorEngine:
         
         return {
             "embeddings": "N/A", 
-            "freshness": "Connected" if getattr(self, 'is_cloud', False) else "Volatile", 
-            "latency": "12ms"
+            "freshness": self._freshness(),
+            "latency": f"{self._last_latency_ms:.0f}ms" if self._last_latency_ms is not None else "N/A",
+            "indexing_lag_ms": self.get_indexing_stats()["lag_ms"]
         }
         
-    def get_agent_vectors(self, agent_id: str, limit: int = 100) -> List[Dict]:
+    def get_agent_vectors(self, agent_id: str, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Get all vectors for a specific agent."""
         if not self.client:
             return []
@@ -223,12 +432,10 @@ class VectorEngine:
         
         # 1. Try agent-specific collection first
         if self.is_cloud:
-            try:
-                agent_col = self.client.get_collection(name=agent_id)
+            agent_col = self.get_agent_collection(agent_id)
+            if agent_col is not None:
                 target_collection = agent_col
                 use_agent_filter = False # Agent collection implies agent_id
-            except:
-                pass
                 
         if not target_collection:
             return []
@@ -239,6 +446,8 @@ class VectorEngine:
                 "limit": limit,
                 "include": ["documents", "metadatas"]
             }
+            if offset:
+                get_args["offset"] = offset
             
             if use_agent_filter:
                 get_args["where"] = {"agent_id": agent_id}
@@ -266,6 +475,9 @@ class VectorEngine:
 
         except Exception as e:
             print(f"Error fetching agent vectors: {e}")
+            if target_collection is not self.collection:
+                # Cached per-agent handle may be stale; re-check next time
+                self.invalidate_collection(agent_id)
             return []
 
     def categorize_vectors(self, vectors: List[Dict]) -> Dict[str, List[Dict]]:
@@ -342,10 +554,9 @@ class VectorEngine:
         
         # Try agent specific collection if cloud and agent_id provided
         if agent_id and self.is_cloud:
-            try:
-                agent_col = self.client.get_collection(name=agent_id)
+            agent_col = self.get_agent_collection(agent_id)
+            if agent_col is not None:
                 target_collection = agent_col
-            except: pass
 
         if not target_collection:
             return None
@@ -359,7 +570,10 @@ class VectorEngine:
                     "metadata": results['metadatas'][0],
                     "type": "vector"
                 }
-        except: pass
+        except Exception:
+            if target_collection is not self.collection:
+                # Cached per-agent handle may be stale; re-check next time
+                self.invalidate_collection(agent_id)
         
         return None
 
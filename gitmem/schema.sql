@@ -98,6 +98,39 @@ CREATE INDEX IF NOT EXISTS idx_documents_agent_id ON public.gitmem_documents(age
 CREATE INDEX IF NOT EXISTS idx_documents_folder ON public.gitmem_documents(folder);
 CREATE INDEX IF NOT EXISTS idx_documents_created_at ON public.gitmem_documents(created_at);
 
+-- Chunked documents: content lives in gitmem_document_chunks, rows keep a manifest
+ALTER TABLE public.gitmem_documents ADD COLUMN IF NOT EXISTS tenant_id TEXT;
+ALTER TABLE public.gitmem_documents ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE public.gitmem_documents ADD COLUMN IF NOT EXISTS chunk_manifest TEXT[] DEFAULT '{}';
+CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON public.gitmem_documents(tenant_id, content_hash);
+-- Chunk GC on delete looks up which documents still reference a chunk
+CREATE INDEX IF NOT EXISTS idx_documents_chunk_manifest ON public.gitmem_documents USING GIN (chunk_manifest);
+
+-- Minute-level telemetry rollups (api/mcp/webhook/activity counts).
+-- Each process upserts its own absolute counts; readers sum across writer_id.
+CREATE TABLE IF NOT EXISTS public.gitmem_telemetry_rollups (
+    writer_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    bucket TEXT NOT NULL,  -- 'YYYY-MM-DDTHH:MM' or 'total'
+    count BIGINT NOT NULL DEFAULT 0,
+    error_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (writer_id, agent_id, kind, bucket)
+);
+
+CREATE INDEX IF NOT EXISTS idx_telemetry_rollups_agent ON public.gitmem_telemetry_rollups(agent_id, kind, bucket);
+
+-- Content-addressed document chunks, shared by all agents of a tenant
+CREATE TABLE IF NOT EXISTS public.gitmem_document_chunks (
+    tenant_id TEXT NOT NULL,
+    hash TEXT NOT NULL,  -- SHA-256 of the chunk text
+    size INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (tenant_id, hash)
+);
+
 
 -- 5. Agent Checkpoints Table (checkpoints/ folder)
 CREATE TABLE IF NOT EXISTS public.gitmem_checkpoints (
@@ -228,6 +261,8 @@ CREATE INDEX IF NOT EXISTS idx_activity_logs_created_at ON public.gitmem_activit
 
 -- Enable RLS on new tables
 ALTER TABLE public.gitmem_documents ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.gitmem_document_chunks ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.gitmem_telemetry_rollups ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.gitmem_checkpoints ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.gitmem_api_logs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.gitmem_mcp_inputs ENABLE ROW LEVEL SECURITY;
@@ -237,6 +272,8 @@ ALTER TABLE public.gitmem_activity_logs ENABLE ROW LEVEL SECURITY;
 
 -- Open policies for MVP
 CREATE POLICY "Enable all access" ON public.gitmem_documents FOR ALL USING (true);
+CREATE POLICY "Enable all access" ON public.gitmem_document_chunks FOR ALL USING (true);
+CREATE POLICY "Enable all access" ON public.gitmem_telemetry_rollups FOR ALL USING (true);
 CREATE POLICY "Enable all access" ON public.gitmem_checkpoints FOR ALL USING (true);
 CREATE POLICY "Enable all access" ON public.gitmem_api_logs FOR ALL USING (true);
 CREATE POLICY "Enable all access" ON public.gitmem_mcp_inputs FOR ALL USING (true);
@@ -2,9 +2,8 @@ import os
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 import chromadb
-import httpx
 import logging
-import requests, json
+from SimpleMem.utils.embedding_client import get_embedding_client
 # -------------------------------------------------
 # Environment & Logging
 # -------------------------------------------------
@@ -43,64 +42,22 @@ class RemoteEmbeddingClient:
     """
     Stateless remote embedding client.
     Chroma never sees text → only vectors.
+    Requests go through the process-wide pooled client, which embeds
+    concurrently and batches texts when the endpoint supports it.
     """
 
     def __init__(self, url: str):
         self.url = url
-        self.http = httpx.Client(timeout=60)
-
-    
-    REMOTE_EMBEDDING_URL = "https://iotacluster-embedding-model.hf.space/gradio_api/call/embed_dense"
-
-class RemoteEmbeddingClient:
-    """
-    Stateless remote embedding client.
-    HF Space = single-text embedding → loop safely.
-    """
-
-    def __init__(self, url: str):
-        self.url = url
-
-    def _embed_one(self, text: str, timeout: int = 60) -> List[float]:
-        # Step 1: POST
-        resp = requests.post(
-            self.url,
-            json={"data": [text]},
-            headers={"Content-Type": "application/json"},
-            timeout=timeout,
-        )
-        resp.raise_for_status()
-
-        event_id = resp.json().get("event_id")
-        if not event_id:
-            raise RuntimeError("No event_id returned from embedding service")
-
-        # Step 2: Stream
-        stream_url = f"{self.url}/{event_id}"
-
-        with requests.get(stream_url, stream=True, timeout=timeout) as r:
-            r.raise_for_status()
-            for line in r.iter_lines(decode_unicode=True):
-                if not line:
-                    continue
-
-                if line.startswith("data:"):
-                    payload = json.loads(line.replace("data:", "").strip())
-                    return payload[0]["dense_embedding"]
-
-        raise RuntimeError("Embedding stream ended without result")
+        self.client = get_embedding_client(url)
 
     def embed_remote(self, texts: List[str]) -> List[List[float]]:
         """
-        Embed multiple texts safely (one-by-one).
+        Embed multiple texts (order preserved).
         """
-        embeddings = []
-
-        for idx, text in enumerate(texts):
-            vec = self._embed_one(text)
-            embeddings.append(vec)
+        return self.client.embed(texts)
 
-        return embeddings
+    async def aembed_remote(self, texts: List[str]) -> List[List[float]]:
+        return await self.client.aembed(texts)
 
 
 # -------------------------------------------------
@@ -108,6 +108,11 @@ STRUCTURED_TOP_K = get_int("STRUCTURED_TOP_K", 5)
 # ============================================================================
 LANCEDB_PATH = get_str("LANCEDB_PATH", "./lancedb_data")
 MEMORY_TABLE_NAME = get_str("MEMORY_TABLE_NAME", "memory_entries")
+# Per-agent BM25 index for the lexical layer (empty = memory only)
+LEXICAL_INDEX_PATH = get_str("LEXICAL_INDEX_PATH", "./lexical_index_data")
+LEXICAL_INDEX_BOOTSTRAP_LIMIT = get_int("LEXICAL_INDEX_BOOTSTRAP_LIMIT", 10000)
+# Process-wide LRU of decoded entries, shared by all VectorStore instances
+ENTRY_CACHE_MAX_BYTES = get_int("ENTRY_CACHE_MAX_BYTES", 32 * 1024 * 1024)
 
 # ============================================================================
 # Parallel Processing Configuration
@@ -123,6 +128,17 @@ MAX_RETRIEVAL_WORKERS = get_int("MAX_RETRIEVAL_WORKERS", 8)
 ENABLE_PLANNING = get_bool("ENABLE_PLANNING", True)
 ENABLE_REFLECTION = get_bool("ENABLE_REFLECTION", True)
 MAX_REFLECTION_ROUNDS = get_int("MAX_REFLECTION_ROUNDS", 2)
+# Cache of LLM query analysis / planning results (TTL in seconds)
+ENABLE_QUERY_PLAN_CACHE = get_bool("ENABLE_QUERY_PLAN_CACHE", True)
+QUERY_PLAN_CACHE_TTL = get_int("QUERY_PLAN_CACHE_TTL", 3600)
+QUERY_PLAN_CACHE_SIZE = get_int("QUERY_PLAN_CACHE_SIZE", 1024)
+# Cosine similarity for reusing a paraphrased query's plan (0 = exact matches only)
+QUERY_PLAN_CACHE_SIMILARITY = float(os.environ.get("QUERY_PLAN_CACHE_SIMILARITY", "0.95"))
+# Local complexity routing: queries with C_q below the threshold skip LLM planning/reflection
+ENABLE_ADAPTIVE_ROUTING = get_bool("ENABLE_ADAPTIVE_ROUTING", True)
+QUERY_COMPLEXITY_THRESHOLD = float(os.environ.get("QUERY_COMPLEXITY_THRESHOLD", "0.5"))
+# delta in k_dyn = k_base * (1 + delta * C_q)
+RETRIEVAL_DEPTH_DELTA = float(os.environ.get("RETRIEVAL_DEPTH_DELTA", "0.5"))
 
 # ============================================================================
 # LLM-as-Judge Configuration
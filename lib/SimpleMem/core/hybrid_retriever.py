@@ -8,17 +8,31 @@ Implements:
 - Dynamic retrieval depth k_dyn = k_base · (1 + δ · C_q)
 - Complexity-Aware Pruning to minimize token usage while maximizing accuracy
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from SimpleMem.models.memory_entry import MemoryEntry
+from SimpleMem.models.entry_record import EntryRecord
 from SimpleMem.utils.llm_client import LLMClient
 from SimpleMem.database.vector_store import VectorStore
+from SimpleMem.database.rank_fusion import fuse_rankings
+from SimpleMem.utils.query_plan_cache import QueryPlanCache, normalize_query
+from SimpleMem.utils.query_complexity import estimate_query_complexity
 from SimpleMem.config_loader import SEMANTIC_TOP_K, KEYWORD_TOP_K, STRUCTURED_TOP_K, ENABLE_PLANNING, ENABLE_REFLECTION, MAX_REFLECTION_ROUNDS, ENABLE_PARALLEL_RETRIEVAL, MAX_RETRIEVAL_WORKERS, USE_JSON_FORMAT
+from SimpleMem.config_loader import ENABLE_QUERY_PLAN_CACHE, QUERY_PLAN_CACHE_TTL, QUERY_PLAN_CACHE_SIZE, QUERY_PLAN_CACHE_SIMILARITY
+from SimpleMem.config_loader import ENABLE_ADAPTIVE_ROUTING, QUERY_COMPLEXITY_THRESHOLD, RETRIEVAL_DEPTH_DELTA
 import re
 from datetime import datetime, timedelta
 import dateparser
 import concurrent.futures
 
 
+# Planning results shared by every retriever in the process
+_query_plan_cache = QueryPlanCache(
+    ttl_seconds=QUERY_PLAN_CACHE_TTL,
+    max_entries=QUERY_PLAN_CACHE_SIZE,
+    similarity_threshold=QUERY_PLAN_CACHE_SIMILARITY
+) if ENABLE_QUERY_PLAN_CACHE else None
+
+
 class HybridRetriever:
     """
     Hybrid Retriever - Stage 3: Adaptive Query-Aware Retrieval with Pruning
@@ -45,7 +59,9 @@ class HybridRetriever:
         enable_reflection: bool = True,
         max_reflection_rounds: int = 2,
         enable_parallel_retrieval: bool = True,
-        max_retrieval_workers: int = 3
+        max_retrieval_workers: int = 3,
+        enable_adaptive_routing: Optional[bool] = None,
+        complexity_threshold: Optional[float] = None
     ):
         self.llm_client = llm_client
         self.vector_store = vector_store
@@ -59,6 +75,9 @@ class HybridRetriever:
         self.max_reflection_rounds = max_reflection_rounds if max_reflection_rounds is not None else MAX_REFLECTION_ROUNDS
         self.enable_parallel_retrieval = enable_parallel_retrieval if enable_parallel_retrieval is not None else ENABLE_PARALLEL_RETRIEVAL
         self.max_retrieval_workers = max_retrieval_workers if max_retrieval_workers is not None else MAX_RETRIEVAL_WORKERS
+        self.plan_cache = _query_plan_cache
+        self.enable_adaptive_routing = enable_adaptive_routing if enable_adaptive_routing is not None else ENABLE_ADAPTIVE_ROUTING
+        self.complexity_threshold = complexity_threshold if complexity_threshold is not None else QUERY_COMPLEXITY_THRESHOLD
 
     def retrieve(self, query: str, enable_reflection: Optional[bool] = None) -> List[MemoryEntry]:
         """
@@ -71,13 +90,53 @@ class HybridRetriever:
 
         Returns: List of relevant MemoryEntry
         """
-        if self.enable_planning:
-            return self._retrieve_with_planning(query, enable_reflection)
+        return self.retrieve_with_routing(query, enable_reflection)[0]
+
+    def retrieve_with_routing(
+        self,
+        query: str,
+        enable_reflection: Optional[bool] = None
+    ) -> Tuple[List[MemoryEntry], Dict[str, Any]]:
+        """
+        Same as retrieve(), plus the routing decision for the query
+
+        Paper Reference: Section 3.3 - Query Complexity C_q, k_dyn = k_base · (1 + δ · C_q)
+        C_q is estimated locally. With adaptive routing, queries below
+        complexity_threshold skip LLM planning and reflection and go straight
+        to one-shot hybrid search at depth k_dyn.
+
+        Returns: (List of relevant MemoryEntry, routing dict with "route"
+                 ("hybrid" or "planned"), "complexity", "threshold", "top_k",
+                 "reflection" and the raw "features")
+        """
+        estimate = estimate_query_complexity(query)
+        complexity = estimate["complexity"]
+        top_k = round(self.semantic_top_k * (1 + RETRIEVAL_DEPTH_DELTA * complexity))
+
+        planned = self.enable_planning and (
+            not self.enable_adaptive_routing or complexity >= self.complexity_threshold
+        )
+        reflection = planned and (enable_reflection if enable_reflection is not None else self.enable_reflection)
+        routing = {
+            "route": "planned" if planned else "hybrid",
+            "complexity": complexity,
+            "threshold": self.complexity_threshold if self.enable_adaptive_routing else None,
+            "top_k": self.semantic_top_k if planned else top_k,
+            "reflection": reflection,
+            "features": estimate["features"],
+        }
+        print(f"[Routing] C_q={complexity:.2f} -> {routing['route']} (top_k={routing['top_k']}, reflection={reflection})")
+
+        if planned:
+            records = self._retrieve_with_planning(query, reflection)
         else:
-            # Fallback to simple semantic search
-            return self._semantic_search(query)
+            # One-shot hybrid search
+            records = self._hybrid_search(query, top_k=top_k)
+
+        # Internal stages pass lightweight EntryRecords; validate only what we return
+        return [record.to_entry() for record in records], routing
     
-    def _retrieve_with_planning(self, query: str, enable_reflection: Optional[bool] = None) -> List[MemoryEntry]:
+    def _retrieve_with_planning(self, query: str, enable_reflection: Optional[bool] = None) -> List[EntryRecord]:
         """
         Execute retrieval with intelligent planning process
         
@@ -97,16 +156,15 @@ class HybridRetriever:
         
         # Step 3: Execute searches for all queries (parallel or sequential)
         if self.enable_parallel_retrieval and len(search_queries) > 1:
-            all_results = self._execute_parallel_searches(search_queries)
+            result_lists = self._execute_parallel_searches(search_queries)
         else:
-            all_results = []
+            result_lists = []
             for i, search_query in enumerate(search_queries, 1):
                 print(f"[Search {i}] {search_query}")
-                results = self._semantic_search(search_query)
-                all_results.extend(results)
+                result_lists.append(self._hybrid_search(search_query))
         
-        # Step 4: Merge and deduplicate results
-        merged_results = self._merge_and_deduplicate_entries(all_results)
+        # Step 4: Fuse the per-query rankings (reciprocal rank fusion)
+        merged_results = self._fuse_result_lists(result_lists)
         print(f"[Planning] Found {len(merged_results)} unique results")
         
         # Step 5: Optional reflection-based additional retrieval
@@ -118,7 +176,7 @@ class HybridRetriever:
         
         return merged_results
     
-    def _retrieve_with_reflection(self, query: str, initial_results: List[MemoryEntry]) -> List[MemoryEntry]:
+    def _retrieve_with_reflection(self, query: str, initial_results: List[EntryRecord]) -> List[EntryRecord]:
         """
         Execute reflection-based additional retrieval
         """
@@ -165,6 +223,28 @@ class HybridRetriever:
         
         return current_results
 
+    def _cached_plan(self, kind: str, query: str, compute, query_list: bool = False) -> Any:
+        """
+        Run a planning LLM call through the query plan cache.
+
+        The planning prompts only see the query text (no agent memories), so
+        results are shared across agents. For sub-query lists taken from a
+        paraphrase, the cached question is swapped for the current one.
+        """
+        if self.plan_cache is None:
+            return compute()
+
+        def rebase(queries: List[str], cached_query: str) -> List[str]:
+            cached = normalize_query(cached_query)
+            queries = [q for q in queries if normalize_query(q) != cached]
+            return [query] + queries
+
+        embedding_model = getattr(self.vector_store, "embedding_model", None)
+        embed = embedding_model.encode_single if getattr(embedding_model, "client", None) is not None else None
+        return self.plan_cache.get_or_compute(
+            kind, query, compute, embed=embed, rebase=rebase if query_list else None
+        )
+
     def _analyze_query(self, query: str) -> Dict[str, Any]:
         """
         Use LLM to analyze query intent and extract structured information
@@ -200,50 +280,65 @@ Return ONLY JSON, no other content.
             {"role": "user", "content": prompt}
         ]
 
-        # Retry up to 3 times
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Use JSON format if configured
-                response_format = None
-                if USE_JSON_FORMAT:
-                    response_format = {"type": "json_object"}
-
-                response = self.llm_client.chat_completion(
-                    messages,
-                    temperature=0.1,
-                    response_format=response_format
-                )
-                analysis = self.llm_client.extract_json(response)
-                return analysis
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"Query analysis attempt {attempt + 1}/{max_retries} failed: {e}. Retrying...")
-                else:
-                    print(f"Query analysis failed after {max_retries} attempts: {e}")
-                    # Return default values
-                    return {
-                        "keywords": [query],
-                        "persons": [],
-                        "time_expression": None,
-                        "location": None,
-                        "entities": []
-                    }
-
-    def _semantic_search(self, query: str) -> List[MemoryEntry]:
+        def ask_llm() -> Dict[str, Any]:
+            # Retry up to 3 times
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    # Use JSON format if configured
+                    response_format = None
+                    if USE_JSON_FORMAT:
+                        response_format = {"type": "json_object"}
+
+                    response = self.llm_client.chat_completion(
+                        messages,
+                        temperature=0.1,
+                        response_format=response_format
+                    )
+                    return self.llm_client.extract_json(response)
+                except Exception as e:
+                    if attempt < max_retries - 1:
+                        print(f"Query analysis attempt {attempt + 1}/{max_retries} failed: {e}. Retrying...")
+                    else:
+                        raise
+
+        try:
+            return self._cached_plan("query_analysis", query, ask_llm)
+        except Exception as e:
+            print(f"Query analysis failed after 3 attempts: {e}")
+            # Return default values (not cached)
+            return {
+                "keywords": [query],
+                "persons": [],
+                "time_expression": None,
+                "location": None,
+                "entities": []
+            }
+
+    def _semantic_search(self, query: str) -> List[EntryRecord]:
         """
         Semantic Layer Retrieval
 
         Paper Reference: Section 3.3 - Part of hybrid scoring function S(q, m_k)
         Retrieves based on dense vector similarity: λ₁ · cos(e_q, v_k)
         """
-        return self.vector_store.semantic_search(query, top_k=self.semantic_top_k)
+        return self.vector_store.semantic_search(query, top_k=self.semantic_top_k, as_records=True)
+
+    def _hybrid_search(self, query: str, top_k: Optional[int] = None) -> List[EntryRecord]:
+        """
+        Single-stage retrieval over all three layers
+
+        Paper Reference: Section 3.3 - Hybrid scoring function S(q, m_k)
+        Dense, lexical (BM25) and symbolic candidates are gathered in one
+        VectorStore.hybrid_search call and fused with reciprocal rank fusion.
+        """
+        return self.vector_store.hybrid_search(query, top_k=top_k or self.semantic_top_k, as_records=True)
 
     def _keyword_search(
         self,
         query: str,
         query_analysis: Dict[str, Any]
-    ) -> List[MemoryEntry]:
+    ) -> List[EntryRecord]:
         """
         Lexical Layer Retrieval
 
@@ -255,9 +350,9 @@ Return ONLY JSON, no other content.
             # If no keywords extracted, use query itself
             keywords = [query]
 
-        return self.vector_store.keyword_search(keywords, top_k=self.keyword_top_k)
+        return self.vector_store.keyword_search(keywords, top_k=self.keyword_top_k, as_records=True)
 
-    def _structured_search(self, query_analysis: Dict[str, Any]) -> List[MemoryEntry]:
+    def _structured_search(self, query_analysis: Dict[str, Any]) -> List[EntryRecord]:
         """
         Symbolic Layer Retrieval
 
@@ -284,7 +379,8 @@ Return ONLY JSON, no other content.
             location=location,
             entities=entities if entities else None,
             timestamp_range=timestamp_range,
-            top_k=self.structured_top_k
+            top_k=self.structured_top_k,
+            as_records=True
         )
 
     def _parse_time_range(self, time_expression: str) -> Optional[tuple]:
@@ -323,22 +419,27 @@ Return ONLY JSON, no other content.
 
     def _merge_and_deduplicate(
         self,
-        results: Dict[str, List[MemoryEntry]]
-    ) -> List[MemoryEntry]:
+        results: Dict[str, List[EntryRecord]]
+    ) -> List[EntryRecord]:
         """
-        Merge multi-path retrieval results and deduplicate
+        Merge multi-path retrieval results with reciprocal rank fusion
+        (ties keep the structured > semantic > keyword priority)
         """
-        seen_ids = set()
-        merged = []
-
-        # Merge by priority (structured > semantic > keyword)
-        for source in ['structured', 'semantic', 'keyword']:
-            for entry in results.get(source, []):
-                if entry.entry_id not in seen_ids:
-                    seen_ids.add(entry.entry_id)
-                    merged.append(entry)
+        sources = ['structured', 'semantic', 'keyword']
+        return self._fuse_result_lists([results.get(source, []) for source in sources])
 
-        return merged
+    def _fuse_result_lists(self, result_lists: List[List[EntryRecord]]) -> List[EntryRecord]:
+        """
+        Fuse several best-first result lists into one deduplicated ranking (RRF)
+        """
+        entries = {}
+        rankings = {}
+        for i, results in enumerate(result_lists):
+            rankings[str(i)] = [(entry.entry_id, 0.0) for entry in results]
+            for entry in results:
+                entries.setdefault(entry.entry_id, entry)
+
+        return [entries[entry_id] for entry_id, _ in fuse_rankings(rankings)]
     
     def _generate_search_queries(self, query: str) -> List[str]:
         """
@@ -378,7 +479,7 @@ Return ONLY the JSON, no other text.
             {"role": "user", "content": prompt}
         ]
         
-        try:
+        def ask_llm() -> List[str]:
             # Use JSON format if configured
             response_format = None
             if USE_JSON_FORMAT:
@@ -398,13 +499,16 @@ Return ONLY the JSON, no other text.
                 queries.insert(0, query)
                 
             return queries
+        
+        try:
+            return self._cached_plan("search_queries", query, ask_llm, query_list=True)
             
         except Exception as e:
             print(f"Failed to generate search queries: {e}")
             # Fallback to original query
             return [query]
     
-    def _merge_and_deduplicate_entries(self, entries: List[MemoryEntry]) -> List[MemoryEntry]:
+    def _merge_and_deduplicate_entries(self, entries: List[EntryRecord]) -> List[EntryRecord]:
         """
         Merge and deduplicate memory entries by entry_id
         """
@@ -418,7 +522,7 @@ Return ONLY the JSON, no other text.
         
         return merged
     
-    def _check_answer_adequacy(self, query: str, contexts: List[MemoryEntry]) -> str:
+    def _check_answer_adequacy(self, query: str, contexts: List[EntryRecord]) -> str:
         """
         Check if current contexts are sufficient to answer the query
         Returns: "sufficient", "insufficient", or "no_results"
@@ -481,7 +585,7 @@ Return ONLY the JSON, no other text.
             # Default to insufficient to be safe
             return "insufficient"
     
-    def _generate_additional_queries(self, original_query: str, current_contexts: List[MemoryEntry]) -> List[str]:
+    def _generate_additional_queries(self, original_query: str, current_contexts: List[EntryRecord]) -> List[str]:
         """
         Generate additional targeted queries based on what's missing
         """
@@ -541,7 +645,7 @@ Return ONLY the JSON, no other text.
             print(f"Failed to generate additional queries: {e}")
             return []
     
-    def _format_contexts_for_check(self, contexts: List[MemoryEntry]) -> str:
+    def _format_contexts_for_check(self, contexts: List[EntryRecord]) -> str:
         """
         Format contexts for adequacy checking (more concise than full format)
         """
@@ -554,12 +658,13 @@ Return ONLY the JSON, no other text.
         
         return "\n".join(formatted)
     
-    def _execute_parallel_searches(self, search_queries: List[str]) -> List[MemoryEntry]:
+    def _execute_parallel_searches(self, search_queries: List[str]) -> List[List[EntryRecord]]:
         """
-        Execute multiple search queries in parallel using ThreadPoolExecutor
+        Execute multiple search queries in parallel using ThreadPoolExecutor.
+        Returns one result list per query, in query order.
         """
         print(f"[Parallel Search] Executing {len(search_queries)} queries in parallel with {self.max_retrieval_workers} workers")
-        all_results = []
+        all_results = [[] for _ in search_queries]
         
         try:
             # Use ThreadPoolExecutor for parallel retrieval
@@ -575,7 +680,7 @@ Return ONLY the JSON, no other text.
                     query, query_num = future_to_query[future]
                     try:
                         results = future.result()
-                        all_results.extend(results)
+                        all_results[query_num - 1] = results
                         print(f"[Parallel Search] Query {query_num} completed: {len(results)} results")
                     except Exception as e:
                         print(f"[Parallel Search] Query {query_num} failed: {e}")
@@ -586,21 +691,20 @@ Return ONLY the JSON, no other text.
             for i, query in enumerate(search_queries, 1):
                 try:
                     print(f"[Sequential Search {i}] {query}")
-                    results = self._semantic_search(query)
-                    all_results.extend(results)
+                    all_results[i - 1] = self._hybrid_search(query)
                 except Exception as search_e:
                     print(f"[Sequential Search {i}] Failed: {search_e}")
         
         return all_results
     
-    def _semantic_search_worker(self, query: str, query_num: int) -> List[MemoryEntry]:
+    def _semantic_search_worker(self, query: str, query_num: int) -> List[EntryRecord]:
         """
-        Worker function for parallel semantic search
+        Worker function for parallel search
         """
         print(f"[Search {query_num}] {query}")
-        return self._semantic_search(query)
+        return self._hybrid_search(query)
     
-    def _execute_parallel_additional_searches(self, additional_queries: List[str], round_num: int) -> List[MemoryEntry]:
+    def _execute_parallel_additional_searches(self, additional_queries: List[str], round_num: int) -> List[EntryRecord]:
         """
         Execute additional reflection queries in parallel
         """
@@ -638,7 +742,7 @@ Return ONLY the JSON, no other text.
         
         return all_results
     
-    def _additional_search_worker(self, query: str, query_num: int, round_num: int) -> List[MemoryEntry]:
+    def _additional_search_worker(self, query: str, query_num: int, round_num: int) -> List[EntryRecord]:
         """
         Worker function for parallel additional search in reflection
         """
@@ -691,7 +795,7 @@ Return ONLY the JSON, no other text.
             {"role": "user", "content": prompt}
         ]
         
-        try:
+        def ask_llm() -> Dict[str, Any]:
             # Use JSON format if configured
             response_format = None
             if USE_JSON_FORMAT:
@@ -703,18 +807,21 @@ Return ONLY the JSON, no other text.
                 response_format=response_format
             )
             
-            result = self.llm_client.extract_json(response)
-            return result
+            return self.llm_client.extract_json(response)
+        
+        try:
+            return self._cached_plan("information_plan", query, ask_llm)
             
         except Exception as e:
             print(f"Failed to analyze information requirements: {e}")
-            # Fallback to simple analysis
+            # Fallback to simple analysis (flagged so plans built on it are not cached)
             return {
                 "question_type": "general",
                 "key_entities": [query],
                 "required_info": [{"info_type": "general", "description": "relevant information", "priority": "high"}],
                 "relationships": [],
-                "minimal_queries_needed": 1
+                "minimal_queries_needed": 1,
+                "fallback": True
             }
     
     def _generate_targeted_queries(self, original_query: str, information_plan: Dict[str, Any]) -> List[str]:
@@ -762,7 +869,7 @@ Return ONLY the JSON, no other text.
             {"role": "user", "content": prompt}
         ]
         
-        try:
+        def ask_llm() -> List[str]:
             # Use JSON format if configured
             response_format = None
             if USE_JSON_FORMAT:
@@ -786,13 +893,20 @@ Return ONLY the JSON, no other text.
             
             print(f"[Planning] Strategy: {result.get('reasoning', 'Generate targeted queries')}")
             return queries
+        
+        try:
+            # Keyed by the question: the plan it is built from is derived from (and cached by) it too.
+            # A fallback plan is not cached, so neither are the sub-queries generated from it.
+            if information_plan.get("fallback"):
+                return ask_llm()
+            return self._cached_plan("targeted_queries", original_query, ask_llm, query_list=True)
             
         except Exception as e:
             print(f"Failed to generate targeted queries: {e}")
             # Fallback to original query
             return [original_query]
     
-    def _retrieve_with_intelligent_reflection(self, query: str, initial_results: List[MemoryEntry], information_plan: Dict[str, Any]) -> List[MemoryEntry]:
+    def _retrieve_with_intelligent_reflection(self, query: str, initial_results: List[EntryRecord], information_plan: Dict[str, Any]) -> List[EntryRecord]:
         """
         Execute intelligent reflection-based additional retrieval
         """
@@ -839,7 +953,7 @@ Return ONLY the JSON, no other text.
         
         return current_results
     
-    def _analyze_information_completeness(self, query: str, current_results: List[MemoryEntry], information_plan: Dict[str, Any]) -> str:
+    def _analyze_information_completeness(self, query: str, current_results: List[EntryRecord], information_plan: Dict[str, Any]) -> str:
         """
         Analyze if current results provide complete information to answer the query
         """
@@ -905,7 +1019,7 @@ Return ONLY the JSON, no other text.
             print(f"Failed to analyze information completeness: {e}")
             return "incomplete"
     
-    def _generate_missing_info_queries(self, original_query: str, current_results: List[MemoryEntry], information_plan: Dict[str, Any]) -> List[str]:
+    def _generate_missing_info_queries(self, original_query: str, current_results: List[EntryRecord], information_plan: Dict[str, Any]) -> List[str]:
         """
         Generate targeted queries to find missing information
         """
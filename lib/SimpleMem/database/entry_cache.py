@@ -0,0 +1,117 @@
+"""
+Entry Cache - Process-wide LRU of decoded memory entries
+
+Keyed by (agent_id, entry_id) so every VectorStore in the process shares
+one working set and switching agents never has to flush it. Capacity is a
+byte budget (estimated from the entry's field values) rather than an
+entry count, since restatements vary widely in size. Entries are not
+versioned: VectorStore drops the ones another worker changed when the
+agent's lexical index replays that worker's writes.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Per-entry bookkeeping (OrderedDict node, key tuple, size slot)
+_ENTRY_OVERHEAD = 200
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate retained size of an entry: its object plus string/list fields."""
+    fields = getattr(value, "__dict__", None)
+    if fields is None and hasattr(value, "__slots__"):
+        fields = {name: getattr(value, name, None) for name in value.__slots__}
+    size = sys.getsizeof(value)
+    for field in (fields or {}).values():
+        size += sys.getsizeof(field)
+        if isinstance(field, (list, tuple)):
+            size += sum(sys.getsizeof(item) for item in field)
+    return size + _ENTRY_OVERHEAD
+
+
+class EntryCache:
+    """Thread-safe LRU over (agent_id, entry_id) with a byte budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, agent_id: str, entry_id: Hashable) -> Optional[Any]:
+        key = (agent_id, entry_id)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, agent_id: str, entry_id: Hashable, entry: Any):
+        size = estimate_size(entry)
+        key = (agent_id, entry_id)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (entry, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, agent_id: str, entry_id: Hashable) -> bool:
+        with self._lock:
+            item = self._entries.pop((agent_id, entry_id), None)
+            if item is None:
+                return False
+            self._bytes -= item[1]
+            return True
+
+    def invalidate_entries(self, agent_id: str, entry_ids: Optional[Iterable[Hashable]] = None) -> int:
+        """Drop some entries of an agent, or all of them when entry_ids is None."""
+        if entry_ids is None:
+            return self.invalidate_agent(agent_id)
+        return sum(self.invalidate(agent_id, entry_id) for entry_id in entry_ids)
+
+    def invalidate_agent(self, agent_id: str) -> int:
+        """Drop every cached entry of one agent."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == agent_id]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,431 @@
+"""
+Lexical Index - Per-agent incremental BM25 (Section 3.2, Lexical Layer)
+
+Each agent gets an inverted index over `lossless_restatement` and `keywords`
+(keyword terms weigh `keyword_boost` times a restatement term). Postings are
+compact parallel arrays (doc ordinals as uint32, term weights as float32), so
+scoring a query is a few vectorized NumPy passes with no embedding call.
+
+Entries are kept as plain records next to the postings so search results can
+be turned back into MemoryEntry objects without a vector-store round-trip.
+The same records feed the agent's SymbolicIndex (persons/entities/location/
+topic sets and sorted timestamps), kept in step with every add and remove.
+
+Persistence: a JSON snapshot of the records plus an append-only JSONL op log.
+Writers hold an exclusive file lock while appending, and readers replay the
+log tail on each search, so several gunicorn workers see each other's writes.
+`on_change` is told which entry IDs those replayed writes touched (None when
+a new snapshot was loaded), so caches layered on the records can drop them.
+The log is folded into a new snapshot once it outgrows the live entry count.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from array import array
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from SimpleMem.database.symbolic_index import SymbolicIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process locking only
+    fcntl = None
+
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Incremental BM25 index (plus symbolic secondary indexes) for one agent."""
+
+    TEXT_FIELD = "lossless_restatement"
+    KEYWORDS_FIELD = "keywords"
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.2, b: float = 0.75,
+                 keyword_boost: float = 2.0, compact_min_ops: int = 1000,
+                 on_change: Optional[Callable[[Optional[List[str]]], None]] = None):
+        self.path = path
+        self.on_change = on_change
+        self.k1 = k1
+        self.b = b
+        self.keyword_boost = keyword_boost
+        self.compact_min_ops = compact_min_ops
+
+        self._lock = threading.RLock()
+        self._reset()
+
+        # Persisted state tracking (for replaying other processes' writes)
+        self._snapshot_sig = None
+        self._log_offset = 0
+        self._log_ops = 0
+        self.existed = False
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.existed = os.path.exists(self._snapshot_path) or os.path.exists(self._log_path)
+            with self._file_lock():
+                self._reload(notify=False)
+
+    # ------------------------------------------------------------------
+    # In-memory structures
+    # ------------------------------------------------------------------
+
+    def _reset(self):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._vocab: Dict[str, int] = {}
+        self._post_docs: List[array] = []   # tid -> doc ordinals (uint32)
+        self._post_wts: List[array] = []    # tid -> term weights (float32)
+        self._df: List[int] = []            # tid -> live document frequency
+        self._ordinal: Dict[str, int] = {}  # entry_id -> live ordinal
+        self._doc_ids: List[Optional[str]] = []  # ordinal -> entry_id (None = deleted)
+        self._doc_terms: List[Optional[array]] = []
+        self._doc_len = array("f")
+        self._live = bytearray()            # ordinal -> 1 if live
+        self._total_len = 0.0
+        self._dead = 0
+        self.symbolic = SymbolicIndex()
+
+    def _weighted_terms(self, record: Dict[str, Any]) -> Dict[str, float]:
+        weights: Dict[str, float] = {}
+        for term in tokenize(record.get(self.TEXT_FIELD) or ""):
+            weights[term] = weights.get(term, 0.0) + 1.0
+        for keyword in record.get(self.KEYWORDS_FIELD) or []:
+            for term in tokenize(keyword):
+                weights[term] = weights.get(term, 0.0) + self.keyword_boost
+        return weights
+
+    def _apply_add(self, record: Dict[str, Any]):
+        entry_id = record["entry_id"]
+        self._apply_remove(entry_id)
+
+        ordinal = len(self._doc_ids)
+        weights = self._weighted_terms(record)
+        terms = array("I")
+        for term, weight in weights.items():
+            tid = self._vocab.get(term)
+            if tid is None:
+                tid = self._vocab[term] = len(self._post_docs)
+                self._post_docs.append(array("I"))
+                self._post_wts.append(array("f"))
+                self._df.append(0)
+            self._post_docs[tid].append(ordinal)
+            self._post_wts[tid].append(weight)
+            self._df[tid] += 1
+            terms.append(tid)
+
+        length = float(sum(weights.values()))
+        self.records[entry_id] = record
+        self._ordinal[entry_id] = ordinal
+        self._doc_ids.append(entry_id)
+        self._doc_terms.append(terms)
+        self._doc_len.append(length)
+        self._live.append(1)
+        self._total_len += length
+        self.symbolic.add(record)
+
+    def _apply_remove(self, entry_id: str):
+        ordinal = self._ordinal.pop(entry_id, None)
+        if ordinal is None:
+            return
+        # Postings keep the tombstoned ordinal until the next rebuild
+        for tid in self._doc_terms[ordinal]:
+            self._df[tid] -= 1
+        self._total_len -= self._doc_len[ordinal]
+        self._doc_ids[ordinal] = None
+        self._doc_terms[ordinal] = None
+        self._live[ordinal] = 0
+        self._dead += 1
+        self.symbolic.remove(self.records.pop(entry_id))
+
+    def _rebuild(self):
+        """Drop tombstones by re-indexing the live records."""
+        records = list(self.records.values())
+        self._reset()
+        for record in records:
+            self._apply_add(record)
+
+    def _apply_op(self, op: Dict[str, Any]):
+        kind = op.get("op")
+        if kind == "add":
+            for record in op["records"]:
+                self._apply_add(record)
+        elif kind == "remove":
+            for entry_id in op["ids"]:
+                self._apply_remove(entry_id)
+        elif kind == "clear":
+            self._reset()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @property
+    def _snapshot_path(self) -> str:
+        return self.path + ".json"
+
+    @property
+    def _log_path(self) -> str:
+        return self.path + ".log"
+
+    @contextmanager
+    def _file_lock(self):
+        if not self.path or fcntl is None:
+            yield
+            return
+        with open(self.path + ".lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _stat_sig(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _reload(self, notify: bool = True):
+        """Load snapshot + full log (called with both locks held)."""
+        self._reset()
+        self._snapshot_sig = self._stat_sig(self._snapshot_path)
+        if self._snapshot_sig is not None:
+            try:
+                with open(self._snapshot_path, "r", encoding="utf-8") as f:
+                    for record in json.load(f).get("records", []):
+                        self._apply_add(record)
+            except (OSError, ValueError) as e:
+                print(f"[LexicalIndex] Could not read snapshot {self._snapshot_path}: {e}")
+        self._log_offset = 0
+        self._log_ops = 0
+        self._replay_log(notify=False)
+        if notify:
+            self._notify(None)
+
+    def _notify(self, entry_ids: Optional[List[str]]):
+        """Report entries changed by another process (None = possibly all)."""
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(entry_ids)
+        except Exception as e:
+            print(f"[LexicalIndex] on_change failed: {e}")
+
+    def _replay_log(self, notify: bool = True):
+        try:
+            with open(self._log_path, "rb") as f:
+                f.seek(self._log_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partially written line: pick it up next time
+                    self._log_offset += len(line)
+                    self._log_ops += 1
+                    try:
+                        op = json.loads(line)
+                        self._apply_op(op)
+                    except (ValueError, KeyError) as e:
+                        print(f"[LexicalIndex] Skipping bad log line in {self._log_path}: {e}")
+                        continue
+                    if notify:
+                        kind = op.get("op")
+                        if kind == "add":
+                            self._notify([r["entry_id"] for r in op["records"]])
+                        elif kind == "remove":
+                            self._notify(list(op["ids"]))
+                        else:
+                            self._notify(None)
+        except FileNotFoundError:
+            pass
+
+    def refresh(self):
+        """Pick up writes made by other processes since the last call."""
+        if not self.path:
+            return
+        with self._lock:
+            if self._stat_sig(self._snapshot_path) != self._snapshot_sig:
+                with self._file_lock():
+                    self._reload()
+                return
+            try:
+                size = os.path.getsize(self._log_path)
+            except FileNotFoundError:
+                size = 0
+            if size < self._log_offset:
+                with self._file_lock():
+                    self._reload()
+            elif size > self._log_offset:
+                self._replay_log()
+
+    def _write(self, op: Dict[str, Any]):
+        """Apply an op locally and append it to the shared log."""
+        with self._lock:
+            if not self.path:
+                self._apply_op(op)
+                self._maybe_rebuild()
+                return
+            with self._file_lock():
+                # Catch up first so the log offset stays in sync
+                if self._stat_sig(self._snapshot_path) != self._snapshot_sig:
+                    self._reload()
+                else:
+                    self._replay_log()
+                self._apply_op(op)
+                line = (json.dumps(op, ensure_ascii=False) + "\n").encode("utf-8")
+                with open(self._log_path, "ab") as f:
+                    f.write(line)
+                self._log_offset += len(line)
+                self._log_ops += 1
+                if op["op"] == "clear" or self._log_ops >= max(self.compact_min_ops, len(self.records)):
+                    self._compact()
+                else:
+                    self._maybe_rebuild()
+
+    def _compact(self):
+        # Called with both locks held
+        tmp = self._snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"records": list(self.records.values())}, f, ensure_ascii=False)
+        os.replace(tmp, self._snapshot_path)
+        open(self._log_path, "wb").close()
+        self._snapshot_sig = self._stat_sig(self._snapshot_path)
+        self._log_offset = 0
+        self._log_ops = 0
+        self._rebuild()
+
+    def _maybe_rebuild(self):
+        if self._dead > 1000 and self._dead > len(self._ordinal):
+            self._rebuild()
+
+    def ensure_persisted(self):
+        """Write an (empty) snapshot so the index counts as built."""
+        if not self.path:
+            return
+        with self._lock, self._file_lock():
+            if not os.path.exists(self._snapshot_path):
+                self._compact()
+        self.existed = True
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def add(self, records: Iterable[Dict[str, Any]]):
+        """Index (or re-index) records; each needs an `entry_id`."""
+        records = [r for r in records if r.get("entry_id")]
+        if records:
+            self._write({"op": "add", "records": records})
+
+    def remove(self, entry_ids: Iterable[str]):
+        entry_ids = list(entry_ids)
+        if entry_ids:
+            self._write({"op": "remove", "ids": entry_ids})
+
+    def clear(self):
+        self._write({"op": "clear"})
+
+    def search(self, query_terms: Iterable[str], top_k: int = 10) -> List[Tuple[str, float]]:
+        """BM25 top_k as (entry_id, score), best first."""
+        self.refresh()
+        terms = []
+        for text in query_terms:
+            terms.extend(tokenize(text))
+
+        with self._lock:
+            n_live = len(self._ordinal)
+            if not n_live or top_k <= 0:
+                return []
+            avgdl = max(self._total_len / n_live, 1e-9)
+            doc_len = np.frombuffer(self._doc_len, dtype=np.float32)
+            scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+            touched = False
+
+            for term in dict.fromkeys(terms):
+                tid = self._vocab.get(term)
+                if tid is None or self._df[tid] <= 0:
+                    continue
+                docs = np.frombuffer(self._post_docs[tid], dtype=np.uint32)
+                tf = np.frombuffer(self._post_wts[tid], dtype=np.float32)
+                df = self._df[tid]
+                idf = np.log(1.0 + (n_live - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * doc_len[docs] / avgdl)
+                # Ordinals are unique within a posting list, so fancy-index add is safe
+                scores[docs] += idf * tf * (self.k1 + 1.0) / (tf + norm)
+                touched = True
+
+            if not touched:
+                return []
+            if self._dead:
+                scores *= np.frombuffer(self._live, dtype=np.uint8)
+            hits = np.flatnonzero(scores > 0)
+            if len(hits) > top_k:
+                hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            return [(self._doc_ids[ordinal], float(scores[ordinal])) for ordinal in hits]
+
+    def filter(self, **constraints) -> List[str]:
+        """Entry IDs matching structured constraints (see SymbolicIndex.query)."""
+        self.refresh()
+        with self._lock:
+            return self.symbolic.query(**constraints)
+
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.records.get(entry_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ordinal)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._ordinal),
+                "terms": len(self._vocab),
+                "postings": sum(len(p) for p in self._post_docs),
+                "tombstones": self._dead,
+                "log_ops": self._log_ops,
+                "path": self.path,
+            }
+
+
+class LexicalIndexRegistry:
+    """Process-wide BM25Index per agent, stored under one directory."""
+
+    def __init__(self, base_dir: Optional[str] = None,
+                 on_change: Optional[Callable[[str, Optional[List[str]]], None]] = None):
+        self.base_dir = base_dir
+        self.on_change = on_change  # (agent_id, entry_ids or None), see BM25Index
+        self._indexes: Dict[str, BM25Index] = {}
+        self._lock = threading.Lock()
+
+    def _path_for(self, agent_id: str) -> Optional[str]:
+        if not self.base_dir:
+            return None
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", agent_id)[:64]
+        digest = hashlib.sha1(agent_id.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.base_dir, f"{safe}-{digest}")
+
+    def get(self, agent_id: str) -> BM25Index:
+        with self._lock:
+            index = self._indexes.get(agent_id)
+            if index is None:
+                on_change = None
+                if self.on_change is not None:
+                    on_change = lambda entry_ids, agent_id=agent_id: self.on_change(agent_id, entry_ids)
+                index = self._indexes[agent_id] = BM25Index(self._path_for(agent_id), on_change=on_change)
+            return index
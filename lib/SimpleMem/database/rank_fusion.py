@@ -0,0 +1,71 @@
+"""
+Rank Fusion - Combine ranked candidate lists from several retrieval layers
+
+Paper Reference: Section 3.3 - Hybrid scoring function S(q, m_k)
+Two fusion rules, both vectorized with NumPy:
+- "rrf":   reciprocal rank fusion, score = sum_l w_l / (k + rank_l)
+- "score": normalized score fusion, per-layer min-max scores, weighted sum
+RRF only needs ranks, so it is robust to layers whose raw scores are on
+different scales (cosine distances vs. BM25).
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+RRF_K = 60
+
+# A ranking is a best-first list of (candidate_id, raw_score); scores are only used by "score"
+Ranking = Sequence[Tuple[Hashable, float]]
+
+
+def fuse_rankings(
+    rankings: Dict[str, Ranking],
+    weights: Optional[Dict[str, float]] = None,
+    method: str = "rrf",
+    k: int = RRF_K,
+    top_k: Optional[int] = None,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse per-layer rankings into one best-first list of (candidate_id, fused_score).
+    Ties keep the order in which candidates were first seen.
+    """
+    if method not in ("rrf", "score"):
+        raise ValueError(f"Unknown fusion method: {method}")
+
+    ids: Dict[Hashable, int] = {}
+    for ranking in rankings.values():
+        for candidate_id, _ in ranking:
+            ids.setdefault(candidate_id, len(ids))
+    if not ids:
+        return []
+
+    fused = np.zeros(len(ids), dtype=np.float64)
+    for layer, ranking in rankings.items():
+        if not ranking:
+            continue
+        weight = 1.0 if weights is None else weights.get(layer, 0.0)
+        if weight == 0:
+            continue
+
+        # Keep each candidate's best position within a layer
+        seen: Dict[Hashable, int] = {}
+        for position, (candidate_id, _) in enumerate(ranking):
+            seen.setdefault(candidate_id, position)
+        index = np.fromiter((ids[c] for c in seen), dtype=np.int64, count=len(seen))
+        positions = np.fromiter(seen.values(), dtype=np.float64, count=len(seen))
+
+        if method == "rrf":
+            fused[index] += weight / (k + positions + 1.0)
+        else:
+            raw = np.array([ranking[int(p)][1] for p in positions], dtype=np.float64)
+            span = raw.max() - raw.min()
+            normalized = (raw - raw.min()) / span if span > 0 else np.ones_like(raw)
+            fused[index] += weight * normalized
+
+    order = np.argsort(-fused, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+    id_list = list(ids)
+    return [(id_list[i], float(fused[i])) for i in order]
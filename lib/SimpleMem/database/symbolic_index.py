@@ -0,0 +1,126 @@
+"""
+Symbolic Index - Local secondary indexes for the Symbolic Layer (Section 3.2)
+
+Per-agent inverted sets for persons, entities, location and topic (values
+matched case-insensitively) plus a sorted timestamp index for range scans.
+A structured query intersects the candidate ID sets, smallest first, so
+it is exact and never touches the vector store.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+
+LIST_FIELDS = ("persons", "entities")
+VALUE_FIELDS = ("location", "topic")
+
+
+def normalize_value(value: str) -> str:
+    return " ".join(str(value).split()).lower()
+
+
+def parse_time(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """ISO string or datetime -> naive datetime (aware values converted to UTC)."""
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class SymbolicIndex:
+    """Inverted sets + sorted timestamps over one agent's entry records."""
+
+    def __init__(self):
+        self._sets: Dict[str, Dict[str, Set[str]]] = {f: {} for f in LIST_FIELDS + VALUE_FIELDS}
+        self._time_keys: List[datetime] = []
+        self._time_ids: List[str] = []
+        self._time_of: Dict[str, datetime] = {}
+
+    def _values(self, record: Dict[str, Any], field: str) -> Set[str]:
+        raw = record.get(field)
+        if not raw:
+            return set()
+        items = raw if field in LIST_FIELDS else [raw]
+        return {normalize_value(v) for v in items if v}
+
+    def add(self, record: Dict[str, Any]):
+        entry_id = record["entry_id"]
+        for field, index in self._sets.items():
+            for value in self._values(record, field):
+                index.setdefault(value, set()).add(entry_id)
+
+        when = parse_time(record.get("timestamp"))
+        if when is not None:
+            pos = bisect_right(self._time_keys, when)
+            self._time_keys.insert(pos, when)
+            self._time_ids.insert(pos, entry_id)
+            self._time_of[entry_id] = when
+
+    def remove(self, record: Dict[str, Any]):
+        entry_id = record["entry_id"]
+        for field, index in self._sets.items():
+            for value in self._values(record, field):
+                ids = index.get(value)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del index[value]
+
+        when = self._time_of.pop(entry_id, None)
+        if when is not None:
+            pos = bisect_left(self._time_keys, when)
+            while self._time_ids[pos] != entry_id:
+                pos += 1
+            del self._time_keys[pos]
+            del self._time_ids[pos]
+
+    def query(
+        self,
+        persons: Optional[Iterable[str]] = None,
+        entities: Optional[Iterable[str]] = None,
+        location: Optional[str] = None,
+        topic: Optional[str] = None,
+        start: Union[str, datetime, None] = None,
+        end: Union[str, datetime, None] = None,
+    ) -> List[str]:
+        """
+        Entry IDs satisfying every given constraint (all listed persons and
+        entities, the location/topic, and start <= timestamp <= end),
+        newest first.
+        """
+        candidates: List[Set[str]] = []
+        for field, values in (("persons", persons), ("entities", entities)):
+            for value in values or []:
+                candidates.append(self._sets[field].get(normalize_value(value), set()))
+        for field, value in (("location", location), ("topic", topic)):
+            if value:
+                candidates.append(self._sets[field].get(normalize_value(value), set()))
+
+        start, end = parse_time(start), parse_time(end)
+        ranged = start is not None or end is not None
+        if ranged:
+            lo = bisect_left(self._time_keys, start) if start is not None else 0
+            hi = bisect_right(self._time_keys, end) if end is not None else len(self._time_keys)
+            time_ids = self._time_ids[lo:hi]
+            if not candidates:
+                return time_ids[::-1]
+            candidates.append(set(time_ids))
+
+        if not candidates:
+            return []
+        candidates.sort(key=len)
+        matched = set(candidates[0])
+        for ids in candidates[1:]:
+            if not matched:
+                break
+            matched &= ids
+
+        floor = datetime.min
+        return sorted(matched, key=lambda i: self._time_of.get(i, floor), reverse=True)
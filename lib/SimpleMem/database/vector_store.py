@@ -13,7 +13,12 @@ Now uses Agentic_RAG with ChromaDB as the unified vector store.
 from typing import List, Optional, Dict, Any, Tuple
 import numpy as np
 from SimpleMem.models.memory_entry import MemoryEntry
+from SimpleMem.models.entry_record import EntryRecord
 from SimpleMem.utils.embedding import EmbeddingModel
+from SimpleMem.database.lexical_index import BM25Index, LexicalIndexRegistry
+from SimpleMem.database.rank_fusion import fuse_rankings
+from SimpleMem.database.entry_cache import EntryCache
+from SimpleMem.config_loader import LEXICAL_INDEX_PATH, LEXICAL_INDEX_BOOTSTRAP_LIMIT, ENTRY_CACHE_MAX_BYTES
 import os
 import sys
 from datetime import datetime
@@ -21,6 +26,7 @@ import json
 from dataclasses import asdict
 import hashlib
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent and grandparent directories to sys.path for imports
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,6 +39,36 @@ if grandparent_dir not in sys.path:
 # Import the enhanced Agentic_RAG from the previous implementation
 from Octave_mem.RAG_DB_CONTROLLER_AGENTS.agent_RAG import Agentic_RAG
 
+# Decoded entries shared by every VectorStore, keyed by (agent_id, entry_id)
+_entry_cache = EntryCache(ENTRY_CACHE_MAX_BYTES)
+
+# Lexical layer: one BM25 index per agent, shared by every VectorStore in the process.
+# Writes replayed from other workers' logs evict the entries they touched.
+_lexical_indexes = LexicalIndexRegistry(LEXICAL_INDEX_PATH or None, on_change=_entry_cache.invalidate_entries)
+_lexical_bootstrap_lock = threading.Lock()
+# Agents whose collection outgrew the first bootstrap read and is still being paged in
+_lexical_bootstrapping = set()
+
+# Collections already checked/created in this process (skips the round trip on later handles)
+_known_collections = set()
+
+# Runs the dense (network) layer of hybrid_search while the local layers are scored
+_hybrid_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hybrid-search")
+
+
+def forget_agent(agent_id: str):
+    """
+    Drop the process-wide state of an agent whose collection was deleted:
+    its lexical index (on disk too, so other workers see the clear), its
+    cached entries and the known-collection mark. An agent recreated under
+    the same id then starts empty instead of serving the old entries.
+    """
+    with _lexical_bootstrap_lock:
+        _lexical_bootstrapping.discard(agent_id)  # stops a background bootstrap
+    _lexical_indexes.get(agent_id).clear()
+    _entry_cache.invalidate_agent(agent_id)
+    _known_collections.discard(agent_id)
+
 
 class VectorStore:
     """
@@ -44,7 +80,8 @@ class VectorStore:
     2. Lexical Layer: Sparse keyword vectors for precise term matching
     3. Symbolic Layer: Structured metadata for deterministic filtering
     
-    Thread-safe agent_id switching with cache invalidation.
+    Thread-safe agent_id switching with cache invalidation, or immutable
+    per-agent handles via for_agent().
     
     🔐 DATA ISOLATION GUARANTEES:
     =============================
@@ -65,12 +102,21 @@ class VectorStore:
        Use freeze_agent_id_for_operation() context manager to prevent agent_id
        changes during multi-step operations.
     
+    5. **Agent Handles**: for_agent() returns a cheap, immutable store bound to
+       one agent that shares the Agentic_RAG client, embedding model, entry
+       cache and lexical indexes. Handles never take the agent_id lock, so
+       concurrent work on different agents does not contend.
+    
     USAGE EXAMPLES:
     ===============
     # Safe agent_id switching
     vs = VectorStore("agent_A")
     vs.agent_id = "agent_B"  # Automatic cache cleanup + collection setup
     
+    # Immutable per-agent handles (preferred for multi-agent servers)
+    store_a = vs.for_agent("agent_A")
+    store_b = vs.for_agent("agent_B")  # safe to use from other threads
+    
     # Prevent changes during critical operations
     with vs.freeze_agent_id_for_operation("batch_import"):
         vs.add_entries(batch1)
@@ -78,17 +124,25 @@ class VectorStore:
         vs.semantic_search(query)
     """
     
-    def __init__(self, agent_id: str = "memory_entries", embedding_model: EmbeddingModel = None):
+    # Fields patch_entry() may change (entry_id and memory_type stay fixed)
+    PATCHABLE_FIELDS = ("lossless_restatement", "keywords", "timestamp", "location",
+                        "persons", "entities", "topic")
+    
+    def __init__(self, agent_id: str = "memory_entries", embedding_model: EmbeddingModel = None,
+                 ensure_collection: bool = True):
         """
         Initialize VectorStore using Agentic_RAG as the vector database.
         
         Args:
             agent_id: Unique identifier for the memory entries collection
             embedding_model: Embedding model for vector generation
+            ensure_collection: Create agent_id's collection if missing. Pass
+                False for a store only used to hand out for_agent() handles.
         """
         # Use private variable for agent_id to enable property setter
         self._agent_id = agent_id
         self._agent_id_lock = threading.RLock()  # Thread-safe agent_id switching
+        self._frozen_operation = None
         self.embedding_model = embedding_model or EmbeddingModel()
         
         # Initialize Agentic_RAG with ChromaDB
@@ -100,15 +154,49 @@ class VectorStore:
         )
         
         # Ensure collection exists
-        self._ensure_collection()
+        if ensure_collection:
+            self._ensure_collection()
         
-        # Cache for frequently accessed entries
-        self.entry_cache = {}
-        self.cache_max_size = 1000
+        self.lexical_indexes = _lexical_indexes
+
+        # Process-wide LRU for frequently accessed entries
+        self.entry_cache = _entry_cache
+    
+    def for_agent(self, agent_id: str) -> "VectorStore":
+        """
+        Return an immutable VectorStore bound to agent_id.
+        
+        The handle shares this store's Agentic_RAG, embedding model, entry cache
+        and lexical indexes, so creating one costs no client setup. Its agent_id
+        cannot be changed and is read without locking.
+        
+        Raises:
+            ValueError: If agent_id is None or empty
+        """
+        if not agent_id or not isinstance(agent_id, str):
+            raise ValueError(f"agent_id must be a non-empty string, got: {agent_id}")
+        
+        handle = object.__new__(type(self))
+        handle._agent_id = agent_id
+        handle._agent_id_lock = None  # immutable: no lock needed
+        handle._frozen_operation = None
+        handle.embedding_model = self.embedding_model
+        handle.agentic_RAG = self.agentic_RAG
+        handle.lexical_indexes = self.lexical_indexes
+        handle.entry_cache = self.entry_cache
+        handle._ensure_collection()
+        return handle
+    
+    @property
+    def is_agent_handle(self) -> bool:
+        """True for immutable stores created by for_agent()."""
+        return self._agent_id_lock is None
         
     @property
     def agent_id(self) -> str:
         """Get the current agent ID (thread-safe)."""
+        if self._agent_id_lock is None:
+            return self._agent_id
         with self._agent_id_lock:
             return self._agent_id
     
@@ -132,6 +220,11 @@ class VectorStore:
         """
         if not new_agent_id or not isinstance(new_agent_id, str):
             raise ValueError(f"agent_id must be a non-empty string, got: {new_agent_id}")
+        if self._agent_id_lock is None:
+            raise RuntimeError(
+                f"agent_id of a for_agent() handle is immutable ({self._agent_id}); "
+                f"use for_agent('{new_agent_id}') instead"
+            )
         
         with self._agent_id_lock:
             old_agent_id = self._agent_id
@@ -139,6 +232,12 @@ class VectorStore:
             # Prevent redundant switches
             if old_agent_id == new_agent_id:
                 return
+            if self._frozen_operation is not None:
+                raise RuntimeError(
+                    f"Cannot change agent_id during frozen operation '{self._frozen_operation}'. "
+                    f"Current frozen agent_id: {old_agent_id}. "
+                    f"Requested new agent_id: {new_agent_id}"
+                )
             
             try:
                 # Invalidate semantic cache for old agent
@@ -146,11 +245,6 @@ class VectorStore:
                     self.agentic_RAG.semantic_cache.invalidate_agent_cache(old_agent_id)
                     print(f"[CLEANUP] Cleared semantic cache for agent: {old_agent_id}")
                 
-                # Clear local entry cache (potentially mixed with old agent data)
-                if self.entry_cache:
-                    self.entry_cache.clear()
-                    print(f"[CLEANUP] Cleared local entry cache")
-                
                 # Update to new agent ID
                 self._agent_id = new_agent_id
                 
@@ -168,6 +262,8 @@ class VectorStore:
         
     def _ensure_collection(self):
         """Ensure the collection exists in ChromaDB."""
+        if self._agent_id in _known_collections:
+            return
         try:
             # Try to get collection info - if it fails, collection doesn't exist
             # Use thread-safe agent_id access via property
@@ -176,6 +272,7 @@ class VectorStore:
             # Create the collection
             self.agentic_RAG.create_agent_collection(self._agent_id)
             print(f"Created new collection for agent: {self._agent_id}")
+        _known_collections.add(self._agent_id)
     
     def _validate_agent_id_unchanged(self, operation_name: str) -> str:
         """
@@ -190,9 +287,7 @@ class VectorStore:
         Returns:
             Current agent_id at time of validation
         """
-        with self._agent_id_lock:
-            current_id = self._agent_id
-        return current_id
+        return self.agent_id
     
     def _generate_entry_id(self, entry: MemoryEntry) -> str:
         """Generate a unique ID for a memory entry."""
@@ -260,42 +355,143 @@ class VectorStore:
     
     def _metadata_to_entry(self, metadata: Dict[str, Any], document: str) -> MemoryEntry:
         """Convert ChromaDB metadata back to MemoryEntry."""
-        # Parse document to extract content (simple approach)
-        lines = document.split("\n")
-        content = lines[0].replace("Content: ", "") if lines else document
-        
-        # Parse lists from JSON strings
-        keywords = []
-        persons = []
-        entities = []
-        
-        if "keywords_json" in metadata:
-            keywords = json.loads(metadata["keywords_json"])
-        if "persons_json" in metadata:
-            persons = json.loads(metadata["persons_json"])
-        if "entities_json" in metadata:
-            entities = json.loads(metadata["entities_json"])
-        
-        return MemoryEntry(
-            entry_id=metadata.get("entry_id", ""),
-            lossless_restatement=content,
-            keywords=keywords,
-            timestamp=metadata.get("timestamp"),
-            location=metadata.get("location"),
-            persons=persons,
-            entities=entities,
-            topic=metadata.get("topic"),
-            memory_type=metadata.get("memory_type", "episodic")
-        )
+        return EntryRecord.from_metadata(metadata, document).to_entry()
     
-    def _update_cache(self, entry_id: str, entry: MemoryEntry):
-        """Update the in-memory cache with LRU eviction."""
-        if len(self.entry_cache) >= self.cache_max_size:
-            # Remove oldest entry (first key)
-            oldest_key = next(iter(self.entry_cache))
-            del self.entry_cache[oldest_key]
-        
-        self.entry_cache[entry_id] = entry
+    def _public_entries(self, records: List[EntryRecord], as_records: bool = False) -> List[Any]:
+        """API boundary: hand out validated MemoryEntry copies unless records were asked for."""
+        if as_records:
+            return records
+        return [record.to_entry() for record in records]
+
+    def _entry_to_record(self, entry: Any, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Plain record stored in the lexical index (enough to rebuild the entry)."""
+        return {
+            "entry_id": entry.entry_id,
+            "lossless_restatement": entry.lossless_restatement,
+            "keywords": list(entry.keywords),
+            "timestamp": timestamp or entry.timestamp,
+            "location": entry.location,
+            "persons": list(entry.persons),
+            "entities": list(entry.entities),
+            "topic": entry.topic,
+            "memory_type": entry.memory_type,
+        }
+
+    def _lexical_index(self, agent_id: str) -> BM25Index:
+        """
+        BM25 index for an agent. An agent with no index on disk yet is
+        bootstrapped once from the entries already in its collection.
+        """
+        index = self.lexical_indexes.get(agent_id)
+        if index.existed:
+            return index
+        with _lexical_bootstrap_lock:
+            if not index.existed and agent_id not in _lexical_bootstrapping:
+                self._bootstrap_lexical_index(agent_id, index)
+        return index
+
+    def _fetch_collection_rows(self, agent_id: str, offset: int = 0,
+                               page_size: int = 500) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Read up to LEXICAL_INDEX_BOOTSTRAP_LIMIT stored documents + metadata
+        from offset, page by page (plain get, no query embedding). Returns
+        (rows, truncated); truncated means the limit stopped the read.
+        """
+        rows = []
+        try:
+            collection = self.agentic_RAG.wrapper.manager.get_collection(agent_id)
+            while len(rows) < LEXICAL_INDEX_BOOTSTRAP_LIMIT:
+                limit = min(page_size, LEXICAL_INDEX_BOOTSTRAP_LIMIT - len(rows))
+                page = collection.get(include=["documents", "metadatas"], limit=limit, offset=offset + len(rows))
+                ids = page.get("ids") or []
+                for doc_id, document, metadata in zip(ids, page.get("documents") or [], page.get("metadatas") or []):
+                    rows.append({"id": doc_id, "document": document or "", "metadata": metadata or {}})
+                if len(ids) < limit:
+                    return rows, False
+            return rows, True
+        except Exception as e:
+            if offset:
+                raise
+            print(f"[LexicalIndex] Paged read failed for {agent_id}, using fetch_history: {e}")
+            rows = self.agentic_RAG.fetch_history(agent_ID=agent_id, top_k=LEXICAL_INDEX_BOOTSTRAP_LIMIT)
+            if len(rows) >= LEXICAL_INDEX_BOOTSTRAP_LIMIT:
+                # fetch_history cannot page past its top_k
+                print(f"[LexicalIndex] Only the first {len(rows)} entries of {agent_id} could be indexed")
+            return rows, False
+
+    def _bootstrap_lexical_index(self, agent_id: str, index: BM25Index):
+        """
+        Index the collection's first LEXICAL_INDEX_BOOTSTRAP_LIMIT rows now.
+        A larger collection is paged in by a background thread, and the index
+        is only marked built once that finishes (called with the bootstrap lock).
+        """
+        rows, truncated = self._fetch_collection_rows(agent_id)
+        index.add(self._lexical_records(agent_id, rows))
+        if truncated:
+            print(f"[LexicalIndex] {agent_id} has more than {len(rows)} entries; indexing the rest in the background")
+            _lexical_bootstrapping.add(agent_id)
+            threading.Thread(target=self._finish_lexical_bootstrap, args=(agent_id, index, len(rows)),
+                             name=f"lexical-bootstrap-{agent_id}", daemon=True).start()
+            return
+        index.ensure_persisted()
+        print(f"[LexicalIndex] Bootstrapped {len(index)} entries for {agent_id}")
+
+    def _finish_lexical_bootstrap(self, agent_id: str, index: BM25Index, offset: int):
+        """Page in the rest of a large collection; on failure the index stays unbuilt and is retried."""
+        try:
+            truncated = True
+            while truncated and agent_id in _lexical_bootstrapping:
+                rows, truncated = self._fetch_collection_rows(agent_id, offset=offset)
+                index.add(self._lexical_records(agent_id, rows))
+                offset += len(rows)
+            with _lexical_bootstrap_lock:
+                if agent_id in _lexical_bootstrapping:
+                    index.ensure_persisted()
+                    print(f"[LexicalIndex] Bootstrapped {len(index)} entries for {agent_id}")
+        except Exception as e:
+            print(f"[LexicalIndex] Background bootstrap failed for {agent_id} at offset {offset}: {e}")
+        finally:
+            with _lexical_bootstrap_lock:
+                _lexical_bootstrapping.discard(agent_id)
+
+    def _lexical_records(self, agent_id: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        records = []
+        for result in rows:
+            try:
+                metadata = result.get('metadata', {}) or {}
+                if metadata.get('entry_type', 'memory_entry') != 'memory_entry':
+                    continue
+                record = EntryRecord.from_metadata(metadata, result.get('document', ''))
+                record.entry_id = metadata.get('entry_id') or result.get('id') or record.entry_id
+                records.append(record.to_dict())
+            except Exception as e:
+                print(f"Warning: Failed to index entry for {agent_id}: {e}")
+        return records
+
+    def rebuild_lexical_index(self) -> int:
+        """Re-read the collection into the lexical index (e.g. after external writes)."""
+        agent_id = self.agent_id
+        index = self.lexical_indexes.get(agent_id)
+        with _lexical_bootstrap_lock:
+            index.clear()
+            self._bootstrap_lexical_index(agent_id, index)
+        return len(index)
+
+    def _sync_entry_cache(self, agent_id: str):
+        """Replay other workers' index writes so the shared LRU drops entries they changed."""
+        self.lexical_indexes.get(agent_id).refresh()
+
+    def _cached_entry(self, entry_id: Optional[str], agent_id: Optional[str] = None) -> Optional[EntryRecord]:
+        """Look up an entry in the shared LRU (scoped to the agent)."""
+        if not entry_id:
+            return None
+        return self.entry_cache.get(agent_id or self.agent_id, entry_id)
+
+    def _update_cache(self, entry_id: str, entry: Any, agent_id: Optional[str] = None):
+        """Insert or refresh an entry in the shared LRU (scoped to the agent), stored as an EntryRecord."""
+        if isinstance(entry, MemoryEntry):
+            entry = EntryRecord.from_entry(entry)
+        self.entry_cache.put(agent_id or self.agent_id, entry_id, entry)
     
     def freeze_agent_id_for_operation(self, operation_name: str = "operation"):
         """
@@ -320,42 +516,40 @@ class VectorStore:
         
         @contextmanager
         def _freeze_context():
-            frozen_agent_id = self.agent_id
-            
-            # Replace setter temporarily to prevent changes
-            original_setter = type(self).agent_id.fset
-            operation_id = id(threading.current_thread())
-            
-            def frozen_setter(new_value):
-                raise RuntimeError(
-                    f"Cannot change agent_id during frozen operation '{operation_name}'. "
-                    f"Current frozen agent_id: {frozen_agent_id}. "
-                    f"Requested new agent_id: {new_value}"
-                )
+            if self._agent_id_lock is None:
+                # Handles are immutable already
+                yield self._agent_id
+                return
             
+            with self._agent_id_lock:
+                if self._frozen_operation is not None:
+                    raise RuntimeError(
+                        f"agent_id is already frozen for operation '{self._frozen_operation}'"
+                    )
+                frozen_agent_id = self._agent_id
+                self._frozen_operation = operation_name
+            print(f"[FREEZE] Frozen agent_id '{frozen_agent_id}' for operation: {operation_name}")
             try:
-                # Monkey-patch the setter temporarily
-                type(self).agent_id = type(self).agent_id.setter(frozen_setter)
-                print(f"[FREEZE] Frozen agent_id '{frozen_agent_id}' for operation: {operation_name}")
                 yield frozen_agent_id
             finally:
-                # Restore original setter
-                type(self).agent_id = type(self).agent_id.setter(original_setter)
+                with self._agent_id_lock:
+                    self._frozen_operation = None
                 print(f"[UNFREEZE] Released agent_id freeze for operation: {operation_name}")
         
         return _freeze_context()
     
-    def add_entries(self, entries: List[MemoryEntry]):
+    def add_entries(self, entries: List[MemoryEntry]) -> bool:
         """
         Batch add memory entries to ChromaDB via Agentic_RAG.
         
         Paper Reference: Section 3.1 - Memory Encoding E(S_k)
         Thread-safe: captures agent_id at start to prevent corruption.
+        Entries without an entry_id get one. Returns True if the batch was stored.
         """
         print(f"[DEBUG VectorStore.add_entries] Called with {len(entries) if entries else 0} entries")
         if not entries:
             print("[DEBUG VectorStore.add_entries] No entries to add, returning early")
-            return
+            return True
         
         # Capture agent_id at start (thread-safe snapshot)
         agent_id_snapshot = self._validate_agent_id_unchanged("add_entries")
@@ -379,7 +573,7 @@ class VectorStore:
             metadatas.append(metadata)
             
             # Cache the entry
-            self._update_cache(entry.entry_id, entry)
+            self._update_cache(entry.entry_id, entry, agent_id_snapshot)
         
         # Use batch operation for efficiency
         batch = self.agentic_RAG.batch_operation()
@@ -398,16 +592,21 @@ class VectorStore:
         print(f"[DEBUG VectorStore.add_entries] Batch execute result: {result}")
         
         if result.get('success'):
+            self._lexical_index(agent_id_snapshot).add(
+                self._entry_to_record(entry, metadata["timestamp"]) for entry, metadata in zip(entries, metadatas)
+            )
             print(f"[SUCCESS] Added {len(entries)} memory entries to {agent_id_snapshot}")
-        else:
-            print(f"[ERROR] Error adding entries: {result.get('error')}")
+            return True
+        print(f"[ERROR] Error adding entries: {result.get('error')}")
+        for entry in entries:
+            self.entry_cache.invalidate(agent_id_snapshot, entry.entry_id)
+        return False
     
     def add_single_entry(self, entry: MemoryEntry) -> bool:
         """Add a single memory entry."""
-        self.add_entries([entry])
-        return True
+        return self.add_entries([entry])
     
-    def semantic_search(self, query: str, top_k: int = 5, **kwargs) -> List[MemoryEntry]:
+    def semantic_search(self, query: str, top_k: int = 5, as_records: bool = False, **kwargs) -> List[MemoryEntry]:
         """
         Semantic Layer Search - Dense vector similarity using ChromaDB.
         
@@ -446,8 +645,9 @@ class VectorStore:
                     n_results=top_k
                 )
             
-            # Convert results to MemoryEntry objects
-            entries = []
+            # Convert results to EntryRecords
+            self._sync_entry_cache(self.agent_id)
+            records = []
             for result in results:
                 try:
                     metadata = result.get('metadata', {})
@@ -455,118 +655,92 @@ class VectorStore:
                     
                     # Check if we have this entry in cache
                     entry_id = metadata.get('entry_id')
-                    if entry_id and entry_id in self.entry_cache:
-                        entries.append(self.entry_cache[entry_id])
+                    cached = self._cached_entry(entry_id)
+                    if cached is not None:
+                        records.append(cached)
                         continue
                     
-                    # Create new entry from result
-                    entry = self._metadata_to_entry(metadata, document)
+                    # Create new record from result (list fields decoded lazily)
+                    record = EntryRecord.from_metadata(metadata, document)
                     if entry_id:
-                        entry.entry_id = entry_id
-                        self._update_cache(entry_id, entry)
+                        self._update_cache(entry_id, record)
                     
-                    entries.append(entry)
+                    records.append(record)
                 except Exception as e:
                     print(f"Warning: Failed to parse search result: {e}")
                     continue
             
-            return entries
+            return self._public_entries(records, as_records)
             
         except Exception as e:
             print(f"Error during semantic search: {e}")
             return []
     
-    def keyword_search(self, keywords: List[str], top_k: int = 3, **kwargs) -> List[MemoryEntry]:
+    def _resolve_entry(self, agent_id: str, entry_id: str, index: BM25Index,
+                       result: Optional[Dict[str, Any]] = None) -> Optional[EntryRecord]:
+        """Record from cache, the local index record, or a raw vector-store result."""
+        entry = self._cached_entry(entry_id, agent_id)
+        if entry is not None:
+            return entry
+        record = index.get(entry_id)
+        if record is not None:
+            entry = EntryRecord.from_dict(record)
+        elif result is not None:
+            entry = EntryRecord.from_metadata(result.get('metadata', {}) or {}, result.get('document', ''))
+            entry.entry_id = entry_id
+        else:
+            return None
+        self._update_cache(entry_id, entry, agent_id)
+        return entry
+
+    def _dense_candidates(self, agent_id: str, query: str, n_results: int) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Semantic layer ranking as (entry_id, similarity, raw result)."""
+        results = self.agentic_RAG.search_agent_collection(agent_ID=agent_id, query=query, n_results=n_results)
+        candidates = []
+        for result in results:
+            metadata = result.get('metadata', {}) or {}
+            entry_id = metadata.get('entry_id') or result.get('id')
+            if entry_id:
+                candidates.append((entry_id, 1.0 - result.get('distance', 1.0), result))
+        return candidates
+
+    def keyword_search(self, keywords: List[str], top_k: int = 3, as_records: bool = False, **kwargs) -> List[MemoryEntry]:
         """
-        Lexical Layer Search - Keyword matching using ChromaDB vector similarity.
+        Lexical Layer Search - BM25 over the agent's local inverted index.
         
         Paper Reference: Section 3.1
         Retrieves based on h_k = Sparse(S_k) for precise term and entity matching.
-        Uses vector search with keyword-based queries.
+        Scores `lossless_restatement` and `keywords` with BM25; no embedding
+        or vector-store call is made.
         """
         try:
             if not keywords:
                 return []
             
-            # Create a query from keywords
-            query_text = " ".join(keywords)
-            
-            # Prepare metadata filters for structured keyword search
-            filters = {}
-            
-            # Convert keyword list to JSON string for metadata filtering
-            filters["keywords_json"] = json.dumps(keywords)
-            
-            # Additional filters from kwargs
-            if kwargs.get('persons'):
-                filters["persons_json"] = json.dumps(kwargs['persons'])
-            if kwargs.get('location'):
-                filters["location"] = kwargs['location']
+            persons = [p.lower() for p in kwargs.get('persons') or []]
+            location = kwargs.get('location')
+            filtered = bool(persons or location)
             
-            # Use hybrid approach: combine keyword query with metadata filtering
-            results = self.agentic_RAG.search_with_filters(
-                agent_ID=self.agent_id,
-                query=query_text,
-                filters=filters,
-                n_results=top_k * 2,  # Get more results for filtering
-                distance_threshold=kwargs.get('distance_threshold', 0.8)
-            )
+            agent_id = self.agent_id
+            index = self._lexical_index(agent_id)
+            hits = index.search(keywords, top_k=top_k * 4 if filtered else top_k)
             
-            # Additional keyword scoring on top of vector similarity
-            scored_entries = []
-            for result in results:
-                try:
-                    metadata = result.get('metadata', {})
-                    document = result.get('document', '').lower()
-                    
-                    # Check cache first
-                    entry_id = metadata.get('entry_id')
-                    if entry_id and entry_id in self.entry_cache:
-                        entry = self.entry_cache[entry_id]
-                    else:
-                        entry = self._metadata_to_entry(metadata, document)
-                        if entry_id:
-                            entry.entry_id = entry_id
-                    
-                    # Calculate keyword score
-                    keyword_score = 0
-                    document_lower = document.lower()
-                    entry_keywords_lower = [k.lower() for k in entry.keywords]
-                    
-                    for kw in keywords:
-                        kw_lower = kw.lower()
-                        
-                        # Exact match in keywords list
-                        if kw_lower in entry_keywords_lower:
-                            keyword_score += 3
-                        
-                        # Match in document text
-                        if kw_lower in document_lower:
-                            keyword_score += 1
-                    
-                    if keyword_score > 0:
-                        # Combine with vector similarity (inverse of distance)
-                        vector_score = 1.0 - result.get('distance', 1.0)
-                        total_score = (keyword_score * 0.7) + (vector_score * 0.3)
-                        
-                        scored_entries.append((total_score, entry))
-                        
-                except Exception as e:
-                    print(f"Warning: Failed to score result: {e}")
+            entries = []
+            for entry_id, _score in hits:
+                entry = self._resolve_entry(agent_id, entry_id, index)
+                if entry is None:
                     continue
+                
+                if persons and not set(persons) <= {p.lower() for p in entry.persons}:
+                    continue
+                if location and entry.location != location:
+                    continue
+                
+                entries.append(entry)
+                if len(entries) >= top_k:
+                    break
             
-            # Sort by combined score
-            scored_entries.sort(reverse=True, key=lambda x: x[0])
-            
-            # Return top_k entries
-            entries = [entry for _, entry in scored_entries[:top_k]]
-            
-            # Cache the results
-            for entry in entries:
-                if entry.entry_id:
-                    self._update_cache(entry.entry_id, entry)
-            
-            return entries
+            return self._public_entries(entries, as_records)
             
         except Exception as e:
             print(f"Error during keyword search: {e}")
@@ -579,114 +753,59 @@ class VectorStore:
         location: Optional[str] = None,
         entities: Optional[List[str]] = None,
         topic: Optional[str] = None,
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        as_records: bool = False
     ) -> List[MemoryEntry]:
         """
         Symbolic Layer Search - Metadata-based deterministic filtering.
         
         Paper Reference: Section 3.1
         Retrieves based on R_k = {(key, val)} for structured constraints.
-        Uses ChromaDB's metadata filtering capabilities.
+        Intersects the agent's local secondary indexes (inverted sets for
+        persons/entities/location/topic, sorted timestamps for the range);
+        results are newest first.
         
         Args:
-            persons: Filter by person names
-            timestamp_range: Filter by time range (start, end)
+            persons: Filter by person names (entry must mention all of them)
+            timestamp_range: Filter by time range (start, end), datetimes or ISO strings
             location: Filter by location
-            entities: Filter by entities
+            entities: Filter by entities (entry must mention all of them)
             topic: Filter by topic
             top_k: Maximum number of results to return
+            as_records: Return internal EntryRecords instead of MemoryEntry models
         """
         try:
-            # Build metadata filters
-            filters = {}
-            
-            if persons:
-                filters["persons_json"] = json.dumps(persons)
-            
-            if location:
-                filters["location"] = location
-            
-            if topic:
-                filters["topic"] = topic
-            
-            if entities:
-                filters["entities_json"] = json.dumps(entities)
-            
-            if timestamp_range:
-                start_time, end_time = timestamp_range
-                filters["timestamp"] = {
-                    "$gte": start_time.isoformat(),
-                    "$lte": end_time.isoformat()
-                }
+            start_time, end_time = timestamp_range if timestamp_range else (None, None)
             
             # If no filters, return empty
-            if not filters:
+            if not any([persons, location, topic, entities, start_time, end_time]):
                 return []
             
-            # Use fetch_with_filter for pure metadata filtering
-            # First, get all matching documents
-            filter_results = self.agentic_RAG.fetch_with_filter(
-                agent_ID=self.agent_id,
-                filter_metadata=filters,
-                top_k=top_k or 300
+            agent_id = self.agent_id
+            index = self._lexical_index(agent_id)
+            entry_ids = index.filter(
+                persons=persons,
+                entities=entities,
+                location=location,
+                topic=topic,
+                start=start_time,
+                end=end_time
             )
+            if top_k:
+                entry_ids = entry_ids[:top_k]
             
-            # Convert to MemoryEntry objects
             entries = []
-            for result in filter_results:
-                try:
-                    metadata = result.get('metadata', {})
-                    document = result.get('document', '')
-                    
-                    # Check cache
-                    entry_id = metadata.get('entry_id')
-                    if entry_id and entry_id in self.entry_cache:
-                        entries.append(self.entry_cache[entry_id])
-                        continue
-                    
-                    entry = self._metadata_to_entry(metadata, document)
-                    if entry_id:
-                        entry.entry_id = entry_id
-                        self._update_cache(entry_id, entry)
-                    
+            for entry_id in entry_ids:
+                entry = self._resolve_entry(agent_id, entry_id, index)
+                if entry is not None:
                     entries.append(entry)
-                except Exception as e:
-                    print(f"Warning: Failed to parse filter result: {e}")
-                    continue
             
-            # If we have timestamp_range but Chroma doesn't support it natively,
-            # we need to filter manually
-            if timestamp_range and not self._chroma_supports_date_filtering():
-                start_time, end_time = timestamp_range
-                filtered_entries = []
-                
-                for entry in entries:
-                    if entry.timestamp:
-                        try:
-                            entry_time = datetime.fromisoformat(entry.timestamp)
-                            if start_time <= entry_time <= end_time:
-                                filtered_entries.append(entry)
-                        except ValueError:
-                            continue
-                
-                entries = filtered_entries
-            
-            # Apply top_k limit if specified
-            if top_k and len(entries) > top_k:
-                entries = entries[:top_k]
-            
-            return entries
+            return self._public_entries(entries, as_records)
             
         except Exception as e:
             print(f"Error during structured search: {e}")
             return []
     
-    def _chroma_supports_date_filtering(self) -> bool:
-        """Check if ChromaDB supports date range filtering."""
-        # ChromaDB's metadata filtering is limited for dates
-        # This is a placeholder - actual implementation depends on Chroma version
-        return False
-    
     def hybrid_search(
         self,
         query: str,
@@ -696,73 +815,83 @@ class VectorStore:
         topic: Optional[str] = None,
         top_k: int = 5,
         semantic_weight: float = 0.6,
-        keyword_weight: float = 0.4
-    ) -> List[MemoryEntry]:
+        keyword_weight: float = 0.4,
+        symbolic_weight: float = 0.4,
+        entities: Optional[List[str]] = None,
+        timestamp_range: Optional[Tuple[Any, Any]] = None,
+        fusion: str = "rrf",
+        return_scores: bool = False,
+        as_records: bool = False
+    ) -> List[Any]:
         """
         Hybrid Search - Combine semantic, lexical, and symbolic layers.
         
         Paper Reference: Section 3.2 - Multi-View Indexing
-        Combines all three layers for comprehensive retrieval.
+        One retrieval stage: the dense query (the only network call) runs on a
+        worker thread while BM25 and the symbolic indexes are scored locally;
+        the three rankings are then fused with reciprocal rank fusion (or
+        normalized score fusion). Symbolic constraints boost matching entries
+        rather than filtering the other layers.
         
         Args:
             query: Semantic search query
-            keywords: Keywords for lexical matching
-            persons: Persons filter
-            location: Location filter
-            topic: Topic filter
+            keywords: Keywords for lexical matching (defaults to the query text)
+            persons: Persons constraint
+            location: Location constraint
+            topic: Topic constraint
             top_k: Number of results
-            semantic_weight: Weight for semantic scores (0-1)
-            keyword_weight: Weight for keyword scores (0-1)
+            semantic_weight: Weight of the semantic layer
+            keyword_weight: Weight of the lexical layer
+            symbolic_weight: Weight of the symbolic layer
+            entities: Entities constraint
+            timestamp_range: (start, end) time constraint
+            fusion: "rrf" or "score"
+            return_scores: Return (MemoryEntry, fused_score) pairs instead of entries
+            as_records: Return internal EntryRecords instead of MemoryEntry models
         """
         try:
-            # Get semantic results
-            semantic_results = self.semantic_search(
-                query=query,
-                top_k=top_k * 2,
-                persons=persons,
-                location=location,
-                topic=topic
-            )
-            
-            # Get keyword results if keywords provided
-            keyword_results = []
-            if keywords:
-                keyword_results = self.keyword_search(
-                    keywords=keywords,
-                    top_k=top_k * 2,
-                    persons=persons,
-                    location=location
-                )
-            
-            # Combine and score results
-            entry_scores = {}
+            agent_id = self.agent_id
+            depth = top_k * 2
+            dense_future = _hybrid_executor.submit(self._dense_candidates, agent_id, query, depth)
+            
+            index = self._lexical_index(agent_id)
+            lexical = index.search(keywords or [query], top_k=depth)
+            symbolic = []
+            if any([persons, location, topic, entities, timestamp_range]):
+                start_time, end_time = timestamp_range if timestamp_range else (None, None)
+                matched = index.filter(persons=persons, entities=entities, location=location,
+                                       topic=topic, start=start_time, end=end_time)
+                symbolic = [(entry_id, 1.0) for entry_id in matched[:depth]]
             
-            # Score semantic results
-            for i, entry in enumerate(semantic_results):
-                score = semantic_weight * (1.0 - (i / (len(semantic_results) * 2)))
-                if entry.entry_id in entry_scores:
-                    entry_scores[entry.entry_id] += score
-                else:
-                    entry_scores[entry.entry_id] = score
-            
-            # Score keyword results
-            for i, entry in enumerate(keyword_results):
-                score = keyword_weight * (1.0 - (i / (len(keyword_results) * 2)))
-                if entry.entry_id in entry_scores:
-                    entry_scores[entry.entry_id] += score
-                else:
-                    entry_scores[entry.entry_id] = score
+            try:
+                dense = dense_future.result()
+            except Exception as e:
+                print(f"Warning: semantic layer failed during hybrid search: {e}")
+                dense = []
+            raw_results = {entry_id: result for entry_id, _, result in dense}
+            
+            fused = fuse_rankings(
+                {
+                    "semantic": [(entry_id, score) for entry_id, score, _ in dense],
+                    "lexical": lexical,
+                    "symbolic": symbolic,
+                },
+                weights={"semantic": semantic_weight, "lexical": keyword_weight, "symbolic": symbolic_weight},
+                method=fusion
+            )
             
-            # Sort by combined score
             scored_entries = []
-            for entry in set(semantic_results + keyword_results):
-                score = entry_scores.get(entry.entry_id, 0)
-                scored_entries.append((score, entry))
-            
-            scored_entries.sort(reverse=True, key=lambda x: x[0])
-            
-            # Return top_k entries
-            return [entry for _, entry in scored_entries[:top_k]]
+            for entry_id, score in fused:
+                entry = self._resolve_entry(agent_id, entry_id, index, raw_results.get(entry_id))
+                if entry is not None:
+                    scored_entries.append((entry, score))
+                    if len(scored_entries) >= top_k:
+                        break
+            
+            entries = self._public_entries([entry for entry, _ in scored_entries], as_records)
+            if return_scores:
+                return [(entry, score) for entry, (_, score) in zip(entries, scored_entries)]
+            return entries
             
         except Exception as e:
             print(f"Error during hybrid search: {e}")
@@ -779,8 +908,10 @@ class VectorStore:
             MemoryEntry if found, None otherwise
         """
         # Check cache first
-        if entry_id in self.entry_cache:
-            return self.entry_cache[entry_id]
+        self._sync_entry_cache(self.agent_id)
+        cached = self._cached_entry(entry_id)
+        if cached is not None:
+            return cached.to_entry()
         
         try:
             # Use get_message_by_id from Agentic_RAG
@@ -805,17 +936,19 @@ class VectorStore:
         
         return None
     
-    def get_all_entries(self, limit: int = 300) -> List[MemoryEntry]:
+    def get_all_entries(self, limit: int = 300, as_records: bool = False) -> List[MemoryEntry]:
         """
         Get all memory entries from the collection.
         
         Args:
             limit: Maximum number of entries to retrieve
+            as_records: Return internal EntryRecords instead of MemoryEntry models
             
         Returns:
             List of MemoryEntry objects
         """
         try:
+            self._sync_entry_cache(self.agent_id)
             # Use fetch_history from Agentic_RAG
             results = self.agentic_RAG.fetch_history(
                 agent_ID=self.agent_id,
@@ -830,13 +963,13 @@ class VectorStore:
                     
                     # Check cache
                     entry_id = metadata.get('entry_id')
-                    if entry_id and entry_id in self.entry_cache:
-                        entries.append(self.entry_cache[entry_id])
+                    cached = self._cached_entry(entry_id)
+                    if cached is not None:
+                        entries.append(cached)
                         continue
                     
-                    entry = self._metadata_to_entry(metadata, document)
+                    entry = EntryRecord.from_metadata(metadata, document)
                     if entry_id:
-                        entry.entry_id = entry_id
                         self._update_cache(entry_id, entry)
                     
                     entries.append(entry)
@@ -844,7 +977,7 @@ class VectorStore:
                     print(f"Warning: Failed to parse entry: {e}")
                     continue
             
-            return entries
+            return self._public_entries(entries, as_records)
             
         except Exception as e:
             print(f"Error getting all entries: {e}")
@@ -865,16 +998,21 @@ class VectorStore:
                 print("Error: Entry must have an entry_id to update")
                 return False
             
+            agent_id = self.agent_id
+            metadata = self._entry_to_metadata(entry)
+            metadata["entry_id"] = entry.entry_id
+
             # Update in ChromaDB
             result = self.agentic_RAG.update_docs(
-                agent_ID=self.agent_id,
+                agent_ID=agent_id,
                 ids=[entry.entry_id],
                 documents=[self._entry_to_document(entry)],
-                metadatas=[self._entry_to_metadata(entry)]
+                metadatas=[metadata]
             )
+            self._lexical_index(agent_id).add([self._entry_to_record(entry, metadata["timestamp"])])
             
             # Update cache
-            self._update_cache(entry.entry_id, entry)
+            self._update_cache(entry.entry_id, entry, agent_id)
             
             return True
             
@@ -882,6 +1020,20 @@ class VectorStore:
             print(f"Error updating entry {entry.entry_id}: {e}")
             return False
     
+    def patch_entry(self, entry_id: str, updates: Dict[str, Any]) -> Optional[MemoryEntry]:
+        """
+        Update some fields of a stored entry (see PATCHABLE_FIELDS).
+        
+        Returns:
+            The updated MemoryEntry, or None if the entry does not exist or the update failed
+        """
+        entry = self.get_entry_by_id(entry_id)
+        if entry is None:
+            return None
+        fields = {k: v for k, v in updates.items() if k in self.PATCHABLE_FIELDS}
+        updated = MemoryEntry(**{**entry.model_dump(), **fields, "entry_id": entry_id})
+        return updated if self.update_entry(updated) else None
+    
     def delete_entry(self, entry_id: str) -> bool:
         """
         Delete a memory entry by ID.
@@ -892,21 +1044,29 @@ class VectorStore:
         Returns:
             True if successful, False otherwise
         """
+        return self.delete_entries([entry_id])
+    
+    def delete_entries(self, entry_ids: List[str]) -> bool:
+        """Delete memory entries by ID in one vector-store call."""
+        entry_ids = list(entry_ids)
         try:
+            agent_id = self.agent_id
+
             # Delete from ChromaDB
             result = self.agentic_RAG.delete_chat_history(
-                agent_ID=self.agent_id,
-                ids=[entry_id]
+                agent_ID=agent_id,
+                ids=entry_ids
             )
+            self._lexical_index(agent_id).remove(entry_ids)
             
             # Remove from cache
-            if entry_id in self.entry_cache:
-                del self.entry_cache[entry_id]
+            for entry_id in entry_ids:
+                self.entry_cache.invalidate(agent_id, entry_id)
             
             return True
             
         except Exception as e:
-            print(f"Error deleting entry {entry_id}: {e}")
+            print(f"Error deleting entries {entry_ids}: {e}")
             return False
     
     def clear(self) -> bool:
@@ -918,7 +1078,7 @@ class VectorStore:
         """
         try:
             # Get all entry IDs
-            entries = self.get_all_entries()
+            entries = self.get_all_entries(as_records=True)
             entry_ids = [e.entry_id for e in entries if e.entry_id]
             
             if entry_ids:
@@ -931,7 +1091,8 @@ class VectorStore:
                     )
             
             # Clear cache
-            self.entry_cache.clear()
+            self.entry_cache.invalidate_agent(self.agent_id)
+            self.lexical_indexes.get(self.agent_id).clear()
             
             print(f"Cleared all entries from {self.agent_id}")
             return True
@@ -953,6 +1114,7 @@ class VectorStore:
             
             # Add cache statistics
             stats['cache_size'] = len(self.entry_cache)
+            stats['entry_cache'] = self.entry_cache.get_stats()
             stats['cache_hit_rate'] = self.agentic_RAG.get_performance_metrics().get('cache_hit_rate', 0)
             
             return stats
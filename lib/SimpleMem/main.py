@@ -50,7 +50,8 @@ class SimpleMemSystem:
         enable_parallel_processing: Optional[bool] = None,
         max_parallel_workers: Optional[int] = None,
         enable_parallel_retrieval: Optional[bool] = None,
-        max_retrieval_workers: Optional[int] = None
+        max_retrieval_workers: Optional[int] = None,
+        ensure_collection: bool = True
     ):
         """
         Initialize system
@@ -71,6 +72,7 @@ class SimpleMemSystem:
         - max_parallel_workers: Maximum number of parallel workers for memory building (None=use config default)
         - enable_parallel_retrieval: Enable parallel processing for retrieval queries (None=use config default)
         - max_retrieval_workers: Maximum number of parallel workers for retrieval (None=use config default)
+        - ensure_collection: Create agent_id's collection if missing (False for a base system only used via for_agent)
         """
         print("=" * 60)
         print("Initializing SimpleMem System")
@@ -90,6 +92,7 @@ class SimpleMemSystem:
             # db_path=db_path,
             embedding_model=self.embedding_model,
             # table_name=table_name
+            ensure_collection=ensure_collection
         )
 
         if clear_db:
@@ -121,6 +124,46 @@ class SimpleMemSystem:
         print("\nSystem initialization complete!")
         print("=" * 60)
 
+    def for_agent(self, agent_id: str) -> "SimpleMemSystem":
+        """
+        Lightweight system bound to another agent
+
+        Shares the LLM client, embedding model and storage clients with this
+        system (via VectorStore.for_agent) and reuses its retrieval/building
+        settings; only the per-agent dialogue buffer is new. Systems for
+        different agents can be used concurrently.
+
+        Args:
+        - agent_id: Agent whose memories the new system reads and writes
+        """
+        system = object.__new__(type(self))
+        system.llm_client = self.llm_client
+        system.embedding_model = self.embedding_model
+        system.vector_store = self.vector_store.for_agent(agent_id)
+        system.memory_builder = MemoryBuilder(
+            llm_client=self.llm_client,
+            vector_store=system.vector_store,
+            window_size=self.memory_builder.window_size,
+            enable_parallel_processing=self.memory_builder.enable_parallel_processing,
+            max_parallel_workers=self.memory_builder.max_parallel_workers
+        )
+        system.hybrid_retriever = HybridRetriever(
+            llm_client=self.llm_client,
+            vector_store=system.vector_store,
+            semantic_top_k=self.hybrid_retriever.semantic_top_k,
+            keyword_top_k=self.hybrid_retriever.keyword_top_k,
+            structured_top_k=self.hybrid_retriever.structured_top_k,
+            enable_planning=self.hybrid_retriever.enable_planning,
+            enable_reflection=self.hybrid_retriever.enable_reflection,
+            max_reflection_rounds=self.hybrid_retriever.max_reflection_rounds,
+            enable_parallel_retrieval=self.hybrid_retriever.enable_parallel_retrieval,
+            max_retrieval_workers=self.hybrid_retriever.max_retrieval_workers,
+            enable_adaptive_routing=self.hybrid_retriever.enable_adaptive_routing,
+            complexity_threshold=self.hybrid_retriever.complexity_threshold
+        )
+        system.answer_generator = self.answer_generator
+        return system
+
     def add_dialogue(self, speaker: str, content: str, timestamp: Optional[str] = None):
         """
         Add a single dialogue
@@ -0,0 +1,135 @@
+"""
+Internal Data Structure - EntryRecord (retrieval hot path)
+
+A compact, slotted stand-in for MemoryEntry used inside VectorStore and
+HybridRetriever. Records built from vector-store metadata keep the
+keywords/persons/entities JSON strings and decode them on first access,
+and no Pydantic validation happens until to_entry() at the API boundary.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+from SimpleMem.models.memory_entry import MemoryEntry
+
+
+def _decode_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
+
+
+class EntryRecord:
+    """Atomic entry with the same fields as MemoryEntry, minus validation."""
+
+    __slots__ = (
+        "entry_id", "lossless_restatement", "timestamp", "location",
+        "topic", "memory_type", "_keywords", "_persons", "_entities",
+    )
+
+    def __init__(
+        self,
+        entry_id: str,
+        lossless_restatement: str,
+        keywords: Any = None,
+        timestamp: Optional[str] = None,
+        location: Optional[str] = None,
+        persons: Any = None,
+        entities: Any = None,
+        topic: Optional[str] = None,
+        memory_type: str = "episodic",
+    ):
+        self.entry_id = entry_id
+        self.lossless_restatement = lossless_restatement
+        self.timestamp = timestamp
+        self.location = location
+        self.topic = topic
+        self.memory_type = memory_type
+        # Lists, or still-encoded JSON strings (decoded lazily)
+        self._keywords = keywords
+        self._persons = persons
+        self._entities = entities
+
+    @property
+    def keywords(self) -> List[str]:
+        if not isinstance(self._keywords, list):
+            self._keywords = _decode_list(self._keywords)
+        return self._keywords
+
+    @property
+    def persons(self) -> List[str]:
+        if not isinstance(self._persons, list):
+            self._persons = _decode_list(self._persons)
+        return self._persons
+
+    @property
+    def entities(self) -> List[str]:
+        if not isinstance(self._entities, list):
+            self._entities = _decode_list(self._entities)
+        return self._entities
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any], document: str) -> "EntryRecord":
+        """Build from a vector-store result without decoding the list fields."""
+        content = document.partition("\n")[0].replace("Content: ", "")
+        return cls(
+            entry_id=metadata.get("entry_id", ""),
+            lossless_restatement=content,
+            keywords=metadata.get("keywords_json"),
+            timestamp=metadata.get("timestamp"),
+            location=metadata.get("location"),
+            persons=metadata.get("persons_json"),
+            entities=metadata.get("entities_json"),
+            topic=metadata.get("topic"),
+            memory_type=metadata.get("memory_type") or "episodic",
+        )
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "EntryRecord":
+        """Build from a plain record (e.g. the lexical index copy)."""
+        return cls(
+            entry_id=record.get("entry_id", ""),
+            lossless_restatement=record.get("lossless_restatement", ""),
+            keywords=record.get("keywords"),
+            timestamp=record.get("timestamp"),
+            location=record.get("location"),
+            persons=record.get("persons"),
+            entities=record.get("entities"),
+            topic=record.get("topic"),
+            memory_type=record.get("memory_type") or "episodic",
+        )
+
+    @classmethod
+    def from_entry(cls, entry: MemoryEntry) -> "EntryRecord":
+        return cls(
+            entry_id=entry.entry_id,
+            lossless_restatement=entry.lossless_restatement,
+            keywords=list(entry.keywords),
+            timestamp=entry.timestamp,
+            location=entry.location,
+            persons=list(entry.persons),
+            entities=list(entry.entities),
+            topic=entry.topic,
+            memory_type=entry.memory_type,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entry_id": self.entry_id,
+            "lossless_restatement": self.lossless_restatement,
+            "keywords": list(self.keywords),
+            "timestamp": self.timestamp,
+            "location": self.location,
+            "persons": list(self.persons),
+            "entities": list(self.entities),
+            "topic": self.topic,
+            "memory_type": self.memory_type,
+        }
+
+    def to_entry(self) -> MemoryEntry:
+        """Validated Pydantic model for callers outside the retrieval path."""
+        return MemoryEntry(**self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"EntryRecord(entry_id={self.entry_id!r}, lossless_restatement={self.lossless_restatement!r})"
@@ -0,0 +1,177 @@
+"""
+Embedding Cache - Persistent content-hash cache for remote embeddings
+
+Vectors are keyed by (model, sha256(text)) and stored as L2-normalized
+float32 together with their original norm, so callers get back exactly what
+the endpoint returned. Two tiers:
+- an in-process LRU of recently used vectors
+- an embedded SQLite file (WAL mode) that every gunicorn worker on the host
+  opens, so a text embedded by one worker is a disk read for the others.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) embedding cache."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS embeddings (
+            model TEXT NOT NULL,
+            hash TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            norm REAL NOT NULL,
+            vector BLOB NOT NULL,
+            PRIMARY KEY (model, hash)
+        )
+    """
+    LOOKUP_BATCH = 500  # stays under SQLite's bound-parameter limit
+
+    def __init__(self, path: Optional[str] = None, max_memory_entries: int = 4096):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "disk_errors": 0}
+
+        if self.path:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._connection()
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """One connection per thread; WAL lets several processes read while one writes."""
+        if not self.path:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(self.SCHEMA)
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, model: str, hashes: List[str]) -> Dict[str, Tuple[np.ndarray, float]]:
+        found: Dict[str, Tuple[np.ndarray, float]] = {}
+        try:
+            conn = self._connection()
+            if conn is None:
+                return found
+            for i in range(0, len(hashes), self.LOOKUP_BATCH):
+                window = hashes[i:i + self.LOOKUP_BATCH]
+                rows = conn.execute(
+                    f"SELECT hash, dim, norm, vector FROM embeddings WHERE model = ? "
+                    f"AND hash IN ({','.join('?' * len(window))})",
+                    [model, *window],
+                ).fetchall()
+                for h, dim, norm, blob in rows:
+                    unit = np.frombuffer(blob, dtype=np.float32)
+                    if unit.shape[0] == dim:
+                        found[h] = (unit, norm)
+        except sqlite3.Error as e:
+            print(f"[EmbeddingCache] Disk read failed: {e}")
+            with self._lock:
+                self._stats["disk_errors"] += 1
+        return found
+
+    def _disk_put(self, model: str, items: List[Tuple[str, np.ndarray, float]]):
+        try:
+            conn = self._connection()
+            if conn is None:
+                return
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, hash, dim, norm, vector) VALUES (?, ?, ?, ?, ?)",
+                    [(model, h, unit.shape[0], norm, unit.tobytes()) for h, unit, norm in items],
+                )
+        except sqlite3.Error as e:
+            print(f"[EmbeddingCache] Disk write failed: {e}")
+            with self._lock:
+                self._stats["disk_errors"] += 1
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached vectors for texts (None where missing), as the endpoint returned them."""
+        hashes = [text_key(t) for t in texts]
+        found: Dict[str, Tuple[np.ndarray, float]] = {}
+        memory_hits = 0
+
+        with self._lock:
+            for h in hashes:
+                if h in found:
+                    continue
+                cached = self._memory.get((model, h))
+                if cached is not None:
+                    self._memory.move_to_end((model, h))
+                    found[h] = cached
+                    memory_hits += 1
+
+        missing = [h for h in dict.fromkeys(hashes) if h not in found]
+        from_disk = self._disk_get(model, missing) if missing else {}
+        found.update(from_disk)
+
+        with self._lock:
+            for h, value in from_disk.items():
+                self._remember((model, h), value)
+            self._stats["memory_hits"] += memory_hits
+            self._stats["disk_hits"] += len(from_disk)
+            self._stats["misses"] += len(missing) - len(from_disk)
+
+        return [self._restore(found[h]) if h in found else None for h in hashes]
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        items = []
+        for text, vector in zip(texts, vectors):
+            raw = np.asarray(vector, dtype=np.float32)
+            norm = float(np.linalg.norm(raw))
+            unit = raw / norm if norm > 0 else raw
+            items.append((text_key(text), unit, norm))
+
+        with self._lock:
+            for h, unit, norm in items:
+                self._remember((model, h), (unit, norm))
+            self._stats["writes"] += len(items)
+        if items:
+            self._disk_put(model, items)
+
+    @staticmethod
+    def _restore(value: Tuple[np.ndarray, float]) -> List[float]:
+        unit, norm = value
+        return (unit * norm if norm > 0 else unit).tolist()
+
+    def _remember(self, key: Tuple[str, str], value: Tuple[np.ndarray, float]):
+        # Called with the lock held
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+            stats["memory_entries"] = len(self._memory)
+            stats["path"] = self.path
+            return stats
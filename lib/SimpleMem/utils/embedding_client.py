@@ -0,0 +1,393 @@
+"""
+Embedding Client - Shared, pooled client for the remote embedding API
+
+The embedding endpoint is a Gradio "call" API: a POST returns an event_id and
+the result is read from a streaming GET on {url}/{event_id}. This client keeps
+those round-trips cheap:
+- One keep-alive connection pool per endpoint (requests.Session for the sync
+  path, httpx.AsyncClient for the async path), shared by every caller in the
+  process through get_embedding_client().
+- At most `max_concurrency` texts/batches are in flight at once; a list of
+  texts is embedded concurrently instead of one after another.
+- Native multi-text batching ({"data": [[t1, t2, ...]]}) is used when the
+  endpoint supports it. With batch_mode="auto" the first multi-text call
+  probes for it and falls back to per-text requests if the reply does not
+  contain one embedding per text.
+- With a cache attached (see embedding_cache), texts already embedded for
+  this model are answered from memory/disk and only misses hit the network.
+
+Both embed() and aembed() return plain List[List[float]] in input order.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from SimpleMem.utils.embedding_cache import EmbeddingCache
+
+try:
+    import httpx
+except ImportError:  # async interface is optional
+    httpx = None
+
+
+BATCH_MODES = ("auto", "on", "off")
+
+
+def _parse_embeddings(payload: Any) -> Optional[List[List[float]]]:
+    """
+    Pull dense embeddings out of a Gradio result payload.
+    Single-text replies look like [{"dense_embedding": [...]}]; batched replies
+    carry a list of those, or one dict whose dense_embedding is a matrix.
+    """
+    if isinstance(payload, dict):
+        if "data" in payload and "dense_embedding" not in payload:
+            return _parse_embeddings(payload["data"])
+        emb = payload.get("dense_embedding")
+        if not emb:
+            return None
+        return emb if isinstance(emb[0], list) else [emb]
+
+    if isinstance(payload, list) and payload:
+        # Unwrap the per-output list ([output0, ...]) when output0 is itself a list
+        if len(payload) == 1 and isinstance(payload[0], list):
+            return _parse_embeddings(payload[0])
+        if all(isinstance(item, dict) for item in payload):
+            vectors = []
+            for item in payload:
+                parsed = _parse_embeddings(item)
+                if parsed is None:
+                    return None
+                vectors.extend(parsed)
+            return vectors
+    return None
+
+
+def _parse_data_line(line: str) -> Any:
+    text = line[len("data:"):].strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        # Some servers prefix extra characters before the JSON array
+        idx = text.find("[")
+        if idx < 0:
+            return None
+        try:
+            return json.loads(text[idx:])
+        except ValueError:
+            return None
+
+
+class RemoteEmbeddingClient:
+    """Pooled, concurrency-bounded client for one embedding endpoint."""
+
+    def __init__(self, url: str, timeout: float = 60, max_concurrency: int = 8,
+                 batch_mode: str = "auto", batch_size: int = 32, cache: Optional[EmbeddingCache] = None,
+                 model: Optional[str] = None):
+        if not url:
+            raise ValueError("Embedding client requires an endpoint URL")
+        if batch_mode not in BATCH_MODES:
+            raise ValueError(f"batch_mode must be one of {BATCH_MODES}, got: {batch_mode}")
+
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_mode = batch_mode
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+        # Cache namespace: vectors from different models must never mix
+        self.model = model or self.url
+        # None = not probed yet (auto mode)
+        self._batch_supported: Optional[bool] = {"on": True, "off": False}.get(batch_mode)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="embedding-client")
+
+        self._async_client = None
+        self._async_loop = None
+        self._async_semaphore = None
+
+        self._lock = threading.Lock()
+        self._stats = {"texts": 0, "requests": 0, "batched_requests": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Sync interface
+    # ------------------------------------------------------------------
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts concurrently over the pooled session; order is preserved."""
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        if not texts:
+            return []
+        if self.cache is None:
+            return self._fetch(texts)
+
+        results = self.cache.get_many(self.model, texts)
+        missing = self._misses(texts, results)
+        if missing:
+            return self._fill(texts, results, missing, self._fetch(missing))
+        return results
+
+    def _fetch(self, texts: List[str]) -> List[List[float]]:
+        self._count("texts", len(texts))
+
+        if len(texts) > 1 and self._batch_supported is not False:
+            groups = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+            if self._batch_supported is None:
+                # Probe with the first group before fanning out
+                first = self._probe_batch(groups[0])
+                if first is not None:
+                    return first + self._map(self._embed_batch, groups[1:])
+            else:
+                return self._map(self._embed_batch, groups)
+
+        return self._map(self._embed_batch, [[t] for t in texts])
+
+    def _map(self, fn, groups: List[List[str]]) -> List[List[float]]:
+        if len(groups) == 1:
+            return fn(groups[0])
+        results: List[List[float]] = []
+        for vectors in self._executor.map(fn, groups):
+            results.extend(vectors)
+        return results
+
+    def _probe_batch(self, group: List[str]) -> Optional[List[List[float]]]:
+        try:
+            vectors = self._embed_batch(group)
+        except Exception as e:
+            print(f"[EmbeddingClient] Batched request not supported by {self.url}, using per-text requests: {e}")
+            vectors = None
+        self._batch_supported = vectors is not None
+        return vectors
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        batched = len(texts) > 1
+        payload = {"data": [texts]} if batched else {"data": [texts[0]]}
+        try:
+            resp = self.session.post(self.url, json=payload, timeout=self.timeout)
+            resp.raise_for_status()
+            data = resp.json()
+            self._count("batched_requests" if batched else "requests")
+
+            vectors = self._result_from_post(data)
+            if vectors is None:
+                with self.session.get(f"{self.url}/{data['event_id']}", stream=True, timeout=self.timeout) as r:
+                    r.raise_for_status()
+                    vectors = self._result_from_stream(r.iter_lines(decode_unicode=True))
+            return self._check(vectors, len(texts))
+        except Exception:
+            self._count("errors")
+            raise
+
+    # ------------------------------------------------------------------
+    # Async interface
+    # ------------------------------------------------------------------
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """Async counterpart of embed() using a pooled httpx.AsyncClient."""
+        if isinstance(texts, str):
+            texts = [texts]
+        texts = list(texts)
+        if not texts:
+            return []
+        if httpx is None:
+            # No async HTTP client available: run the sync path off the loop
+            return await asyncio.get_running_loop().run_in_executor(None, self.embed, texts)
+        if self.cache is None:
+            return await self._afetch(texts)
+
+        results = self.cache.get_many(self.model, texts)
+        missing = self._misses(texts, results)
+        if missing:
+            return self._fill(texts, results, missing, await self._afetch(missing))
+        return results
+
+    async def _afetch(self, texts: List[str]) -> List[List[float]]:
+        self._count("texts", len(texts))
+
+        if len(texts) > 1 and self._batch_supported is not False:
+            groups = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+            if self._batch_supported is None:
+                try:
+                    first = await self._aembed_batch(groups[0])
+                except Exception as e:
+                    print(f"[EmbeddingClient] Batched request not supported by {self.url}, using per-text requests: {e}")
+                    first = None
+                self._batch_supported = first is not None
+                if first is not None:
+                    rest = await asyncio.gather(*(self._aembed_batch(g) for g in groups[1:]))
+                    return first + [v for vectors in rest for v in vectors]
+            else:
+                results = await asyncio.gather(*(self._aembed_batch(g) for g in groups))
+                return [v for vectors in results for v in vectors]
+
+        results = await asyncio.gather(*(self._aembed_batch([t]) for t in texts))
+        return [vectors[0] for vectors in results]
+
+    def _get_async_client(self):
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            # httpx clients and semaphores are bound to the loop they were created on
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+            )
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+        return self._async_client, self._async_semaphore
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        client, semaphore = self._get_async_client()
+        batched = len(texts) > 1
+        payload = {"data": [texts]} if batched else {"data": [texts[0]]}
+        async with semaphore:
+            try:
+                resp = await client.post(self.url, json=payload)
+                resp.raise_for_status()
+                data = resp.json()
+                self._count("batched_requests" if batched else "requests")
+
+                vectors = self._result_from_post(data)
+                if vectors is None:
+                    async with client.stream("GET", f"{self.url}/{data['event_id']}") as r:
+                        r.raise_for_status()
+                        lines = [line async for line in r.aiter_lines()]
+                    vectors = self._result_from_stream(lines)
+                return self._check(vectors, len(texts))
+            except Exception:
+                self._count("errors")
+                raise
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _misses(texts: List[str], results: List[Optional[List[float]]]) -> List[str]:
+        # Unique uncached texts, so duplicates in one call are fetched once
+        return list(dict.fromkeys(t for t, v in zip(texts, results) if v is None))
+
+    def _fill(self, texts: List[str], results: List[Optional[List[float]]], missing: List[str],
+              fetched: List[List[float]]) -> List[List[float]]:
+        self.cache.put_many(self.model, missing, fetched)
+        by_text = dict(zip(missing, fetched))
+        return [by_text[t] if v is None else v for t, v in zip(texts, results)]
+
+    @staticmethod
+    def _result_from_post(data: Dict[str, Any]) -> Optional[List[List[float]]]:
+        """Embeddings returned inline by the POST, or None if an event_id must be streamed."""
+        if isinstance(data, dict) and (data.get("event_id") or data.get("hash")):
+            data.setdefault("event_id", data.get("hash"))
+            return None
+        vectors = _parse_embeddings(data)
+        if vectors is None:
+            raise ValueError("No event_id returned by remote embedding API")
+        return vectors
+
+    @staticmethod
+    def _result_from_stream(lines) -> List[List[float]]:
+        event = None
+        for line in lines:
+            if not line:
+                continue
+            line = line.strip()
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                if event == "error":
+                    raise RuntimeError(f"Embedding service error: {line[len('data:'):].strip()}")
+                vectors = _parse_embeddings(_parse_data_line(line))
+                if vectors is not None:
+                    return vectors
+        raise RuntimeError("Embedding stream ended without result")
+
+    @staticmethod
+    def _check(vectors: Optional[List[List[float]]], expected: int) -> List[List[float]]:
+        if vectors is None or len(vectors) != expected:
+            got = 0 if vectors is None else len(vectors)
+            raise ValueError(f"Embedding count mismatch: {got} vs {expected}")
+        return vectors
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "max_concurrency": self.max_concurrency,
+                    "batch_supported": self._batch_supported}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+_clients: Dict[str, RemoteEmbeddingClient] = {}
+_clients_lock = threading.Lock()
+_cache: Optional[EmbeddingCache] = None
+
+
+def _shared_cache() -> Optional[EmbeddingCache]:
+    # Called with _clients_lock held
+    global _cache
+    if _cache is None and os.getenv("EMBEDDING_CACHE", "on").lower() not in ("off", "false", "0", "no"):
+        try:
+            _cache = EmbeddingCache(
+                path=os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache/embeddings.sqlite3"),
+                max_memory_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "4096")),
+            )
+        except Exception as e:
+            # Fall back to a memory-only cache rather than failing embeddings
+            print(f"[EmbeddingCache] Disk cache unavailable, using memory only: {e}")
+            _cache = EmbeddingCache(path=None)
+    return _cache
+
+
+def get_embedding_stats() -> Dict[str, Any]:
+    """Request and cache metrics for every endpoint client in this process."""
+    with _clients_lock:
+        return {
+            "clients": {url: client.get_stats() for url, client in _clients.items()},
+            "cache": _cache.get_stats() if _cache is not None else None,
+        }
+
+
+def get_embedding_client(url: str) -> RemoteEmbeddingClient:
+    """
+    Process-wide client for an endpoint, so every caller shares one pool.
+    Tuned by REMOTE_EMBEDDING_CONCURRENCY, REMOTE_EMBEDDING_BATCH
+    (auto/on/off) and REMOTE_EMBEDDING_BATCH_SIZE. Results are cached in
+    EMBEDDING_CACHE_PATH (shared by all workers) unless EMBEDDING_CACHE=off.
+    """
+    with _clients_lock:
+        client = _clients.get(url)
+        if client is None:
+            client = RemoteEmbeddingClient(
+                url,
+                timeout=float(os.getenv("REMOTE_EMBEDDING_TIMEOUT", "60")),
+                max_concurrency=int(os.getenv("REMOTE_EMBEDDING_CONCURRENCY", "8")),
+                batch_mode=os.getenv("REMOTE_EMBEDDING_BATCH", "auto").lower(),
+                batch_size=int(os.getenv("REMOTE_EMBEDDING_BATCH_SIZE", "32")),
+                cache=_shared_cache(),
+                model=os.getenv("REMOTE_EMBEDDING_MODEL") or None,
+            )
+            _clients[url] = client
+        return client
@@ -0,0 +1,90 @@
+"""
+Query Complexity Estimation C_q (Section 3.3, Eq. 8) - local, no LLM call
+
+Scores a question in [0, 1] from four surface features: length, named
+entities, temporal expressions, and question words / multi-hop markers.
+HybridRetriever uses the score to send simple lookups straight to hybrid
+search and only plan (and reflect) for complex, multi-hop questions, and
+to size the retrieval depth k_dyn = k_base * (1 + delta * C_q).
+"""
+
+import re
+from typing import Any, Dict, List
+
+
+QUESTION_WORDS = frozenset("what when where who whom whose why how which".split())
+
+# Words that signal comparison, causality, aggregation or event ordering
+MULTI_HOP_MARKERS = frozenset(
+    "why compare compared comparison difference different between both relationship related "
+    "because cause caused affect affected before after since until first last changed change "
+    "each every all total overall common together versus vs".split()
+)
+MULTI_HOP_PHRASES = ("how many", "how often", "how long", "in common", "and then", "as well as")
+
+_MONTHS = ("january|february|march|april|may|june|july|august|september|october|november|december|"
+           "jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec")
+_WEEKDAYS = "monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+_TEMPORAL = re.compile(
+    r"\b(?:"
+    rf"{_MONTHS}|{_WEEKDAYS}|"
+    r"yesterday|today|tonight|tomorrow|recently|lately|earlier|later|ago|"
+    r"(?:last|next|this|past|previous)\s+(?:week|month|year|weekend|time|night|morning|day)s?|"
+    r"(?:19|20)\d{2}|\d{1,2}[/-]\d{1,2}(?:[/-]\d{2,4})?|"
+    r"before|after|during|since|until|when"
+    r")\b",
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"[A-Za-z][\w'-]*|\d+")
+_NON_ENTITY = frozenset(_MONTHS.split("|")) | frozenset(_WEEKDAYS.split("|")) | QUESTION_WORDS | {"i"}
+
+
+def _entities(words: List[str]) -> List[str]:
+    """Runs of capitalized words (a leading question word does not count)."""
+    entities, current = [], []
+    for word in words:
+        if word[:1].isupper() and word.lower() not in _NON_ENTITY:
+            current.append(word)
+        elif current:
+            entities.append(" ".join(current))
+            current = []
+    if current:
+        entities.append(" ".join(current))
+    return entities
+
+
+def estimate_query_complexity(query: str) -> Dict[str, Any]:
+    """
+    Local estimate of query complexity C_q.
+
+    Returns {"complexity": float in [0, 1], "features": {...}} where the
+    features are the raw counts behind the score (useful for tuning).
+    """
+    words = _WORD.findall(query)
+    lowered = [w.lower() for w in words]
+    text = " ".join(lowered)
+
+    entities = _entities(words)
+    temporal = len(_TEMPORAL.findall(query))
+    question_words = sum(1 for w in lowered if w in QUESTION_WORDS)
+    markers = sum(1 for w in lowered if w in MULTI_HOP_MARKERS)
+    markers += sum(text.count(p) for p in MULTI_HOP_PHRASES)
+    clauses = max(query.count("?"), 1) + len(re.findall(r",\s*(?:and|but|or)\b", query))
+
+    complexity = (
+        0.25 * min(len(words) / 30.0, 1.0)
+        + 0.25 * min(len(entities) / 3.0, 1.0)
+        + 0.2 * min(temporal / 2.0, 1.0)
+        + 0.3 * min((max(question_words - 1, 0) + markers + clauses - 1) / 2.0, 1.0)
+    )
+    return {
+        "complexity": round(complexity, 3),
+        "features": {
+            "tokens": len(words),
+            "entities": entities,
+            "temporal_expressions": temporal,
+            "question_words": question_words,
+            "multi_hop_markers": markers,
+            "clauses": clauses,
+        },
+    }
@@ -0,0 +1,154 @@
+"""
+Query Plan Cache - Reuse LLM query analysis and planning (Section 3.3)
+
+Caches the outputs of the planning prompts (information requirements,
+targeted sub-queries, query analysis) per normalized query with a TTL.
+On an exact miss, an optional near-duplicate lookup compares query
+embeddings; a paraphrase only matches if it names the same people,
+places and numbers, so "what did Alice say" never reuses Bob's plan.
+"""
+
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+_WORD = re.compile(r"\w+")
+
+# Capitalized only because they start the question
+_LEADING_WORDS = frozenset(
+    "what when where who whom whose why how which did does do is are was were can could "
+    "should would will has have had tell list give show find i the a an in on at".split()
+)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return " ".join(query.split()).lower().rstrip("?!. ")
+
+
+def anchor_terms(query: str) -> FrozenSet[str]:
+    """Capitalized words and numbers: the names a paraphrase must keep."""
+    words = _WORD.findall(re.sub(r"'s\b", "", query))
+    anchors = {w.lower() for w in words if w[:1].isupper()}
+    if words and words[0].lower() in _LEADING_WORDS:
+        anchors.discard(words[0].lower())
+    anchors.update(w for w in words if any(c.isdigit() for c in w))
+    return frozenset(anchors)
+
+
+class QueryPlanCache:
+    """Thread-safe TTL cache of planning results, with optional embedding matching."""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1024, similarity_threshold: float = 0.0):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        # (scope, kind, normalized query) -> (expires_at, value, query, anchors, unit vector or None)
+        self._entries: "OrderedDict[Tuple[Hashable, str, str], Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        kind: str,
+        query: str,
+        compute: Callable[[], Any],
+        scope: Hashable = None,
+        embed: Optional[Callable[[str], Any]] = None,
+        rebase: Optional[Callable[[Any, str], Any]] = None,
+    ) -> Any:
+        """
+        Cached value for (scope, kind, query), else compute() and store it.
+
+        Exceptions from compute() propagate and nothing is cached. embed maps
+        a query to a vector for near-duplicate matching; rebase(value,
+        cached_query) adapts a value taken from a paraphrased query.
+        """
+        key = (scope, kind, normalize_query(query))
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(item[1])
+
+        vector = None
+        if embed is not None and self.similarity_threshold > 0:
+            vector = self._unit_vector(embed, query)
+            if vector is not None:
+                near = self._nearest(scope, kind, query, vector, now)
+                if near is not None:
+                    value, cached_query = near
+                    value = rebase(value, cached_query) if rebase else value
+                    # Remember the paraphrase itself so a repeat is an exact hit
+                    self._store(key, query, value, vector, now)
+                    return value
+
+        with self._lock:
+            self.misses += 1
+        value = compute()
+        self._store(key, query, value, vector, now)
+        return value
+
+    def _store(self, key: Tuple, query: str, value: Any, vector: Optional[np.ndarray], now: float):
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, copy.deepcopy(value), query, anchor_terms(query), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _unit_vector(self, embed: Callable[[str], Any], query: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(embed(query), dtype=np.float32).ravel()
+        except Exception as e:
+            print(f"[QueryPlanCache] Embedding failed, exact match only: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def _nearest(self, scope: Hashable, kind: str, query: str, vector: np.ndarray,
+                 now: float) -> Optional[Tuple[Any, str]]:
+        anchors = anchor_terms(query)
+        with self._lock:
+            expired = [k for k, item in self._entries.items() if item[0] <= now]
+            for k in expired:
+                del self._entries[k]
+            candidates = [
+                (k, item) for k, item in self._entries.items()
+                if k[0] == scope and k[1] == kind and item[4] is not None
+                and item[3] == anchors and item[4].shape == vector.shape
+            ]
+            if not candidates:
+                return None
+            scores = np.stack([item[4] for _, item in candidates]) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None
+            key, item = candidates[best]
+            self._entries.move_to_end(key)
+            self.near_hits += 1
+            return copy.deepcopy(item[1]), item[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,334 @@
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# MemoryStore imports the Supabase client at module level
+sys.modules.setdefault('supabase', MagicMock())
+
+from gitmem.core.context_service import UnifiedContextService
+from gitmem.core import manhattan_client
+from gitmem.core.context_cache import AgentContextCache
+from gitmem.core.event_bus import EventBus, EventType
+from gitmem.core.stats_counters import StatsCounters
+from gitmem.core.local_index import LocalAgentIndex
+from gitmem.core.memory_store import MemoryStore
+from gitmem.core.models import MemoryItem
+
+
+class TestUnifiedContextFanOut(unittest.TestCase):
+    def setUp(self):
+        self.store = MagicMock()
+        self.store.root_path = tempfile.mkdtemp()
+        self.store.list_memories.return_value = []
+        self.vector = MagicMock()
+        self.service = UnifiedContextService(
+            self.store, self.vector, supabase_connector=None,
+            source_timeouts={"chromadb": 0.2, "mcp": 0.2, "local": 0.2},
+            context_deadline=0.5
+        )
+
+    def test_slow_source_is_reported_late(self):
+        def slow_vectors(agent_id, limit=100):
+            time.sleep(1.0)
+            return []
+
+        self.vector.get_agent_vectors.side_effect = slow_vectors
+        self.service._fetch_mcp_context = MagicMock(return_value=[])
+
+        started = time.monotonic()
+        context = self.service.get_agent_context("agent_a")
+        elapsed = time.monotonic() - started
+
+        report = context["_fetch_report"]
+        self.assertLess(elapsed, 0.9)
+        self.assertIn("chromadb", report["late"])
+        self.assertIn("supabase", report["skipped"])
+        self.assertIn("local", report["ok"])
+
+    def test_merge_keeps_priority_on_duplicate_ids(self):
+        self.vector.get_agent_vectors.return_value = [
+            {"id": "m1", "content": "from chroma", "metadata": {"memory_type": "semantic"}}
+        ]
+        self.vector.categorize_vectors.side_effect = lambda v: {
+            "episodic": [], "semantic": [dict(id="m1", content="from chroma", source="chromadb")],
+            "procedural": [], "working": [], "vectors": [dict(id="m1", content="from chroma", source="chromadb")]
+        }
+        self.service._fetch_mcp_context = MagicMock(return_value=[
+            ("m1", [("mcp", {"id": "m1", "source": "mcp"})]),
+            ("m2", [("mcp", {"id": "m2", "source": "mcp"}), ("working", {"id": "m2", "source": "mcp"})])
+        ])
+
+        context = self.service.get_agent_context("agent_a")
+
+        self.assertEqual([m["source"] for m in context["semantic"]], ["chromadb"])
+        self.assertEqual(context["vectors"], [])
+        self.assertEqual([m["id"] for m in context["mcp"]], ["m2"])
+        self.assertEqual([m["id"] for m in context["working"]], ["m2"])
+
+    def test_folder_structure_reads_source_counts_from_rollups(self):
+        db = MagicMock()
+        db.client.table.side_effect = Exception("raw scans are not expected for sources")
+        folders = MagicMock()
+        folders.telemetry_counts.return_value = {"api": 7, "webhook": 2, "error": 1}
+        service = UnifiedContextService(self.store, None, supabase_connector=db, folder_manager=folders)
+        service._load_agent_context = MagicMock(return_value={})
+
+        structure = service._load_folder_structure("agent_a")
+        self.assertEqual(structure["sources"]["api"]["count"], 7)
+        self.assertEqual(structure["sources"]["webhooks"]["count"], 2)
+        self.assertEqual(structure["logs"]["errors"]["count"], 1)
+        self.assertEqual(structure["logs"]["access"]["count"], 0)
+        folders.telemetry_counts.assert_called_once()
+
+    def test_folder_count_fallback_ignores_stale_cached_context(self):
+        service = UnifiedContextService(self.store, None, supabase_connector=None, folder_manager=MagicMock())
+        service.cache.get("agent_a", "context", lambda: {"semantic": [{"id": "old"}] * 3})
+        service._load_agent_context = MagicMock(return_value={"semantic": [{"id": "e1"}]})
+
+        structure = service._load_folder_structure("agent_a")
+        self.assertEqual(structure["context"]["semantic"]["count"], 1)
+
+
+class TestManhattanClient(unittest.TestCase):
+    def tearDown(self):
+        sys.modules.pop('api_manhattan', None)
+
+    def test_in_process_adapter_preferred_when_loaded(self):
+        entry = MagicMock(entry_id="e1", lossless_restatement="hello", keywords=[], timestamp=None,
+                          location=None, persons=[], entities=[], topic=None, memory_type="semantic")
+        fake_module = MagicMock()
+        fake_module._list_memory_entries.return_value = [entry]
+        sys.modules['api_manhattan'] = fake_module
+
+        client = manhattan_client.get_manhattan_client()
+        self.assertEqual(client.transport, "in_process")
+
+        results = client.read_memory("agent_a", query="", top_k=10)
+        self.assertEqual(results[0]["entry_id"], "e1")
+        # Listing goes through the read-only path and never creates a system
+        fake_module._list_memory_entries.assert_called_once_with("agent_a", limit=10)
+        fake_module._get_or_create_memory_system.assert_not_called()
+
+    def test_http_client_lists_with_empty_query(self):
+        client = manhattan_client.HttpManhattanClient(base_url="http://manhattan.test", api_key="k")
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"ok": True, "results": [{"entry_id": "e1"}]}
+        client._session.post = MagicMock(return_value=response)
+
+        results = client.read_memory("agent_a", query="", top_k=10)
+
+        self.assertEqual(results, [{"entry_id": "e1"}])
+        sent = client._session.post.call_args.kwargs["json"]
+        self.assertEqual(sent["query"], "")
+
+    def test_context_uses_entry_ids_from_client(self):
+        client = MagicMock()
+        client.read_memory.return_value = [
+            {"entry_id": "e1", "lossless_restatement": "hello", "memory_type": "semantic"}
+        ]
+        store = MagicMock()
+        store.root_path = tempfile.mkdtemp()
+        store.list_memories.return_value = []
+        service = UnifiedContextService(store, None, manhattan_client=client)
+
+        context = service.get_agent_context("agent_a")
+
+        self.assertEqual(context["semantic"][0]["id"], "e1")
+        self.assertEqual(context["semantic"][0]["content"], "hello")
+
+
+class TestAgentContextCache(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus()
+        self.cache = AgentContextCache(max_entries=2)
+        self.cache.attach(self.bus)
+
+    def tearDown(self):
+        for event_type in AgentContextCache.INVALIDATING_EVENTS:
+            self.bus.unsubscribe(event_type, self.cache._on_event)
+
+    def test_idle_agent_served_from_cache(self):
+        loader = MagicMock(return_value={"n": 1})
+        self.cache.get("agent_a", "context", loader)
+        self.cache.get("agent_a", "context", loader)
+        self.assertEqual(loader.call_count, 1)
+
+    def test_event_serves_stale_and_refreshes_in_background(self):
+        values = iter([{"n": 1}, {"n": 2}])
+        loader = MagicMock(side_effect=lambda: next(values))
+        self.cache.get("agent_a", "context", loader)
+
+        self.bus.emit_simple(EventType.MEMORY_ADDED, {"memory_id": "m1"}, agent_id="agent_a")
+        self.assertEqual(self.cache.get("agent_a", "context", loader), {"n": 1})
+
+        self.cache._executor.shutdown(wait=True)
+        self.assertEqual(self.cache.get("agent_a", "context", loader), {"n": 2})
+        self.assertEqual(self.cache.get_stats()["refreshes"], 1)
+
+    def test_other_agents_unaffected_and_size_bounded(self):
+        self.cache.get("agent_a", "context", lambda: "a")
+        self.cache.get("agent_b", "context", lambda: "b")
+        self.bus.emit_simple(EventType.COMMIT_CREATED, {"commit_hash": "c1"}, agent_id="agent_a")
+        self.assertEqual(self.cache.get("agent_b", "context", MagicMock()), "b")
+
+        self.cache.get("agent_c", "context", lambda: "c")
+        self.assertEqual(self.cache.get_stats()["entries"], 2)
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    def test_entries_older_than_max_age_are_refreshed(self):
+        self.cache.max_age = 0.0
+        values = iter([{"n": 1}, {"n": 2}])
+        loader = MagicMock(side_effect=lambda: next(values))
+        self.cache.get("agent_a", "context", loader)
+        time.sleep(0.01)
+
+        self.assertEqual(self.cache.get("agent_a", "context", loader), {"n": 1})
+        self.cache._executor.shutdown(wait=True)
+        self.assertEqual(loader.call_count, 2)
+
+
+class TestWritesInvalidateContextCache(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus()
+        self.cache = AgentContextCache()
+        self.cache.attach(self.bus)
+        with patch("gitmem.core.memory_store.SupabaseConnector"):
+            self.store = MemoryStore(tempfile.mkdtemp())
+        self.store.db.get_memories.return_value = []
+
+    def tearDown(self):
+        for event_type in AgentContextCache.INVALIDATING_EVENTS:
+            self.bus.unsubscribe(event_type, self.cache._on_event)
+        for event_type in (EventType.MEMORY_ADDED, EventType.MEMORY_UPDATED, EventType.MEMORY_DELETED):
+            self.bus.unsubscribe(event_type, self.store.fs._on_event)
+
+    def _assert_write_marks_stale(self, write):
+        self.cache.get("agent_a", "context", lambda: {"n": 1})
+        write()
+        self.cache.get("agent_a", "context", lambda: {"n": 2})
+        self.assertEqual(self.cache.get_stats()["stale_hits"], 1)
+
+    def test_add_memory_invalidates(self):
+        self._assert_write_marks_stale(
+            lambda: self.store.add_memory(MemoryItem(agent_id="agent_a", content="hello"))
+        )
+
+    def test_delete_memory_invalidates(self):
+        self.store.db.delete_memory.return_value = True
+        self._assert_write_marks_stale(lambda: self.store.delete_memory("agent_a", "m1"))
+
+    def test_commit_invalidates(self):
+        self._assert_write_marks_stale(lambda: self.store.commit_state("agent_a", "checkpoint"))
+
+
+class TestStatsCounters(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus()
+        self.truth = {"total_memories": 10, "total_commits": 2, "total_agents": 1,
+                      "active_agents": 0, "agent_ids": ["agent_a"]}
+        self.reconcile = MagicMock(side_effect=lambda: dict(self.truth))
+        self.counters = StatsCounters(self.reconcile, reconcile_interval=3600)
+        self.counters.attach(self.bus)
+
+    def tearDown(self):
+        for event_type in (EventType.MEMORY_ADDED, EventType.MEMORY_DELETED, EventType.COMMIT_CREATED):
+            self.bus.unsubscribe(event_type, self.counters._on_event)
+
+    def test_events_update_counters_without_reconcile(self):
+        self.assertEqual(self.counters.snapshot()["total_memories"], 10)
+
+        self.bus.emit_simple(EventType.MEMORY_ADDED, {"memory_id": "m1"}, agent_id="agent_b")
+        self.bus.emit_simple(EventType.COMMIT_CREATED, {"commit_hash": "c1"}, agent_id="agent_a")
+        stats = self.counters.snapshot()
+
+        self.assertEqual(stats["total_memories"], 11)
+        self.assertEqual(stats["total_commits"], 3)
+        self.assertEqual(stats["total_agents"], 2)
+        self.assertEqual(self.reconcile.call_count, 1)
+
+    def test_reconcile_corrects_drift(self):
+        self.counters.snapshot()
+        self.bus.emit_simple(EventType.MEMORY_ADDED, {"memory_id": "m1"}, agent_id="agent_a")
+        self.truth["total_memories"] = 42
+        self.counters.reconcile()
+        self.assertEqual(self.counters.snapshot()["total_memories"], 42)
+
+    def test_events_during_reconcile_are_kept(self):
+        self.counters.snapshot()
+
+        def reconcile_with_write():
+            # Write lands after the source was read but before reconcile applies
+            truth = dict(self.truth)
+            self.bus.emit_simple(EventType.MEMORY_ADDED, {"memory_id": "m1"}, agent_id="agent_b")
+            return truth
+
+        self.reconcile.side_effect = reconcile_with_write
+        self.counters.reconcile()
+        stats = self.counters.snapshot()
+        self.assertEqual(stats["total_memories"], 11)
+        self.assertEqual(stats["total_agents"], 2)
+
+    def test_concurrent_first_snapshots_reconcile_once(self):
+        def slow_truth():
+            time.sleep(0.1)
+            return dict(self.truth)
+
+        self.reconcile.side_effect = slow_truth
+        threads = [threading.Thread(target=self.counters.snapshot) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.reconcile.call_count, 1)
+
+
+class TestLocalAgentIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for path in ["refs/agents", "memory/episodic", "memory/semantic", "commits"]:
+            os.makedirs(os.path.join(self.root, path))
+        for agent_id in ["agent_a", "agent"]:
+            open(os.path.join(self.root, "refs", "agents", agent_id), "w").close()
+        for fname in ["agent_a_1.json", "agent_a_2.json", "agent_x.json"]:
+            open(os.path.join(self.root, "memory", "episodic", fname), "w").close()
+        self._write_commit("c1", "agent_a", "2026-01-01T10:00:00")
+
+    def _write_commit(self, name, agent_id, timestamp):
+        with open(os.path.join(self.root, "commits", name + ".json"), "w") as f:
+            json.dump({"agent_id": agent_id, "timestamp": timestamp}, f)
+
+    def test_rebuild_counts(self):
+        agents = LocalAgentIndex(self.root).get_agents()
+        self.assertEqual(agents["agent_a"]["memory_count"], 2)
+        self.assertEqual(agents["agent_a"]["commit_count"], 1)
+        self.assertEqual(agents["agent_a"]["last_active"], "2026-01-01T10:00:00")
+        # "agent" is a prefix of both agent_a_* and agent_x files
+        self.assertEqual(agents["agent"]["memory_count"], 3)
+
+    def test_persisted_index_reused_while_unchanged(self):
+        LocalAgentIndex(self.root).get_agents()
+
+        reloaded = LocalAgentIndex(self.root)
+        with patch.object(reloaded, "_rebuild") as rebuild:
+            agents = reloaded.get_agents()
+            rebuild.assert_not_called()
+        self.assertEqual(agents["agent_a"]["commit_count"], 1)
+
+    def test_external_change_triggers_rebuild(self):
+        index = LocalAgentIndex(self.root)
+        index.get_agents()
+        time.sleep(0.01)
+        open(os.path.join(self.root, "refs", "agents", "agent_b"), "w").close()
+        self.assertIn("agent_b", index.get_agents())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from SimpleMem.utils.embedding_client import RemoteEmbeddingClient
+from SimpleMem.utils.embedding_cache import EmbeddingCache
+
+
+def vector_for(text):
+    return [float(len(text)), 1.0]
+
+
+class FakeEndpoint:
+    """Gradio-style call API: POST -> event_id, GET {url}/{event_id} -> SSE lines."""
+
+    def __init__(self, batching=False, delay=0.0):
+        self.batching, self.delay = batching, delay
+        self.events, self.posts = {}, []
+        self.in_flight = self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, **_):
+        arg = json["data"][0]
+        with self.lock:
+            self.posts.append(arg)
+            event_id = f"e{len(self.posts)}"
+            if isinstance(arg, list):
+                # Endpoints without batching treat the list as one input
+                self.events[event_id] = [vector_for(t) for t in arg] if self.batching else [vector_for(str(arg))]
+            else:
+                self.events[event_id] = [vector_for(arg)]
+        resp = MagicMock()
+        resp.json.return_value = {"event_id": event_id}
+        return resp
+
+    def get(self, url, **_):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        vectors = self.events[url.rsplit("/", 1)[1]]
+        payload = [{"dense_embedding": v} for v in vectors]
+        resp = MagicMock()
+        resp.__enter__.return_value = resp
+        resp.iter_lines.return_value = ["event: complete", "data: " + json.dumps(payload)]
+        return resp
+
+
+def make_client(endpoint, **kwargs):
+    client = RemoteEmbeddingClient("https://embed.example/call/embed_dense", **kwargs)
+    client.session = endpoint
+    return client
+
+
+class TestRemoteEmbeddingClient(unittest.TestCase):
+    def test_per_text_requests_run_concurrently_in_order(self):
+        endpoint = FakeEndpoint(delay=0.05)
+        client = make_client(endpoint, max_concurrency=4, batch_mode="off")
+        texts = [f"text {'x' * i}" for i in range(12)]
+
+        self.assertEqual(client.embed(texts), [vector_for(t) for t in texts])
+        self.assertEqual(endpoint.max_in_flight, 4)
+
+    def test_auto_mode_probes_then_falls_back(self):
+        endpoint = FakeEndpoint(batching=False)
+        client = make_client(endpoint, batch_mode="auto")
+        texts = ["a", "bb", "ccc"]
+
+        self.assertEqual(client.embed(texts), [vector_for(t) for t in texts])
+        self.assertFalse(client.get_stats()["batch_supported"])
+        # One failed probe, then one request per text; later calls skip the probe
+        client.embed(texts)
+        self.assertEqual(len(endpoint.posts), 1 + 3 + 3)
+
+    def test_native_batching_and_async(self):
+        endpoint = FakeEndpoint(batching=True)
+        client = make_client(endpoint, batch_mode="auto", batch_size=2)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        self.assertEqual(client.embed(texts), [vector_for(t) for t in texts])
+        self.assertEqual(len(endpoint.posts), 3)
+        self.assertTrue(client.get_stats()["batch_supported"])
+
+        client._aembed_batch = MagicMock(side_effect=lambda group: asyncio.sleep(0, [vector_for(t) for t in group]))
+        self.assertEqual(asyncio.run(client.aembed(texts)), [vector_for(t) for t in texts])
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "embeddings.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_repeat_embeddings_skip_the_network(self):
+        endpoint = FakeEndpoint()
+        client = make_client(endpoint, batch_mode="off", cache=EmbeddingCache(self.path))
+
+        first = client.embed(["a", "bb", "a"])
+        self.assertEqual(len(endpoint.posts), 2)  # duplicate fetched once
+        again = client.embed(["bb", "ccc", "a"])
+        np.testing.assert_allclose(again, [vector_for("bb"), vector_for("ccc"), vector_for("a")], rtol=1e-6)
+        self.assertEqual(len(endpoint.posts), 3)
+        self.assertEqual(first, [vector_for("a"), vector_for("bb"), vector_for("a")])
+
+    def test_disk_tier_is_shared_and_namespaced_by_model(self):
+        EmbeddingCache(self.path).put_many("m1", ["hello"], [[3.0, 4.0]])
+
+        # A second process (fresh memory tier) reads the vector back from disk
+        other = EmbeddingCache(self.path)
+        hit, miss = other.get_many("m1", ["hello", "missing"])
+        np.testing.assert_allclose(hit, [3.0, 4.0], rtol=1e-6)
+        self.assertIsNone(miss)
+        self.assertEqual(other.get_many("m2", ["hello"]), [None])
+        other.get_many("m1", ["hello"])
+
+        stats = other.get_stats()
+        self.assertEqual((stats["disk_hits"], stats["memory_hits"], stats["misses"]), (1, 1, 2))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys
+import os
+import threading
+import unittest
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from SimpleMem.database.entry_cache import EntryCache, estimate_size
+from SimpleMem.models.memory_entry import MemoryEntry
+
+
+def entry(entry_id, text="Alice met Bob in Shanghai."):
+    return MemoryEntry(entry_id=entry_id, lossless_restatement=text, persons=["Alice", "Bob"])
+
+
+class TestEntryCache(unittest.TestCase):
+    def test_keys_are_scoped_per_agent(self):
+        cache = EntryCache()
+        cache.put("agent_a", "e1", entry("e1"))
+
+        self.assertEqual(cache.get("agent_a", "e1").entry_id, "e1")
+        self.assertIsNone(cache.get("agent_b", "e1"))
+        self.assertEqual(cache.invalidate_agent("agent_b"), 0)
+        self.assertEqual(cache.invalidate_agent("agent_a"), 1)
+        self.assertIsNone(cache.get("agent_a", "e1"))
+
+    def test_lru_eviction_respects_byte_budget(self):
+        size = estimate_size(entry("e0"))
+        cache = EntryCache(max_bytes=size * 3)
+        for i in range(3):
+            cache.put("agent", f"e{i}", entry(f"e{i}"))
+
+        cache.get("agent", "e0")  # e0 becomes most recently used
+        cache.put("agent", "e3", entry("e3"))
+        self.assertIsNone(cache.get("agent", "e1"))
+        self.assertIsNotNone(cache.get("agent", "e0"))
+
+        # A much larger entry pushes out several small ones
+        cache.put("agent", "big", entry("big", "x" * (size * 2)))
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(stats["evictions"], 4)
+
+    def test_invalidate_and_stats(self):
+        cache = EntryCache()
+        cache.put("agent", "e1", entry("e1"))
+        cache.put("agent", "e1", entry("e1", "Updated restatement."))
+        self.assertEqual(cache.get("agent", "e1").lossless_restatement, "Updated restatement.")
+
+        self.assertTrue(cache.invalidate("agent", "e1"))
+        self.assertFalse(cache.invalidate("agent", "e1"))
+        self.assertIsNone(cache.get("agent", "e1"))
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["bytes"]), (1, 1, 0))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_concurrent_access(self):
+        cache = EntryCache(max_bytes=estimate_size(entry("e0")) * 50)
+
+        def worker(n):
+            for i in range(200):
+                cache.put(f"agent{n}", f"e{i}", entry(f"e{i}"))
+                cache.get(f"agent{n}", f"e{i // 2}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+        self.assertEqual(stats["hits"] + stats["misses"], 800)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import json
+import unittest
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from SimpleMem.models.entry_record import EntryRecord
+from SimpleMem.models.memory_entry import MemoryEntry
+
+
+METADATA = {
+    "entry_id": "e1",
+    "timestamp": "2025-11-15T14:30:00",
+    "location": "Starbucks, Shanghai",
+    "topic": "Product marketing",
+    "memory_type": "episodic",
+    "keywords_json": json.dumps(["marketing", "product XYZ"]),
+    "persons_json": json.dumps(["Alice", "Bob"]),
+}
+DOCUMENT = "Content: Alice discussed product XYZ with Bob.\nKeywords: marketing, product XYZ"
+
+
+class TestEntryRecord(unittest.TestCase):
+    def test_list_fields_decode_lazily(self):
+        record = EntryRecord.from_metadata(METADATA, DOCUMENT)
+        self.assertEqual(record.lossless_restatement, "Alice discussed product XYZ with Bob.")
+        self.assertIsInstance(record._persons, str)
+
+        self.assertEqual(record.persons, ["Alice", "Bob"])
+        self.assertIsInstance(record._persons, list)
+        self.assertEqual(record.entities, [])
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_round_trips_to_memory_entry(self):
+        entry = EntryRecord.from_metadata(METADATA, DOCUMENT).to_entry()
+        self.assertIsInstance(entry, MemoryEntry)
+        self.assertEqual(entry.keywords, ["marketing", "product XYZ"])
+        self.assertEqual(entry.location, "Starbucks, Shanghai")
+
+        again = EntryRecord.from_entry(entry)
+        self.assertEqual(again.to_dict(), entry.model_dump())
+        self.assertEqual(EntryRecord.from_dict(again.to_dict()).to_entry(), entry)
+
+
+if __name__ == '__main__':
+    unittest.main()
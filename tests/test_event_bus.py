@@ -0,0 +1,199 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gitmem.core.event_bus import EventBus, Event, EventType
+from gitmem.core.event_dispatcher import EventDispatcher
+from gitmem.core.broadcast_coalescer import BroadcastCoalescer
+
+
+def make_bus():
+    """Fresh EventBus, bypassing the process-wide singleton."""
+    bus = object.__new__(EventBus)
+    bus._initialized = False
+    EventBus.__init__(bus)
+    return bus
+
+
+def event(agent_id="agent_a", event_type=EventType.MEMORY_ADDED, **data):
+    return Event(type=event_type, data=data, agent_id=agent_id)
+
+
+class TestAsyncDispatch(unittest.TestCase):
+    def test_emit_does_not_wait_for_listeners(self):
+        bus = make_bus()
+        bus.enable_async_dispatch(tick=0.0)
+        seen = []
+
+        def slow_listener(e):
+            time.sleep(0.2)
+            seen.append(e.data["n"])
+
+        bus.subscribe(EventType.MEMORY_ADDED, slow_listener)
+        started = time.monotonic()
+        bus.emit_simple(EventType.MEMORY_ADDED, {"n": 1}, agent_id="agent_a")
+        self.assertLess(time.monotonic() - started, 0.1)
+
+        self.assertTrue(bus.flush(timeout=2))
+        self.assertEqual(seen, [1])
+        stats = bus.get_dispatch_stats()
+        self.assertEqual(stats["mode"], "async")
+        timing = next(v for k, v in stats["listeners"].items() if "slow_listener" in k)
+        self.assertEqual(timing["calls"], 1)
+        self.assertGreaterEqual(timing["max_ms"], 150)
+
+    def test_drop_oldest(self):
+        delivered = []
+        dispatcher = EventDispatcher(lambda e: delivered.append(e.data["n"]), max_queue=2,
+                                     overflow="drop_oldest", tick=0.0, spawn=lambda target: None)
+        for n in range(3):
+            dispatcher.submit(event(n=n))
+        threading.Thread(target=dispatcher._run, daemon=True).start()
+
+        self.assertTrue(dispatcher.flush(timeout=2))
+        self.assertEqual(delivered, [1, 2])
+        self.assertEqual(dispatcher.get_stats()["dropped"], 1)
+
+    def test_coalesce_replaces_same_agent_and_type(self):
+        delivered = []
+        dispatcher = EventDispatcher(lambda e: delivered.append((e.agent_id, e.data["n"])), max_queue=2,
+                                     overflow="coalesce", tick=0.0, spawn=lambda target: None)
+        dispatcher.submit(event("a", n=1))
+        dispatcher.submit(event("b", n=2))
+        dispatcher.submit(event("a", n=3))
+        threading.Thread(target=dispatcher._run, daemon=True).start()
+
+        self.assertTrue(dispatcher.flush(timeout=2))
+        self.assertEqual(delivered, [("a", 3), ("b", 2)])
+        self.assertEqual(dispatcher.get_stats()["coalesced"], 1)
+
+    def test_block_waits_for_room(self):
+        delivered = []
+        dispatcher = EventDispatcher(lambda e: delivered.append(e.data["n"]), max_queue=1,
+                                     overflow="block", tick=0.0, spawn=lambda target: None)
+        dispatcher.submit(event(n=1))
+
+        producer = threading.Thread(target=dispatcher.submit, args=(event(n=2),), daemon=True)
+        producer.start()
+        producer.join(0.1)
+        self.assertTrue(producer.is_alive())
+
+        threading.Thread(target=dispatcher._run, daemon=True).start()
+        producer.join(2)
+        self.assertTrue(dispatcher.flush(timeout=2))
+        self.assertEqual(delivered, [1, 2])
+
+    def test_close_drains_and_stops_worker(self):
+        delivered = []
+        workers = []
+
+        def spawn(target):
+            workers.append(threading.Thread(target=target, daemon=True))
+            workers[-1].start()
+
+        dispatcher = EventDispatcher(lambda e: delivered.append(e.data["n"]), tick=0.0, spawn=spawn)
+        dispatcher.submit(event(n=1))
+        self.assertTrue(dispatcher.close(timeout=2))
+        workers[0].join(2)
+        self.assertFalse(workers[0].is_alive())
+
+        # Late producers are delivered inline instead of queued for a dead worker
+        dispatcher.submit(event(n=2))
+        self.assertEqual(delivered, [1, 2])
+
+    def test_reenabling_async_dispatch_stops_previous_worker(self):
+        bus = make_bus()
+        bus.enable_async_dispatch(tick=0.0)
+        bus.emit(event(n=1))
+        previous = bus._dispatcher
+        bus.enable_async_dispatch(tick=0.0)
+
+        self.assertTrue(previous._worker_stopped)
+        bus.disable_async_dispatch(timeout=2)
+
+
+class TestResumableEventStreams(unittest.TestCase):
+    def test_since_seq_returns_only_the_gap(self):
+        bus = make_bus()
+        for n in range(5):
+            bus.emit(event("a" if n % 2 == 0 else "b", n=n))
+
+        events, resync = bus.get_events_since(2)
+        self.assertFalse(resync)
+        self.assertEqual([e.seq for e in events], [3, 4, 5])
+
+        events, resync = bus.get_events_since(1, agent_id="a")
+        self.assertFalse(resync)
+        self.assertEqual([e.data["n"] for e in events], [2, 4])
+        self.assertEqual(events[-1].to_dict()["seq"], 5)
+
+    def test_evicted_gap_requires_resync(self):
+        bus = make_bus()
+        bus._max_agent_history = 3
+        for n in range(5):
+            bus.emit(event("a", n=n))
+
+        self.assertEqual([e.seq for e in bus.get_events_since(2, agent_id="a")[0]], [3, 4, 5])
+        self.assertEqual(bus.get_events_since(1, agent_id="a"), ([], True))
+        # Sequence restarted (e.g. server restart) also forces a resync
+        self.assertEqual(bus.get_events_since(99), ([], True))
+
+
+class TestBroadcastCoalescer(unittest.TestCase):
+    def make(self):
+        emit = MagicMock()
+        return BroadcastCoalescer(emit, flush_interval=60, spawn=lambda target: None), emit
+
+    def test_burst_becomes_one_batched_frame_per_room(self):
+        coalescer, emit = self.make()
+        for n in range(500):
+            coalescer.publish("agent:a", "memory:added", {"n": n})
+        coalescer.publish("agent:a", "commit:created", {"hash": "abc"})
+        coalescer.publish("agent:b", "memory:added", {"n": 0})
+        coalescer.flush()
+
+        self.assertEqual(emit.call_count, 2)
+        frames = {c.kwargs["room"]: c.args for c in emit.call_args_list}
+        name, batch = frames["agent:a"]
+        self.assertEqual(name, "gitmem_batch")
+        self.assertEqual(batch["total"], 501)
+        self.assertEqual(batch["events"][0]["count"], 500)
+        self.assertEqual(batch["events"][0]["latest"], {"n": 499})
+        # A lone event keeps its original frame
+        self.assertEqual(frames["agent:b"], ("memory:added", {"n": 0}))
+
+    def test_stats_are_delta_encoded(self):
+        coalescer, emit = self.make()
+        coalescer.publish_stats("gitmem_global", {"total_memories": 1, "agent_count": 2})
+        coalescer.flush()
+        coalescer.publish_stats("gitmem_global", {"total_memories": 5, "agent_count": 2})
+        coalescer.publish_stats("gitmem_global", {"total_memories": 7, "agent_count": 2})
+        coalescer.flush()
+        coalescer.publish_stats("gitmem_global", {"total_memories": 7, "agent_count": 2})
+        coalescer.flush()
+
+        frames = [c.args[1] for c in emit.call_args_list]
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(frames[0], {"total_memories": 1, "agent_count": 2, "_delta": False, "_version": 1})
+        self.assertEqual(frames[1], {"total_memories": 7, "_delta": True, "_version": 2})
+
+    def test_late_joiner_gets_full_snapshot(self):
+        coalescer, emit = self.make()
+        self.assertIsNone(coalescer.stats_snapshot("gitmem_global"))
+        coalescer.publish_stats("gitmem_global", {"total_memories": 1, "agent_count": 2})
+        coalescer.flush()
+        coalescer.publish_stats("gitmem_global", {"total_memories": 5, "agent_count": 2})
+        coalescer.flush()
+
+        self.assertEqual(coalescer.stats_snapshot("gitmem_global"),
+                         {"total_memories": 5, "agent_count": 2, "_delta": False, "_version": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gitmem.core.file_system import FileSystem
+
+
+def make_rows(n):
+    # Newest first, like the connector's default ordering
+    return [{"id": f"m{i:05d}", "created_at": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}", "content": "x"}
+            for i in reversed(range(n))]
+
+
+def fake_get_memories(rows):
+    def get_memories(agent_id, mtype, limit=50, after=None, ascending=False):
+        ordered = sorted(rows, key=lambda r: (r["created_at"], r["id"]), reverse=not ascending)
+        if after:
+            key = (after["created_at"], after["id"])
+            ordered = [r for r in ordered
+                       if ((r["created_at"], r["id"]) > key if ascending else (r["created_at"], r["id"]) < key)]
+        return ordered[:limit]
+    return MagicMock(side_effect=get_memories)
+
+
+class TestPaginatedListing(unittest.TestCase):
+    def setUp(self):
+        self.store = MagicMock()
+        self.store.db.get_memories = fake_get_memories(make_rows(250))
+        self.fs = FileSystem(self.store, event_bus=MagicMock())
+
+    def test_cursor_walks_every_entry_once(self):
+        seen, cursor = [], None
+        while True:
+            page = self.fs.list_dir_page("agent_a", "context/episodic", limit=100, cursor=cursor)
+            seen.extend(node["id"] for node in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 250)
+        self.assertEqual(len(set(seen)), 250)
+        self.assertEqual(seen[0], "m00249")
+        # Each backend call asks for one page (+1 to detect the next page)
+        self.assertTrue(all(c.kwargs["limit"] == 101 for c in self.store.db.get_memories.call_args_list))
+
+    def test_pages_are_cached_until_directory_changes(self):
+        self.fs.list_dir("agent_a", "context/episodic")
+        self.fs.list_dir("agent_a", "context_store/episodic")
+        self.assertEqual(self.store.db.get_memories.call_count, 1)
+
+        self.fs.invalidate("agent_a", "context/episodic")
+        self.fs.list_dir("agent_a", "context/episodic")
+        self.assertEqual(self.store.db.get_memories.call_count, 2)
+
+    def test_cursor_is_bound_to_its_listing(self):
+        cursor = self.fs.list_dir_page("agent_a", "context/episodic", limit=10)["next_cursor"]
+        with self.assertRaises(ValueError):
+            self.fs.list_dir_page("agent_a", "context/semantic", cursor=cursor)
+        with self.assertRaises(ValueError):
+            self.fs.list_dir_page("agent_a", "context/episodic", cursor="not-a-cursor")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import sys
+import os
+import random
+import unittest
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gitmem.core.folder_manager import FolderManager, Document, APILog
+from gitmem.core.chunk_store import chunk_text
+
+
+class FakeQuery:
+    """Just enough of the PostgREST query builder for FolderManager."""
+
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        self.filters, self.op, self.payload, self.n = [], "select", None, None
+
+    def select(self, *_, **__): return self
+    def order(self, *_, **__): return self
+    def eq(self, col, val): self.filters.append(lambda r: r.get(col) == val); return self
+    def in_(self, col, vals): self.filters.append(lambda r: r.get(col) in vals); return self
+    def overlaps(self, col, vals): self.filters.append(lambda r: bool(set(r.get(col) or []) & set(vals))); return self
+    def limit(self, n): self.n = n; return self
+    def insert(self, rows): self.op, self.payload = "insert", rows; return self
+    def upsert(self, rows, **_): self.op, self.payload = "upsert", rows; return self
+    def delete(self): self.op = "delete"; return self
+
+    def execute(self):
+        rows = self.db.tables.setdefault(self.table, [])
+        if self.op in ("insert", "upsert"):
+            new = self.payload if isinstance(self.payload, list) else [self.payload]
+            rows.extend(dict(r) for r in new)
+            self.db.writes.append((self.table, len(new)))
+            return type("Res", (), {"data": new})
+        if self.op == "delete":
+            deleted = [r for r in rows if all(f(r) for f in self.filters)]
+            rows[:] = [r for r in rows if r not in deleted]
+            return type("Res", (), {"data": deleted})
+        data = [dict(r) for r in rows if all(f(r) for f in self.filters)]
+        return type("Res", (), {"data": data[:self.n] if self.n else data, "count": len(data)})
+
+
+class FakeDB:
+    def __init__(self):
+        self.tables, self.writes = {}, []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def random_text(n, seed):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(["alpha", "beta", "gamma", "delta", "memory", "agent"]) for _ in range(n))
+
+
+class TestChunkedDocuments(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDB()
+        self.fm = FolderManager(supabase_client=self.db, tenant_id="t1")
+        self.content = random_text(20000, seed=1)
+
+    def test_round_trip_and_streaming(self):
+        doc_id = self.fm.add_document(Document(agent_id="a", filename="f.txt", content=self.content))
+
+        stored = self.db.tables["gitmem_documents"][0]
+        self.assertEqual(stored["content"], "")
+        self.assertGreater(len(stored["chunk_manifest"]), 1)
+
+        self.assertEqual(self.fm.get_documents("a")[0]["content"], self.content)
+        self.assertEqual("".join(self.fm.stream_document("a", doc_id)), self.content)
+
+    def test_duplicates_are_shared_across_agents(self):
+        self.fm.add_document(Document(agent_id="a", filename="f.txt", content=self.content))
+        chunk_count = len(self.db.tables["gitmem_document_chunks"])
+
+        self.fm.add_document(Document(agent_id="b", filename="f.txt", content=self.content))
+        self.assertEqual(len(self.db.tables["gitmem_document_chunks"]), chunk_count)
+
+        # A local edit only adds the chunks around it
+        edited = self.content[:50000] + " inserted paragraph " + self.content[50000:]
+        self.fm.add_document(Document(agent_id="b", filename="g.txt", content=edited))
+        added = len(self.db.tables["gitmem_document_chunks"]) - chunk_count
+        self.assertLessEqual(added, 2)
+        self.assertEqual(self.fm.get_documents("b")[0]["content"], self.content)
+
+    def test_caller_document_is_not_modified(self):
+        doc = Document(agent_id="a", filename="f.txt", content=self.content)
+        self.db.table = lambda name: (_ for _ in ()).throw(RuntimeError("down")) \
+            if name == "gitmem_documents" else FakeQuery(self.db, name)
+
+        self.fm.add_document(doc)
+
+        self.assertEqual(doc.content, self.content)
+        self.assertEqual(doc.chunk_manifest, [])
+
+    def test_delete_releases_only_unshared_chunks(self):
+        shared_id = self.fm.add_document(Document(agent_id="a", filename="f.txt", content=self.content))
+        edited = self.content[:50000] + " inserted paragraph " + self.content[50000:]
+        edited_id = self.fm.add_document(Document(agent_id="b", filename="g.txt", content=edited))
+        chunks = self.db.tables["gitmem_document_chunks"]
+        before = len(chunks)
+
+        self.assertTrue(self.fm.delete_document("b", edited_id))
+        # Only the chunks around the edit were unique to the deleted document
+        self.assertGreater(len(chunks), 0)
+        self.assertLess(len(chunks), before)
+        self.assertEqual("".join(self.fm.stream_document("a", shared_id)), self.content)
+
+        self.assertTrue(self.fm.delete_document("a", shared_id))
+        self.assertEqual(chunks, [])
+
+    def test_chunking_is_deterministic_and_lossless(self):
+        chunks = chunk_text(self.content)
+        self.assertEqual(chunks, chunk_text(self.content))
+        self.assertEqual("".join(chunks), self.content)
+        self.assertTrue(all(len(c) <= 64 * 1024 for c in chunks))
+
+
+class TestTelemetryIngestion(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDB()
+        self.fm = FolderManager(supabase_client=self.db, telemetry_sample_rates={"access": 0.0})
+
+    def test_rows_are_batched_into_one_insert(self):
+        for i in range(50):
+            self.fm.log_api_call(APILog(agent_id="a", endpoint=f"/e{i}", response_status=200))
+        self.assertNotIn("gitmem_api_logs", self.db.tables)
+
+        self.fm.flush_telemetry()
+        self.assertEqual(len(self.db.tables["gitmem_api_logs"]), 50)
+        self.assertIn(("gitmem_api_logs", 50), self.db.writes)
+
+    def test_sampling_keeps_errors_and_counts_everything(self):
+        for i in range(20):
+            self.fm.log_access("a", "memory", f"m{i}", "user", "u1")
+        self.fm._log_activity("a", "access", "read", "memory", "m_err", "user", "u1")
+        self.fm.log_api_call(APILog(agent_id="a", endpoint="/x", response_status=500))
+        self.fm.flush_telemetry()
+
+        # Access logs are sampled to zero here, but the error API call is kept
+        self.assertNotIn("gitmem_activity_logs", self.db.tables)
+        self.assertEqual(len(self.db.tables["gitmem_api_logs"]), 1)
+
+        # Rollups still count every record
+        self.assertEqual(self.fm.telemetry.counts("a"), {"access": 21, "api": 1})
+        self.assertEqual(self.fm.get_folder_stats("a")["sources"]["api"], 1)
+
+    def test_rows_from_before_the_rollups_are_backfilled_once(self):
+        self.db.tables["gitmem_api_logs"] = [{"id": f"old{i}", "agent_id": "a"} for i in range(3)]
+        # Another worker already logged (and rolled up) one call after the rollups shipped
+        other = FolderManager(supabase_client=self.db)
+        other.log_api_call(APILog(agent_id="a", endpoint="/new", response_status=200))
+        other.flush_telemetry()
+
+        self.assertEqual(self.fm.get_folder_stats("a")["sources"]["api"], 4)
+        self.fm.log_api_call(APILog(agent_id="a", endpoint="/x", response_status=200))
+        self.fm.flush_telemetry()
+        self.assertEqual(self.fm.get_folder_stats("a")["sources"]["api"], 5)
+
+        backfills = [r for r in self.db.tables["gitmem_telemetry_rollups"]
+                     if r["writer_id"] == "backfill" and r["kind"] == "api"]
+        self.assertEqual([r["count"] for r in backfills], [3])
+
+    def test_reads_are_access_logged(self):
+        doc_id = self.fm.add_document(Document(agent_id="a", filename="f.txt", content="hello"))
+        "".join(self.fm.stream_document("a", doc_id))
+        self.assertEqual(self.fm.telemetry.counts("a", ["access"]), {"access": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
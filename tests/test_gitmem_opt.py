@@ -12,6 +12,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.modules['supabase'] = MagicMock()
 
 from gitmem.core.memory_store import MemoryStore
+from gitmem.core.event_bus import event_bus
 from gitmem.api import websocket_events
 from flask import Flask
 
@@ -20,6 +21,12 @@ class TestGitMemOptimizations(unittest.TestCase):
         self.store = MemoryStore()
         # Mock DB behavior
         self.store.db.count_memories = MagicMock(return_value=10)
+    
+    def tearDown(self):
+        # init_websocket() puts the global bus in async mode behind a mocked spawn
+        event_bus.disable_async_dispatch(timeout=0.1)
+        event_bus.set_broadcaster(None)
+        event_bus.set_socketio(None)
         
     def test_get_folder_structure_stats(self):
         print("Testing get_folder_structure_stats...")
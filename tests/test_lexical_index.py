@@ -0,0 +1,113 @@
+import sys
+import os
+import tempfile
+import unittest
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from SimpleMem.database.lexical_index import BM25Index
+
+
+def record(entry_id, text, keywords=()):
+    return {"entry_id": entry_id, "lossless_restatement": text, "keywords": list(keywords)}
+
+
+RECORDS = [
+    record("e1", "Alice discussed the project timeline with Bob.", ["project", "timeline"]),
+    record("e2", "The team meeting covered Q3 goals and deadlines.", ["meeting", "Q3"]),
+    record("e3", "Bob booked a flight to Shanghai for the product launch.", ["flight", "Shanghai"]),
+]
+
+
+class TestBM25Index(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "agent_a")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ranking_prefers_keyword_and_rare_terms(self):
+        index = BM25Index()
+        index.add(RECORDS)
+
+        hits = index.search(["project timeline"], top_k=3)
+        self.assertEqual([h[0] for h in hits], ["e1"])
+        self.assertEqual(index.search(["Bob", "Shanghai"], top_k=3)[0][0], "e3")
+        self.assertEqual(index.search(["nonexistent"]), [])
+
+    def test_update_and_delete_are_incremental(self):
+        index = BM25Index()
+        index.add(RECORDS)
+
+        index.add([record("e2", "The meeting moved to the Shanghai office.")])
+        self.assertEqual({h[0] for h in index.search(["Shanghai"])}, {"e2", "e3"})
+        self.assertEqual(index.search(["deadlines"]), [])
+
+        index.remove(["e3"])
+        self.assertEqual([h[0] for h in index.search(["Shanghai"])], ["e2"])
+        self.assertEqual(len(index), 2)
+
+    def test_persists_and_syncs_between_processes(self):
+        writer = BM25Index(self.path, compact_min_ops=2)
+        writer.add(RECORDS[:1])
+        reader = BM25Index(self.path)
+        self.assertTrue(reader.existed)
+        self.assertEqual(reader.search(["timeline"])[0][0], "e1")
+
+        # Later writes (including a compaction) reach the other instance
+        writer.add(RECORDS[1:])
+        writer.remove(["e1"])
+        self.assertEqual(reader.search(["timeline"]), [])
+        self.assertEqual(reader.search(["flight"])[0][0], "e3")
+        self.assertEqual(len(BM25Index(self.path)), 2)
+
+    def test_reports_entries_changed_by_other_processes(self):
+        writer = BM25Index(self.path, compact_min_ops=100)
+        writer.add(RECORDS[:1])
+        changes = []
+        reader = BM25Index(self.path, on_change=changes.append)
+
+        writer.add(RECORDS[1:])
+        writer.remove(["e1"])
+        reader.refresh()
+        self.assertEqual(changes, [["e2", "e3"], ["e1"]])
+
+        # The reader's own writes are not reported back to it...
+        reader.remove(["e2"])
+        self.assertEqual(len(changes), 2)
+        # ...and a new snapshot may have changed anything
+        writer.clear()
+        reader.refresh()
+        self.assertEqual(changes[-1], None)
+
+
+class TestSymbolicFilters(unittest.TestCase):
+    def setUp(self):
+        self.index = BM25Index()
+        self.index.add([
+            {**RECORDS[0], "persons": ["Alice", "Bob"], "topic": "Work", "timestamp": "2025-11-10T09:00:00"},
+            {**RECORDS[1], "persons": ["Bob"], "location": "Office", "timestamp": "2025-11-12T10:00:00"},
+            {**RECORDS[2], "persons": ["Bob"], "entities": ["Product XYZ"], "location": "Shanghai",
+             "timestamp": "2025-11-15T14:30:00"},
+        ])
+
+    def test_persons_match_per_person_not_whole_list(self):
+        self.assertEqual(self.index.filter(persons=["bob"]), ["e3", "e2", "e1"])
+        self.assertEqual(self.index.filter(persons=["Alice"]), ["e1"])
+        self.assertEqual(self.index.filter(persons=["Bob"], location="shanghai"), ["e3"])
+        self.assertEqual(self.index.filter(persons=["Alice"], entities=["product xyz"]), [])
+
+    def test_timestamp_range_and_updates(self):
+        self.assertEqual(self.index.filter(start="2025-11-11T00:00:00", end="2025-11-15T23:59:59"), ["e3", "e2"])
+        self.assertEqual(self.index.filter(persons=["Bob"], end="2025-11-11T00:00:00"), ["e1"])
+
+        self.index.add([{**RECORDS[1], "persons": ["Carol"], "timestamp": "2025-11-20T08:00:00"}])
+        self.index.remove(["e3"])
+        self.assertEqual(self.index.filter(persons=["Bob"]), ["e1"])
+        self.assertEqual(self.index.filter(start="2025-11-11T00:00:00"), ["e2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
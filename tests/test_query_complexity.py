@@ -0,0 +1,40 @@
+import sys
+import os
+import unittest
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from SimpleMem.utils.query_complexity import estimate_query_complexity
+
+
+SIMPLE = [
+    "Where does Alice work?",
+    "What did Melanie paint recently?",
+    "When did Alice and Bob meet?",
+]
+COMPLEX = [
+    "Why did Alice change jobs after the meeting with Bob in March, and how did it affect her relationship with Carol?",
+    "How many times did John go hiking before he moved to Seattle in 2023?",
+    "What do Jon and Gina both have in common?",
+]
+
+
+class TestQueryComplexity(unittest.TestCase):
+    def test_simple_lookups_score_below_multi_hop_questions(self):
+        simple = [estimate_query_complexity(q)["complexity"] for q in SIMPLE]
+        complex_ = [estimate_query_complexity(q)["complexity"] for q in COMPLEX]
+        self.assertLess(max(simple), 0.5)
+        self.assertGreaterEqual(min(complex_), 0.5)
+        self.assertTrue(all(0.0 <= c <= 1.0 for c in simple + complex_))
+
+    def test_features(self):
+        features = estimate_query_complexity("When did Alice meet New York Times editors last week?")["features"]
+        self.assertEqual(features["entities"], ["Alice", "New York Times"])
+        self.assertEqual(features["temporal_expressions"], 2)
+        self.assertEqual(features["question_words"], 1)
+        self.assertEqual(estimate_query_complexity("")["complexity"], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import time
+import unittest
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from SimpleMem.utils.query_plan_cache import QueryPlanCache, anchor_terms
+
+
+# Toy embedding: paraphrases of the same question land on the same vector
+TOPICS = {"meeting": [1.0, 0.0], "flight": [0.0, 1.0]}
+
+
+def embed(query):
+    return next((v for word, v in TOPICS.items() if word in query.lower()), [0.7, 0.7])
+
+
+class TestQueryPlanCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def compute(self, value):
+        def run():
+            self.calls.append(value)
+            return value
+        return run
+
+    def test_exact_hits_after_normalization_and_ttl(self):
+        cache = QueryPlanCache(ttl_seconds=0.05)
+        plan = {"question_type": "temporal", "key_entities": ["Alice"]}
+
+        self.assertEqual(cache.get_or_compute("plan", "When did Alice meet Bob?", self.compute(plan)), plan)
+        hit = cache.get_or_compute("plan", "  when did alice meet bob ", self.compute({}))
+        self.assertEqual(hit, plan)
+        hit["key_entities"].append("mutated")  # callers get copies
+        self.assertEqual(len(self.calls), 1)
+
+        time.sleep(0.06)
+        cache.get_or_compute("plan", "When did Alice meet Bob?", self.compute(plan))
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+
+    def test_failures_are_not_cached_and_kinds_are_separate(self):
+        cache = QueryPlanCache()
+
+        def fail():
+            raise ValueError("LLM down")
+
+        with self.assertRaises(ValueError):
+            cache.get_or_compute("plan", "q", fail)
+        self.assertEqual(cache.get_or_compute("plan", "q", self.compute(1)), 1)
+        self.assertEqual(cache.get_or_compute("queries", "q", self.compute(2)), 2)
+        self.assertEqual(cache.get_or_compute("plan", "q", self.compute(3), scope="agent_b"), 3)
+
+    def test_near_duplicates_require_same_names(self):
+        cache = QueryPlanCache(similarity_threshold=0.9)
+        rebase = lambda queries, cached: ["NEW"] + [q for q in queries if q != cached]
+
+        first = "When was Alice's meeting in 2025?"
+        cache.get_or_compute("queries", first, self.compute([first, "Alice meeting date"]), embed=embed, rebase=rebase)
+
+        paraphrase = "What date was the meeting Alice had in 2025"
+        self.assertEqual(
+            cache.get_or_compute("queries", paraphrase, self.compute(["x"]), embed=embed, rebase=rebase),
+            ["NEW", "Alice meeting date"]
+        )
+        # Same topic, different person or year: not reused
+        cache.get_or_compute("queries", "When was Bob's meeting in 2025?", self.compute(["bob"]), embed=embed)
+        cache.get_or_compute("queries", "When was Alice's meeting in 2024?", self.compute(["2024"]), embed=embed)
+        self.assertEqual(self.calls, [[first, "Alice meeting date"], ["bob"], ["2024"]])
+        self.assertEqual(cache.get_stats()["near_hits"], 1)
+
+    def test_anchor_terms(self):
+        self.assertEqual(anchor_terms("What did Alice tell Bob on 2025-11-15?"), {"alice", "bob", "2025", "11", "15"})
+        self.assertEqual(anchor_terms("Alice went where?"), {"alice"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import sys
+import os
+import unittest
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from SimpleMem.database.rank_fusion import fuse_rankings
+
+
+class TestRankFusion(unittest.TestCase):
+    def test_rrf_rewards_agreement_across_layers(self):
+        fused = fuse_rankings({
+            "semantic": [("a", 0.9), ("b", 0.8), ("c", 0.1)],
+            "keyword": [("c", 12.0), ("b", 3.0)],
+            "symbolic": [("b", 1.0)],
+        })
+        self.assertEqual([i for i, _ in fused], ["b", "c", "a"])
+        self.assertAlmostEqual(fused[0][1], 1 / 62 + 1 / 62 + 1 / 61)
+
+    def test_weights_ties_and_top_k(self):
+        rankings = {"semantic": [("a", 0.0)], "keyword": [("b", 0.0)]}
+        self.assertEqual([i for i, _ in fuse_rankings(rankings)], ["a", "b"])
+        weighted = fuse_rankings(rankings, weights={"semantic": 0.5, "keyword": 1.0}, top_k=1)
+        self.assertEqual(weighted, [("b", 1 / 61)])
+        self.assertEqual(fuse_rankings({"semantic": []}), [])
+
+    def test_score_fusion_normalizes_each_layer(self):
+        fused = fuse_rankings({
+            "semantic": [("a", 0.9), ("b", 0.5)],
+            "keyword": [("b", 20.0), ("a", 10.0)],
+        }, weights={"semantic": 0.4, "keyword": 0.6}, method="score")
+        self.assertEqual(fused, [("b", 0.6), ("a", 0.4)])
+        with self.assertRaises(ValueError):
+            fuse_rankings({}, method="sum")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gitmem.core import telemetry
+from gitmem.core.telemetry import TelemetryBuffer
+
+
+class TestFlushOnExit(unittest.TestCase):
+    def test_buffered_rows_and_rollups_are_written_at_exit(self):
+        db = MagicMock()
+        buffer = TelemetryBuffer(db, flush_interval=3600)
+        buffer.record("api_logs", {"endpoint": "/x"}, kind="api", agent_id="agent_a", is_error=True)
+
+        telemetry._flush_on_exit()
+
+        db.table.assert_any_call("api_logs")
+        db.table.return_value.insert.assert_called_once_with([{"endpoint": "/x"}])
+        rollups = db.table.return_value.upsert.call_args[0][0]
+        self.assertTrue(all(r["error_count"] == 1 for r in rollups))
+        self.assertEqual(buffer.get_stats()["pending"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,270 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+from gitmem.core.vector_engine import VectorEngine
+from gitmem.core.index_queue import IndexingQueue
+from gitmem.core.local_vector_index import HashingEmbedding, LocalVectorClient
+
+
+def make_engine(**kwargs):
+    """VectorEngine wired to a mocked Chroma client."""
+    with patch.object(VectorEngine, '_initialize'):
+        engine = VectorEngine(**kwargs)
+    engine.client = MagicMock()
+    engine.collection = MagicMock()
+    engine.is_cloud = True
+    return engine
+
+
+class TestCollectionHandleCache(unittest.TestCase):
+    def test_hit_is_cached(self):
+        engine = make_engine()
+        engine.client.get_collection.return_value = MagicMock()
+
+        engine.query("q", where={"agent_id": "agent_a"})
+        engine.get_agent_vectors("agent_a")
+        engine.get_agent_stats("agent_a")
+
+        engine.client.get_collection.assert_called_once_with(name="agent_a")
+
+    def test_miss_is_remembered_until_ttl(self):
+        engine = make_engine(collection_miss_ttl=60)
+        engine.client.get_collection.side_effect = Exception("not found")
+
+        engine.query("q", where={"agent_id": "agent_a"})
+        engine.query("q", where={"agent_id": "agent_a"})
+        self.assertEqual(engine.client.get_collection.call_count, 1)
+        self.assertTrue(engine.collection.query.called)
+
+        with patch('gitmem.core.vector_engine.time.monotonic', return_value=10**9):
+            engine.query("q", where={"agent_id": "agent_a"})
+        self.assertEqual(engine.client.get_collection.call_count, 2)
+
+    def test_create_and_delete_invalidate(self):
+        engine = make_engine()
+        engine.client.get_collection.side_effect = Exception("not found")
+        self.assertIsNone(engine.get_agent_collection("agent_a"))
+
+        created = engine.create_agent_collection("agent_a")
+        self.assertIs(engine.get_agent_collection("agent_a"), created)
+
+        engine.delete_agent_collection("agent_a")
+        self.assertIsNone(engine.get_agent_collection("agent_a"))
+        self.assertEqual(engine.client.get_collection.call_count, 2)
+
+    def test_hit_expires_after_ttl(self):
+        engine = make_engine(collection_hit_ttl=300)
+        engine.client.get_collection.return_value = MagicMock()
+        engine.get_agent_collection("agent_a")
+
+        # Agent deleted through another service/worker
+        engine.client.get_collection.side_effect = Exception("not found")
+        self.assertIsNotNone(engine.get_agent_collection("agent_a"))
+        with patch('gitmem.core.vector_engine.time.monotonic', return_value=10**9):
+            self.assertIsNone(engine.get_agent_collection("agent_a"))
+
+    def test_failed_reads_invalidate_stale_handle(self):
+        engine = make_engine()
+        stale = MagicMock()
+        stale.get.side_effect = Exception("collection does not exist")
+        engine.client.get_collection.return_value = stale
+
+        self.assertEqual(engine.get_agent_vectors("agent_a"), [])
+        self.assertIsNone(engine.get_vector("v1", agent_id="agent_a"))
+        self.assertEqual(engine.client.get_collection.call_count, 2)
+
+
+class TestIndexingQueue(unittest.TestCase):
+    def test_add_memory_is_batched_and_flushed(self):
+        engine = make_engine(index_batch_size=10, index_max_latency=5.0)
+        for i in range(3):
+            engine.add_memory({"id": f"m{i}", "agent_id": "agent_a", "content": f"memory {i}"})
+
+        self.assertFalse(engine.collection.add.called)
+        self.assertTrue(engine.flush(timeout=2))
+
+        engine.collection.add.assert_called_once()
+        self.assertEqual(engine.collection.add.call_args.kwargs["ids"], ["m0", "m1", "m2"])
+        self.assertEqual(engine.get_indexing_stats()["indexed"], 3)
+
+    def test_size_trigger_splits_batches(self):
+        write = MagicMock()
+        queue = IndexingQueue(write, max_batch=2, max_latency=5.0)
+        queue.enqueue("c", ["a", "b", "c"], [{}, {}, {}], ["1", "2", "3"])
+        self.assertTrue(queue.flush(timeout=2))
+        self.assertEqual([len(c.args[3]) for c in write.call_args_list], [2, 1])
+
+    def test_retry_with_backoff_then_success(self):
+        write = MagicMock(side_effect=[Exception("boom"), None])
+        queue = IndexingQueue(write, max_batch=10, max_latency=0.0, retry_backoff=0.01)
+        queue.enqueue("c", ["a"], [{}], ["1"])
+        self.assertTrue(queue.flush(timeout=2))
+
+        stats = queue.get_stats()
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["indexed"], 1)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_permanent_failure_releases_barrier(self):
+        write = MagicMock(side_effect=Exception("down"))
+        queue = IndexingQueue(write, max_batch=10, max_latency=0.0, max_retries=1, retry_backoff=0.01)
+        queue.enqueue("c", ["a"], [{}], ["1"])
+        self.assertTrue(queue.flush(timeout=2))
+        self.assertEqual(queue.get_stats()["failed"], 1)
+
+    def test_bad_item_is_isolated_without_retries(self):
+        def write(name, texts, metadatas, ids):
+            if "bad" in ids:
+                raise ValueError("invalid metadata")
+        write = MagicMock(side_effect=write)
+        queue = IndexingQueue(write, max_batch=10, max_latency=5.0, retry_backoff=10.0)
+        queue.enqueue("c", list("abcde"), [{}] * 5, ["1", "2", "bad", "4", "5"])
+        self.assertTrue(queue.flush(timeout=2))
+
+        stats = queue.get_stats()
+        self.assertEqual(stats["indexed"], 4)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["retries"], 0)
+        written = [i for c in write.call_args_list for i in c.args[3]]
+        self.assertEqual(sorted(set(written) - {"bad"}), ["1", "2", "4", "5"])
+
+    def test_close_indexes_pending_items(self):
+        write = MagicMock()
+        queue = IndexingQueue(write, max_batch=10, max_latency=60.0)
+        queue.enqueue("c", ["a"], [{}], ["1"])
+        self.assertTrue(queue.close(timeout=2))
+        self.assertEqual(queue.get_stats()["indexed"], 1)
+
+
+class TestAgentVectorCounts(unittest.TestCase):
+    def test_agent_collection_uses_count(self):
+        engine = make_engine()
+        col = MagicMock()
+        col.count.return_value = 42
+        engine.client.get_collection.return_value = col
+
+        stats = engine.get_agent_stats("agent_a")
+        self.assertEqual(stats["embeddings"], 42)
+        self.assertFalse(engine.collection.get.called)
+        self.assertTrue(stats["latency"].endswith("ms"))
+
+    def test_global_fallback_pages_ids_only_and_memoizes(self):
+        engine = make_engine(async_indexing=False)
+        engine.COUNT_PAGE_SIZE = 2
+        engine.client.get_collection.side_effect = Exception("not found")
+        engine.collection.get.side_effect = [{"ids": ["1", "2"]}, {"ids": ["3"]}]
+
+        self.assertEqual(engine.count_agent_vectors("agent_a"), 3)
+        for call in engine.collection.get.call_args_list:
+            self.assertEqual(call.kwargs["include"], [])
+
+        # Served from the memoized count and kept in step with writes
+        engine.add_memory({"id": "m1", "agent_id": "agent_a", "content": "x"})
+        self.assertEqual(engine.count_agent_vectors("agent_a"), 4)
+        self.assertEqual(engine.collection.get.call_count, 2)
+
+
+class TestLocalVectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def test_query_uses_agent_partition_and_filters(self):
+        col = LocalVectorClient(self.path).get_or_create_collection("gitmem_global")
+        col.add(
+            documents=["deploy the api server", "deploy the api server", "grocery list milk eggs", "api server logs"],
+            metadatas=[{"agent_id": "a", "memory_type": "episodic"}, {"agent_id": "b", "memory_type": "episodic"},
+                       {"agent_id": "a", "memory_type": "semantic"}, {"agent_id": "a", "memory_type": "semantic"}],
+            ids=["1", "2", "3", "4"]
+        )
+
+        res = col.query(query_texts=["deploy api server"], n_results=2, where={"agent_id": "a"})
+        self.assertEqual(res["ids"][0], ["1", "4"])
+        self.assertLess(res["distances"][0][0], res["distances"][0][1])
+
+        res = col.query(query_texts=["api"], n_results=5,
+                        where={"$and": [{"agent_id": "a"}, {"memory_type": {"$in": ["semantic"]}}]})
+        self.assertEqual(sorted(res["ids"][0]), ["3", "4"])
+        self.assertEqual(len(col.get(where={"agent_id": "a"}, include=[])["ids"]), 3)
+
+    def test_persists_across_reopen(self):
+        col = LocalVectorClient(self.path).get_or_create_collection("gitmem_global")
+        col.add(documents=["hello world"], metadatas=[{"agent_id": "a"}], ids=["1"])
+        col.add(documents=["hello again"], metadatas=[{"agent_id": "a"}], ids=["1"])  # overwrite
+        col.close()
+
+        reopened = LocalVectorClient(self.path).get_collection("gitmem_global")
+        self.assertEqual(reopened.count(), 1)
+        self.assertEqual(reopened.get(ids=["1"])["documents"], ["hello again"])
+        self.assertEqual(reopened.query(query_texts=["hello again"], n_results=1)["ids"][0], ["1"])
+
+    def test_two_writers_share_rows(self):
+        # Two clients on one directory stand in for two worker processes
+        col_a = LocalVectorClient(self.path).get_or_create_collection("gitmem_global")
+        col_b = LocalVectorClient(self.path).get_or_create_collection("gitmem_global")
+        col_a.add(documents=["deploy the api server"], metadatas=[{"agent_id": "a"}], ids=["1"])
+        col_b.add(documents=["grocery list milk eggs"], metadatas=[{"agent_id": "b"}], ids=["2"])
+        col_a.add(documents=["quarterly tax filing"], metadatas=[{"agent_id": "a"}], ids=["3"])
+
+        for col in (col_a, col_b):
+            self.assertEqual(col.count(), 3)
+            self.assertEqual(col.query(query_texts=["grocery milk"], n_results=1)["ids"][0], ["2"])
+            self.assertEqual(col.query(query_texts=["tax filing"], n_results=1)["ids"][0], ["3"])
+            self.assertEqual(col.query(query_texts=["api server"], n_results=1)["ids"][0], ["1"])
+
+    def test_unterminated_tail_is_discarded_on_write(self):
+        col = LocalVectorClient(self.path).get_or_create_collection("gitmem_global")
+        col.add(documents=["hello world"], metadatas=[{"agent_id": "a"}], ids=["1"])
+        with open(os.path.join(col.path, "rows.jsonl"), "a") as f:
+            f.write('{"id": "torn", "docu')
+        col.add(documents=["goodbye world"], metadatas=[{"agent_id": "a"}], ids=["2"])
+        col.close()
+
+        reopened = LocalVectorClient(self.path).get_collection("gitmem_global")
+        self.assertEqual(reopened.get()["ids"], ["1", "2"])
+
+    def test_engine_falls_back_to_local_index(self):
+        env = {k: "" for k in ("CHROMA_API_KEY", "CHROMA_TENANT", "CHROMA_SERVER_HOST", "REMOTE_EMBEDDING_URL")}
+        with patch.dict(os.environ, env), patch('dotenv.load_dotenv'):
+            engine = VectorEngine(path=self.path, async_indexing=False)
+
+        self.assertIsInstance(engine.client, LocalVectorClient)
+        engine.add_memory({"id": "m1", "agent_id": "agent_a", "content": "remember the deployment key"})
+        self.assertEqual(engine.query("deployment", where={"agent_id": "agent_a"})[0]["id"], "m1")
+        self.assertEqual(engine.get_agent_vectors("agent_a")[0]["content"], "remember the deployment key")
+        self.assertEqual(engine.get_agent_stats("agent_a")["freshness"], "Local")
+
+    def test_local_index_uses_remote_embeddings_when_configured(self):
+        remote = MagicMock(model="remote-model")
+        remote.embed.side_effect = lambda texts: [[1.0, float(len(t)), 0.0] for t in texts]
+        env = {k: "" for k in ("CHROMA_API_KEY", "CHROMA_TENANT", "CHROMA_SERVER_HOST")}
+        env["REMOTE_EMBEDDING_URL"] = "http://embeddings.local/embed"
+        with patch.dict(os.environ, env), patch('dotenv.load_dotenv'), \
+                patch('SimpleMem.utils.embedding_client.get_embedding_client', return_value=remote) as get_client:
+            engine = VectorEngine(path=self.path, async_indexing=False)
+
+        get_client.assert_called_once_with("http://embeddings.local/embed")
+        self.assertEqual(engine.client.dim, 3)
+        self.assertNotEqual(engine.client.path, os.path.join(self.path, "vectors"))
+        engine.add_memory({"id": "m1", "agent_id": "agent_a", "content": "remember the deployment key"})
+        remote.embed.assert_called_with(["remember the deployment key"])
+
+    def test_unreachable_remote_embeddings_fall_back_to_hashing(self):
+        env = {k: "" for k in ("CHROMA_API_KEY", "CHROMA_TENANT", "CHROMA_SERVER_HOST")}
+        env["REMOTE_EMBEDDING_URL"] = "http://embeddings.local/embed"
+        with patch.dict(os.environ, env), patch('dotenv.load_dotenv'), \
+                patch('SimpleMem.utils.embedding_client.get_embedding_client', side_effect=OSError("refused")):
+            engine = VectorEngine(path=self.path, async_indexing=False)
+
+        self.assertEqual(engine.client.path, os.path.join(self.path, "vectors"))
+        self.assertIsInstance(engine.client._embed, HashingEmbedding)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Adjust path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
+
+# Agentic_RAG connects to ChromaDB Cloud at import time
+sys.modules.setdefault('Octave_mem.RAG_DB_CONTROLLER_AGENTS.agent_RAG', MagicMock())
+
+from SimpleMem.database import vector_store
+from SimpleMem.database.entry_cache import EntryCache
+from SimpleMem.database.lexical_index import LexicalIndexRegistry
+from SimpleMem.models.memory_entry import MemoryEntry
+
+
+def entry(entry_id, text="Alice met Bob in Shanghai.", keywords=("Shanghai",), **fields):
+    return MemoryEntry(entry_id=entry_id, lossless_restatement=text, keywords=list(keywords),
+                       persons=["Alice", "Bob"], **fields)
+
+
+class VectorStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index_dir = tempfile.mkdtemp()
+        cache = EntryCache()
+        for name, value in [("_lexical_indexes", LexicalIndexRegistry(self.index_dir, on_change=cache.invalidate_entries)),
+                            ("_entry_cache", cache),
+                            ("_known_collections", set()),
+                            ("Agentic_RAG", MagicMock())]:
+            patcher = patch.object(vector_store, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def store(self, agent_id):
+        store = vector_store.VectorStore(agent_id, embedding_model=MagicMock())
+        store.agentic_RAG.batch_operation.return_value.execute.return_value = {"success": True}
+        return store
+
+    def other_worker_store(self, agent_id):
+        """A store with its own entry cache and index registry over the same files."""
+        store = self.store(agent_id)
+        store.entry_cache = EntryCache()
+        store.lexical_indexes = LexicalIndexRegistry(self.index_dir, on_change=store.entry_cache.invalidate_entries)
+        return store
+
+
+class TestForgetAgent(VectorStoreTestCase):
+    def test_recreated_agent_does_not_serve_deleted_memories(self):
+        store = self.store("agent_a")
+        store.add_entries([entry("e1")])
+        self.assertEqual([e.entry_id for e in store.keyword_search(["Shanghai"])], ["e1"])
+
+        # delete_agent drops the collection, then the agent's local state
+        vector_store.forget_agent("agent_a")
+        checks = store.agentic_RAG.get_agent_collection_info.call_count
+        recreated = self.store("agent_a")
+
+        # The recreated collection is checked again instead of assumed known
+        self.assertEqual(recreated.agentic_RAG.get_agent_collection_info.call_count, checks + 1)
+        self.assertEqual(recreated.keyword_search(["Shanghai"]), [])
+        self.assertEqual(recreated.structured_search(persons=["Alice"]), [])
+        self.assertEqual(recreated.hybrid_search("Shanghai"), [])
+        self.assertEqual(len(vector_store._entry_cache), 0)
+
+        # Other workers load the cleared index from disk
+        self.assertEqual(len(LexicalIndexRegistry(self.index_dir).get("agent_a")), 0)
+
+
+    def test_base_store_without_collection_only_provisions_handles(self):
+        base = vector_store.VectorStore(embedding_model=MagicMock(), ensure_collection=False)
+        base.agentic_RAG.get_agent_collection_info.side_effect = Exception("missing")
+
+        base.for_agent("agent_a")
+        base.agentic_RAG.create_agent_collection.assert_called_once_with("agent_a")
+
+
+class TestWrites(VectorStoreTestCase):
+    def test_patch_and_delete_keep_lexical_index_in_step(self):
+        store = self.store("agent_a")
+        self.assertTrue(store.add_entries([entry("e1"), entry("e2", "Carol visited Paris.", keywords=["Paris"])]))
+
+        updated = store.patch_entry("e1", {"lossless_restatement": "Alice met Bob in Tokyo.",
+                                           "keywords": ["Tokyo"], "entry_id": "ignored"})
+        self.assertEqual(updated.entry_id, "e1")
+        self.assertEqual(updated.persons, ["Alice", "Bob"])
+        self.assertEqual([e.entry_id for e in store.keyword_search(["Tokyo"])], ["e1"])
+        self.assertEqual(store.keyword_search(["Shanghai"]), [])
+
+        self.assertTrue(store.delete_entries(["e1", "e2"]))
+        store.agentic_RAG.delete_chat_history.assert_called_with(agent_ID="agent_a", ids=["e1", "e2"])
+        self.assertEqual(store.keyword_search(["Tokyo", "Paris"]), [])
+
+    def test_failed_add_is_reported_and_not_indexed(self):
+        store = self.store("agent_a")
+        store.agentic_RAG.batch_operation.return_value.execute.return_value = {"success": False}
+
+        self.assertFalse(store.add_entries([entry("e1")]))
+        self.assertEqual(store.keyword_search(["Shanghai"]), [])
+        self.assertEqual(len(vector_store._entry_cache), 0)
+
+
+
+class TestLexicalBootstrap(VectorStoreTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(vector_store, "LEXICAL_INDEX_BOOTSTRAP_LIMIT", 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stored_collection(self, store, count):
+        entries = [entry(f"e{i}", f"Note {i} about Shanghai.") for i in range(count)]
+        rows = [(e.entry_id, store._entry_to_document(e), dict(store._entry_to_metadata(e), entry_id=e.entry_id))
+                for e in entries]
+        collection = MagicMock()
+        collection.get.side_effect = lambda include, limit, offset: {
+            "ids": [r[0] for r in rows[offset:offset + limit]],
+            "documents": [r[1] for r in rows[offset:offset + limit]],
+            "metadatas": [r[2] for r in rows[offset:offset + limit]],
+        }
+        store.agentic_RAG.wrapper.manager.get_collection.return_value = collection
+        return collection
+
+    def wait_for_bootstrap(self, agent_id):
+        for thread in threading.enumerate():
+            if thread.name == f"lexical-bootstrap-{agent_id}":
+                thread.join(timeout=5)
+
+    def test_collection_past_limit_is_paged_in_before_marked_built(self):
+        store = self.store("agent_a")
+        collection = self.stored_collection(store, 7)
+
+        store.keyword_search(["Shanghai"])
+        self.wait_for_bootstrap("agent_a")
+
+        # No single read goes past the limit
+        self.assertTrue(all(call.kwargs["limit"] <= 3 for call in collection.get.call_args_list))
+        index = store.lexical_indexes.get("agent_a")
+        self.assertEqual(len(index), 7)
+        self.assertTrue(index.existed)
+
+    def test_failed_background_paging_leaves_index_unbuilt(self):
+        store = self.store("agent_a")
+        collection = self.stored_collection(store, 7)
+        read_page = collection.get.side_effect
+
+        def fail_past_first_read(include, limit, offset):
+            if offset >= 3:
+                raise ConnectionError("reset")
+            return read_page(include, limit, offset)
+
+        collection.get.side_effect = fail_past_first_read
+        store.keyword_search(["Shanghai"])
+        self.wait_for_bootstrap("agent_a")
+        self.assertFalse(store.lexical_indexes.get("agent_a").existed)
+
+        # A later call completes it
+        collection.get.side_effect = read_page
+        store.keyword_search(["Shanghai"])
+        self.wait_for_bootstrap("agent_a")
+        self.assertEqual(len(store.lexical_indexes.get("agent_a")), 7)
+        self.assertTrue(store.lexical_indexes.get("agent_a").existed)
+
+
+class TestEntryCacheAcrossWorkers(VectorStoreTestCase):
+    def test_other_workers_writes_evict_cached_entries(self):
+        worker_a = self.store("agent_a")
+        worker_b = self.other_worker_store("agent_a")
+        # Both workers read the same collection
+        collection = {}
+        worker_b.agentic_RAG.get_message_by_id.side_effect = lambda agent_ID, doc_id: collection.get(doc_id)
+
+        def store_in_collection(e):
+            metadata = dict(worker_a._entry_to_metadata(e), entry_id=e.entry_id)
+            collection[e.entry_id] = {"metadata": metadata, "document": worker_a._entry_to_document(e)}
+
+        worker_a.add_entries([entry("e1")])
+        store_in_collection(entry("e1"))
+        self.assertEqual(worker_b.get_entry_by_id("e1").lossless_restatement, "Alice met Bob in Shanghai.")
+
+        store_in_collection(worker_a.patch_entry("e1", {"lossless_restatement": "Alice met Bob in Tokyo."}))
+        self.assertEqual(worker_b.get_entry_by_id("e1").lossless_restatement, "Alice met Bob in Tokyo.")
+        self.assertEqual(worker_b.keyword_search(["Tokyo"])[0].lossless_restatement, "Alice met Bob in Tokyo.")
+
+        worker_a.delete_entry("e1")
+        del collection["e1"]
+        self.assertIsNone(worker_b.get_entry_by_id("e1"))
+
+
+if __name__ == '__main__':
+    unittest.main()